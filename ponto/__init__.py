@@ -0,0 +1,36 @@
+"""
+Núcleo do Sistema de Controle de Ponto: armazenamento, cálculos e relatórios,
+independente da interface em Streamlit (PONTOS.py).
+
+Os nomes abaixo são importados do seu módulo só no primeiro uso, então importar um módulo
+do pacote (ponto.dados, por exemplo) não carrega os demais.
+"""
+import importlib
+
+_MODULOS = {
+    "calcular_faltas": "ponto.calculos",
+    "calcular_horas": "ponto.calculos",
+    "calcular_horas_extras": "ponto.calculos",
+    "calcular_horas_extras_periodo": "ponto.calculos",
+    "faltas_para_dataframe": "ponto.calculos",
+    "formatar_timedelta": "ponto.calculos",
+    "resumir_horas_trabalhadas": "ponto.calculos",
+    "CalendarioFeriados": "ponto.calendario",
+    "AcaoPonto": "ponto.dados",
+    "DataManager": "ponto.dados",
+    "RelatorioDiretoria": "ponto.relatorio",
+    "gerar_relatorio_diretoria": "ponto.relatorio",
+    "gerar_relatorio_html": "ponto.relatorio",
+}
+
+__all__ = sorted(_MODULOS)
+
+def __getattr__(nome: str):
+    if nome not in _MODULOS:
+        raise AttributeError(f"module 'ponto' has no attribute '{nome}'")
+    valor = getattr(importlib.import_module(_MODULOS[nome]), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULOS))
@@ -0,0 +1,5 @@
+import sys
+
+from ponto.cli import main
+
+sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+Importação de arquivos AFD (Arquivo Fonte de Dados) exportados pelos relógios de ponto (REP).
+
+O arquivo é lido linha a linha: as marcações de cada colaborador são agrupadas em jornadas,
+classificadas pela ordem (Entrada, Pausa, Retorno, ..., Saída) e gravadas em lotes. A memória
+usada depende apenas das jornadas em aberto e do lote corrente, não do tamanho do arquivo.
+
+Registros aceitos (tipo na 10ª posição):
+- Portaria 1510: tipo 3 com data DDMMAAAA, hora HHMM e PIS (34 caracteres);
+- Portaria 671: tipos 3 e 7 com data e hora no formato AAAA-MM-DDThh:mm:00-0300 e CPF.
+"""
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from ponto.dados import COLUNA_PIS_CPF, COLUNAS_PONTO, AcaoPonto, DataManager
+from ponto.importacao import descartar_repetidos
+
+# Marcações de um colaborador até JANELA_JORNADA depois da primeira pertencem à mesma jornada
+JANELA_JORNADA = timedelta(hours=16)
+# Marcações a menos de um minuto de outra do mesmo colaborador são consideradas repetidas
+INTERVALO_MINIMO_MARCACOES = timedelta(minutes=1)
+TAMANHO_LOTE = 5000
+
+_NAO_DIGITOS = re.compile(r"\D")
+
+@dataclass
+class ResultadoImportacaoAFD:
+    linhas_lidas: int = 0
+    marcacoes: int = 0
+    importadas: int = 0
+    repetidas: int = 0
+    invalidas: int = 0
+    lotes: int = 0
+    sem_colaborador: Counter = field(default_factory=Counter)
+
+    @property
+    def resumo(self) -> str:
+        return (
+            f"{self.linhas_lidas} linha(s) lida(s), {self.marcacoes} marcação(ões) encontrada(s), "
+            f"{self.importadas} importada(s), {self.repetidas} já existente(s) ou repetida(s), "
+            f"{sum(self.sem_colaborador.values())} sem colaborador cadastrado, {self.invalidas} inválida(s)."
+        )
+
+def normalizar_identificador(valor) -> str:
+    """
+    PIS ou CPF apenas com dígitos e sem zeros à esquerda (o AFD completa os campos com zeros).
+    """
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return ""
+    if isinstance(valor, float):
+        valor = int(valor)
+    return _NAO_DIGITOS.sub("", str(valor)).lstrip("0")
+
+def mapa_identificadores(df_colab: pd.DataFrame) -> Dict[str, str]:
+    """
+    PIS/CPF normalizado -> Nome, a partir da coluna opcional PIS_CPF dos colaboradores.
+    """
+    if COLUNA_PIS_CPF not in df_colab.columns:
+        return {}
+    mapa = {}
+    for nome, identificador in zip(df_colab["Nome"], df_colab[COLUNA_PIS_CPF]):
+        identificador = normalizar_identificador(identificador)
+        if identificador:
+            mapa.setdefault(identificador, nome)
+    return mapa
+
+def interpretar_linha(linha: str) -> Optional[Tuple[str, datetime]]:
+    """
+    Retorna (identificador, data e hora) de um registro de marcação, ou None para os demais
+    registros (cabeçalho, ajustes de relógio, trailer...). Lança ValueError se a marcação for inválida.
+    """
+    linha = linha.rstrip("\r\n")
+    if len(linha) < 34 or not linha[:9].isdigit():
+        return None
+    tipo = linha[9]
+    if tipo not in ("3", "7"):
+        return None
+    if linha[10:14].isdigit() and linha[14] == "-":
+        # Portaria 671: AAAA-MM-DDThh:mm:00-0300 seguido do CPF (12 posições)
+        datahora = datetime.strptime(linha[10:26], "%Y-%m-%dT%H:%M")
+        identificador = linha[34:46]
+    elif tipo == "3":
+        # Portaria 1510: DDMMAAAA, HHMM e PIS (12 posições)
+        datahora = datetime.strptime(linha[10:22], "%d%m%Y%H%M")
+        identificador = linha[22:34]
+    else:
+        return None
+    identificador = normalizar_identificador(identificador)
+    if not identificador:
+        raise ValueError("marcação sem PIS/CPF")
+    return identificador, datahora
+
+def ler_marcacoes(linhas: Iterable[str], resultado: ResultadoImportacaoAFD) -> Iterator[Tuple[str, datetime]]:
+    for linha in linhas:
+        resultado.linhas_lidas += 1
+        try:
+            marcacao = interpretar_linha(linha)
+        except ValueError:
+            resultado.invalidas += 1
+            continue
+        if marcacao is not None:
+            resultado.marcacoes += 1
+            yield marcacao
+
+def classificar_jornada(horarios: List[datetime]) -> List[Tuple[datetime, AcaoPonto]]:
+    """
+    Classifica as marcações de uma jornada pela ordem: a primeira é a Entrada, a última é a
+    Saída e as intermediárias alternam entre Pausa e Retorno. Marcações repetidas (menos de
+    um minuto depois da anterior) são descartadas antes da classificação.
+    """
+    unicos: List[datetime] = []
+    for horario in sorted(horarios):
+        if not unicos or horario - unicos[-1] >= INTERVALO_MINIMO_MARCACOES:
+            unicos.append(horario)
+    if len(unicos) == 1:
+        return [(unicos[0], AcaoPonto.ENTRADA)]
+    acoes = [AcaoPonto.ENTRADA]
+    for i in range(1, len(unicos) - 1):
+        acoes.append(AcaoPonto.PAUSA if i % 2 == 1 else AcaoPonto.RETORNO)
+    acoes.append(AcaoPonto.SAIDA)
+    return list(zip(unicos, acoes))
+
+def agrupar_jornadas(marcacoes: Iterable[Tuple[str, datetime]]) -> Iterator[Tuple[str, List[datetime]]]:
+    """
+    Agrupa as marcações (em ordem cronológica, como no AFD) em jornadas por colaborador.
+    Uma jornada é encerrada quando chega uma marcação do mesmo colaborador fora da janela
+    ou quando o relógio do arquivo passa do fim da janela; só as jornadas abertas ficam em memória.
+    """
+    abertas: Dict[str, List[datetime]] = {}
+    proxima_limpeza: Optional[datetime] = None
+    for identificador, datahora in marcacoes:
+        jornada = abertas.get(identificador)
+        if jornada is not None and datahora - jornada[0] > JANELA_JORNADA:
+            yield identificador, abertas.pop(identificador)
+            jornada = None
+        if jornada is None:
+            abertas[identificador] = [datahora]
+        else:
+            jornada.append(datahora)
+
+        if proxima_limpeza is None or datahora >= proxima_limpeza:
+            for ident in [i for i, j in abertas.items() if datahora - j[0] > JANELA_JORNADA]:
+                yield ident, abertas.pop(ident)
+            proxima_limpeza = datahora + timedelta(hours=1)
+    for identificador, jornada in abertas.items():
+        yield identificador, jornada
+
+def _indice_pontos_existentes(df_pontos: pd.DataFrame) -> Dict[Tuple[str, str], List[datetime]]:
+    """
+    (Nome, Data) -> horários já registrados. As marcações importadas não entram no índice:
+    repetições dentro do próprio arquivo são descartadas ao classificar cada jornada.
+    """
+    indice = defaultdict(list)
+    horas = pd.to_datetime(df_pontos["Data"].astype(str) + " " + df_pontos["Hora"].astype(str).str[:5], format="%Y-%m-%d %H:%M", errors="coerce")
+    for nome, data, datahora in zip(df_pontos["Nome"], df_pontos["Data"], horas):
+        if not pd.isna(datahora):
+            indice[(nome, data)].append(datahora.to_pydatetime())
+    return indice
+
+def _ja_registrado(indice: Dict[Tuple[str, str], List[datetime]], nome: str, datahora: datetime) -> bool:
+    existentes = indice.get((nome, datahora.strftime("%Y-%m-%d")), ())
+    return any(abs(datahora - existente) < INTERVALO_MINIMO_MARCACOES for existente in existentes)
+
+def importar_afd(linhas: Iterable[str], data_manager: DataManager, simular: bool = False, tamanho_lote: int = TAMANHO_LOTE) -> ResultadoImportacaoAFD:
+    """
+    Importa as marcações de um AFD para o registro de ponto. As marcações que já existem
+    (mesmo colaborador, menos de um minuto de diferença) são ignoradas, então reimportar o
+    mesmo arquivo, ou um arquivo com período sobreposto, não duplica registros.
+    Com simular=True nada é gravado.
+    """
+    resultado = ResultadoImportacaoAFD()
+    mapa = mapa_identificadores(data_manager.carregar_colaboradores())
+    indice = _indice_pontos_existentes(data_manager.carregar_pontos())
+    lote: List[Tuple[str, str, str, str]] = []
+
+    def sem_repetidos(df_pontos: pd.DataFrame):
+        # Repete a checagem dentro da gravação: outro processo pode ter gravado as mesmas
+        # marcações depois da leitura do índice
+        novos = descartar_repetidos(pd.DataFrame(lote, columns=COLUNAS_PONTO), df_pontos)
+        return novos, len(novos)
+
+    def gravar_lote():
+        if lote:
+            gravados = len(lote) if simular else data_manager.anexar_pontos_validados(sem_repetidos)
+            resultado.importadas += gravados
+            resultado.repetidas += len(lote) - gravados
+            resultado.lotes += 1
+            lote.clear()
+
+    for identificador, horarios in agrupar_jornadas(ler_marcacoes(linhas, resultado)):
+        nome = mapa.get(identificador)
+        if nome is None:
+            resultado.sem_colaborador[identificador] += len(horarios)
+            continue
+        classificadas = classificar_jornada(horarios)
+        resultado.repetidas += len(horarios) - len(classificadas)
+        for datahora, acao in classificadas:
+            if _ja_registrado(indice, nome, datahora):
+                resultado.repetidas += 1
+                continue
+            data_str = datahora.strftime("%Y-%m-%d")
+            lote.append((nome, acao.value, data_str, datahora.strftime("%H:%M")))
+            if len(lote) >= tamanho_lote:
+                gravar_lote()
+    gravar_lote()
+    return resultado
+
+def importar_arquivo_afd(caminho: str, data_manager: DataManager, simular: bool = False) -> ResultadoImportacaoAFD:
+    # Os REPs gravam o AFD em ASCII/ISO-8859-1
+    with open(caminho, encoding="latin-1") as arquivo:
+        return importar_afd(arquivo, data_manager, simular)
@@ -0,0 +1,259 @@
+"""
+API HTTP para registro de ponto pelos tablets das portarias, sem abrir uma sessão do Streamlit.
+
+    POST /pontos   {"id": "tablet1-000123", "nome": "...", "acao": "Entrada", "data": "2025-10-01", "hora": "07:02"}
+                   ou uma lista desses objetos, ou {"pontos": [...]}
+    GET  /saude
+
+"data" e "hora" são opcionais (padrão: agora). Os registros recebidos de todas as conexões são
+reunidos por um curto intervalo e validados e gravados juntos, com uma única escrita. O "id"
+enviado pelo cliente torna o envio idempotente: reenviar o mesmo id devolve a mesma resposta
+sem registrar de novo. O registro aceito é gravado com um ID derivado do id do cliente, então o
+próprio arquivo de pontos é o recibo dos aceitos, gravado na mesma escrita que o registro; os
+recibos dos rejeitados ficam em ARQ_RECIBOS_API, limitado aos TAMANHO_MAXIMO_RECIBOS mais recentes. Todas as requisições exigem o cabeçalho "Authorization: Bearer <chave>".
+"""
+import hashlib
+import hmac
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ponto.dados import COLUNA_ID_PONTO, COLUNAS_PONTO, DataManager, safe_csv_write
+from ponto.importacao import validar_pontos
+
+ARQ_RECIBOS_API = "api_recibos.csv"
+COLUNAS_RECIBOS = ["id", "status", "motivo"]
+# Tempo máximo que um registro espera para ser gravado junto com outros
+INTERVALO_GRUPO = 0.2
+TAMANHO_MAXIMO_GRUPO = 1000
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+TAMANHO_MAXIMO_RECIBOS = 50000
+
+def id_ponto_api(id_cliente: str) -> str:
+    """
+    ID do registro gravado para o id enviado pelo cliente, no mesmo formato dos demais IDs.
+    """
+    return hashlib.sha256(f"api:{id_cliente}".encode("utf-8")).hexdigest()[:16]
+
+@dataclass
+class _Pedido:
+    pontos: List[dict]
+    resultados: Optional[List[dict]] = None
+    concluido: threading.Event = field(default_factory=threading.Event)
+
+class ConfirmadorEmGrupo:
+    """
+    Recebe registros de várias threads e os grava em grupo: uma validação e uma escrita para
+    todos os registros que chegaram dentro de INTERVALO_GRUPO. Reenvios de registros aceitos
+    são reconhecidos pelo ID no arquivo de pontos, dentro da própria escrita; os recibos dos
+    rejeitados são mantidos em memória e relidos do disco quando outro processo os altera.
+    """
+    def __init__(self, data_manager: DataManager, arq_recibos: str, intervalo: float = INTERVALO_GRUPO, iniciar: bool = True):
+        self.data_manager = data_manager
+        self.arq_recibos = arq_recibos
+        self.intervalo = intervalo
+        self._fila: "queue.Queue[_Pedido]" = queue.Queue()
+        self._versao_recibos: Optional[Tuple[int, int]] = None
+        self._recibos: Dict[str, dict] = {}
+        self._atualizar_recibos()
+        self._thread = threading.Thread(target=self._laco, name="confirmador-pontos", daemon=True)
+        if iniciar:
+            self._thread.start()
+
+    def _versao_arquivo_recibos(self) -> Optional[Tuple[int, int]]:
+        try:
+            info = os.stat(self.arq_recibos)
+        except FileNotFoundError:
+            return None
+        return info.st_mtime_ns, info.st_size
+
+    def _ler_recibos(self) -> pd.DataFrame:
+        try:
+            return pd.read_csv(self.arq_recibos, dtype=str, keep_default_na=False)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return pd.DataFrame(columns=COLUNAS_RECIBOS)
+
+    def _usar_recibos(self, df: pd.DataFrame):
+        self._recibos = {r["id"]: {**r, "motivo": r["motivo"] or None} for r in df[COLUNAS_RECIBOS].to_dict("records")}
+
+    def _atualizar_recibos(self):
+        versao = self._versao_arquivo_recibos()
+        if versao != self._versao_recibos:
+            self._usar_recibos(self._ler_recibos())
+            self._versao_recibos = versao
+
+    def _gravar_recibos(self, recibos: List[dict]):
+        # Relidos dentro da trava para não perder os recibos gravados por outro processo; só os
+        # TAMANHO_MAXIMO_RECIBOS mais recentes são mantidos
+        with safe_csv_write(self.arq_recibos):
+            novos = pd.DataFrame(recibos, columns=COLUNAS_RECIBOS).fillna({"motivo": ""})
+            df = pd.concat([self._ler_recibos(), novos], ignore_index=True)
+            df = df.drop_duplicates("id", keep="last").tail(TAMANHO_MAXIMO_RECIBOS)
+            temporario = f"{self.arq_recibos}.{os.getpid()}.tmp"
+            df.to_csv(temporario, index=False, encoding="utf-8")
+            os.replace(temporario, self.arq_recibos)
+            self._usar_recibos(df)
+            self._versao_recibos = self._versao_arquivo_recibos()
+
+    def enviar(self, pontos: List[dict], timeout: float = 30.0) -> List[dict]:
+        pedido = _Pedido(pontos)
+        self._fila.put(pedido)
+        if not pedido.concluido.wait(timeout):
+            raise TimeoutError("Tempo esgotado aguardando a gravação dos registros.")
+        return pedido.resultados
+
+    def confirmar(self, pontos: List[dict]) -> List[dict]:
+        """
+        Valida e grava os registros imediatamente, na thread de quem chama. Para uso fora do
+        servidor (iniciar=False), quando não há outras threads enviando.
+        """
+        pedido = _Pedido(pontos)
+        self._processar([pedido])
+        return pedido.resultados
+
+    def _laco(self):
+        while True:
+            pedidos = [self._fila.get()]
+            prazo = time.monotonic() + self.intervalo
+            while sum(len(p.pontos) for p in pedidos) < TAMANHO_MAXIMO_GRUPO:
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    pedidos.append(self._fila.get(timeout=restante))
+                except queue.Empty:
+                    break
+            try:
+                self._processar(pedidos)
+            except Exception as e:
+                for pedido in pedidos:
+                    if pedido.resultados is None:
+                        pedido.resultados = [{"id": p.get("id"), "status": "erro", "motivo": str(e)} for p in pedido.pontos]
+            for pedido in pedidos:
+                pedido.concluido.set()
+
+    def _processar(self, pedidos: List[_Pedido]):
+        self._atualizar_recibos()
+        agora = datetime.now()
+        novos: List[dict] = []
+        posicao_por_id: Dict[str, int] = {}
+        referencias = [] # para cada ponto de cada pedido: recibo existente ou posição em novos
+        for pedido in pedidos:
+            for ponto in pedido.pontos:
+                id_cliente = ponto.get("id")
+                id_cliente = None if id_cliente is None else str(id_cliente)
+                if id_cliente is not None and id_cliente in self._recibos:
+                    referencias.append(self._recibos[id_cliente])
+                elif id_cliente is not None and id_cliente in posicao_por_id:
+                    referencias.append(posicao_por_id[id_cliente])
+                else:
+                    if id_cliente is not None:
+                        posicao_por_id[id_cliente] = len(novos)
+                    referencias.append(len(novos))
+                    novos.append({
+                        "id": id_cliente,
+                        COLUNA_ID_PONTO: None if id_cliente is None else id_ponto_api(id_cliente),
+                        "Nome": str(ponto.get("nome") or ""),
+                        "Ação": str(ponto.get("acao") or ""),
+                        "Data": str(ponto.get("data") or agora.strftime("%Y-%m-%d")),
+                        "Hora": str(ponto.get("hora") or agora.strftime("%H:%M")),
+                    })
+
+        recibos_novos: List[dict] = []
+        if novos:
+            df_novos = pd.DataFrame(novos)[COLUNAS_PONTO + [COLUNA_ID_PONTO]]
+            df_colab = self.data_manager.carregar_colaboradores()
+
+            # Roda no escritor único, contra o conteúdo que será gravado: registros cujo ID já
+            # está no arquivo foram aceitos antes (por este ou por outro processo) e não são
+            # validados de novo; os demais passam pela checagem de repetição
+            def validar(df_pontos: pd.DataFrame):
+                ids = df_pontos[COLUNA_ID_PONTO].dropna() if COLUNA_ID_PONTO in df_pontos.columns else pd.Series(dtype=object)
+                gravados = df_novos[COLUNA_ID_PONTO].notna() & df_novos[COLUNA_ID_PONTO].isin(set(ids[ids.isin(df_novos[COLUNA_ID_PONTO])]))
+                posicoes = [i for i, gravado in enumerate(gravados) if not gravado]
+                resultado = validar_pontos(df_novos.iloc[posicoes], df_colab, df_pontos, manter_colunas=[COLUNA_ID_PONTO])
+                motivos = {posicoes[linha - 2]: motivo for linha, motivo in zip(resultado.rejeitados["Linha"], resultado.rejeitados["Motivo"])}
+                return resultado.validos, motivos
+            motivos = self.data_manager.anexar_pontos_validados(validar)
+            for i, novo in enumerate(novos):
+                motivo = motivos.get(i)
+                recibos_novos.append({"id": novo["id"], "status": "rejeitado" if motivo else "aceito", "motivo": motivo})
+            rejeitados = [r for r in recibos_novos if r["id"] is not None and r["status"] == "rejeitado"]
+            if rejeitados:
+                self._gravar_recibos(rejeitados)
+
+        i = 0
+        for pedido in pedidos:
+            resultados = []
+            for _ in pedido.pontos:
+                referencia = referencias[i]
+                resultados.append(recibos_novos[referencia] if isinstance(referencia, int) else referencia)
+                i += 1
+            pedido.resultados = resultados
+
+class _ManipuladorPontos(BaseHTTPRequestHandler):
+    server_version = "PontoAPI/1.0"
+
+    def _responder(self, codigo: int, corpo: dict):
+        dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _autorizado(self) -> bool:
+        cabecalho = self.headers.get("Authorization", "")
+        chave = cabecalho[7:] if cabecalho.startswith("Bearer ") else ""
+        return hmac.compare_digest(chave.encode(), self.server.chave.encode())
+
+    def do_GET(self):
+        if not self._autorizado():
+            return self._responder(401, {"erro": "Chave de acesso inválida."})
+        if self.path.rstrip("/") == "/saude":
+            return self._responder(200, {"status": "ok"})
+        self._responder(404, {"erro": "Recurso não encontrado."})
+
+    def do_POST(self):
+        if not self._autorizado():
+            return self._responder(401, {"erro": "Chave de acesso inválida."})
+        if self.path.rstrip("/") != "/pontos":
+            return self._responder(404, {"erro": "Recurso não encontrado."})
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            return self._responder(413, {"erro": "Requisição muito grande."})
+        try:
+            corpo = json.loads(self.rfile.read(tamanho) or b"null")
+        except (ValueError, UnicodeDecodeError):
+            return self._responder(400, {"erro": "JSON inválido."})
+        if isinstance(corpo, dict) and "pontos" in corpo:
+            corpo = corpo["pontos"]
+        pontos = [corpo] if isinstance(corpo, dict) else corpo
+        if not isinstance(pontos, list) or not pontos or not all(isinstance(p, dict) for p in pontos):
+            return self._responder(400, {"erro": "Envie um registro ou uma lista de registros."})
+        try:
+            resultados = self.server.confirmador.enviar(pontos)
+        except TimeoutError as e:
+            return self._responder(503, {"erro": str(e)})
+        self._responder(200, {"resultados": resultados})
+
+class _ServidorPontos(ThreadingHTTPServer):
+    # Vários tablets costumam enviar ao mesmo tempo na troca de turno
+    request_queue_size = 128
+
+def caminho_recibos(data_manager: DataManager) -> str:
+    return os.path.join(os.path.dirname(data_manager.arq_ponto), ARQ_RECIBOS_API)
+
+def criar_servidor(data_manager: DataManager, chave: str, host: str = "0.0.0.0", porta: int = 8765) -> ThreadingHTTPServer:
+    servidor = _ServidorPontos((host, porta), _ManipuladorPontos)
+    servidor.chave = chave
+    servidor.confirmador = ConfirmadorEmGrupo(data_manager, caminho_recibos(data_manager))
+    return servidor
@@ -0,0 +1,83 @@
+"""
+Aquecimento dos caches em segundo plano: depois do horário de corte da madrugada, recalcula
+os resultados que a primeira pessoa a abrir os relatórios pela manhã iria pedir.
+"""
+import logging
+import threading
+from datetime import date, datetime, time
+from typing import Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+class AgendadorAquecimento:
+    """
+    Executa a tarefa de aquecimento em uma thread própria:
+    - uma vez ao iniciar;
+    - uma vez por dia, assim que o horário de corte é ultrapassado;
+    - de novo quando a versão dos dados muda (alguém gravou algo), no máximo uma vez
+      a cada intervalo_minimo segundos, para que os caches voltem a ficar quentes.
+    A tarefa recebe a data de hoje.
+    """
+    def __init__(self, tarefa: Callable[[date], None], horario_corte: time = time(1, 0), versao: Optional[Callable[[], Hashable]] = None, intervalo_verificacao: float = 60.0, intervalo_minimo: float = 600.0):
+        self.tarefa = tarefa
+        self.horario_corte = horario_corte
+        self.versao = versao
+        self.intervalo_verificacao = intervalo_verificacao
+        self.intervalo_minimo = intervalo_minimo
+        self.ultima_execucao: Optional[datetime] = None
+        self.ultima_duracao: Optional[float] = None
+        self.ultimo_erro: Optional[str] = None
+        self._ultimo_corte: Optional[date] = None
+        self._ultima_versao: Optional[Hashable] = None
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ciclo_atual(self, agora: datetime) -> Optional[date]:
+        """
+        Dia cujo horário de corte já passou (None se ainda não passou hoje).
+        """
+        return agora.date() if agora.time() >= self.horario_corte else None
+
+    def deve_executar(self, agora: datetime) -> bool:
+        if self.ultima_execucao is None:
+            return True
+        ciclo = self._ciclo_atual(agora)
+        if ciclo is not None and ciclo != self._ultimo_corte:
+            return True
+        if self.versao is not None and self.versao() != self._ultima_versao:
+            return (agora - self.ultima_execucao).total_seconds() >= self.intervalo_minimo
+        return False
+
+    def executar(self, agora: Optional[datetime] = None):
+        agora = agora or datetime.now()
+        versao = self.versao() if self.versao is not None else None
+        inicio = datetime.now()
+        try:
+            self.tarefa(agora.date())
+            self.ultimo_erro = None
+        except Exception as e:
+            self.ultimo_erro = str(e)
+            logger.exception("Falha no aquecimento dos caches")
+        self.ultima_duracao = (datetime.now() - inicio).total_seconds()
+        self.ultima_execucao = agora
+        self._ultima_versao = versao
+        self._ultimo_corte = self._ciclo_atual(agora) or self._ultimo_corte
+
+    def _laco(self):
+        while not self._parar.is_set():
+            agora = datetime.now()
+            if self.deve_executar(agora):
+                self.executar(agora)
+            self._parar.wait(self.intervalo_verificacao)
+
+    def iniciar(self) -> "AgendadorAquecimento":
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._laco, name="aquecimento-caches", daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self, timeout: Optional[float] = None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
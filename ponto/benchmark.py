@@ -0,0 +1,162 @@
+"""
+Medição de desempenho dos motores de cálculo sobre bases sintéticas (ponto.sintetico) de
+vários tamanhos. Para cada escala (colaboradores x anos) mede a leitura dos pontos, as horas
+trabalhadas, as horas extras, as faltas e a geração do HTML do relatório: tempo, vazão
+(itens por segundo) e pico de memória.
+
+O tempo é medido numa passagem sem o tracemalloc, que deixa o Python bem mais lento, e o
+pico de memória numa segunda passagem com ele. Os cálculos usam o período final da base
+(o último mês, por padrão), como o relatório mensal.
+"""
+import gc
+import os
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, timedelta
+from time import perf_counter
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from ponto.calculos import (
+    calcular_faltas, calcular_horas, calcular_horas_extras, eh_vigia, faltas_para_dataframe, resultado_horas_extras_vazio,
+)
+from ponto.dados import ARQ_PONTO, DataManager
+from ponto.relatorio import filtrar_pontos_periodo, gerar_relatorio_html, preparar_dados_relatorio
+from ponto.sintetico import INICIO_SINTETICO, gerar_dados_sinteticos
+
+# Bases maiores (até 5000x5) são pedidas explicitamente: levam de minutos a horas
+ESCALAS_PADRAO = ((50, 1), (500, 2))
+DIAS_PERIODO = 31
+
+@dataclass
+class MedicaoEtapa:
+    colaboradores: int
+    anos: int
+    etapa: str
+    itens: int
+    unidade: str
+    segundos: float
+    pico_bytes: Optional[int] = None
+
+    @property
+    def por_segundo(self) -> float:
+        return self.itens / self.segundos if self.segundos > 0 else float("inf")
+
+def interpretar_escala(texto: str) -> Tuple[int, int]:
+    """
+    "500x2" -> 500 colaboradores, 2 anos.
+    """
+    try:
+        colaboradores, anos = (int(parte) for parte in texto.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Escala inválida: '{texto}'. Use COLABORADORESxANOS, por exemplo 500x2.")
+    if colaboradores < 1 or anos < 1:
+        raise ValueError(f"Escala inválida: '{texto}'.")
+    return colaboradores, anos
+
+def preparar_base(diretorio_base: str, colaboradores: int, anos: int, semente: int = 0) -> str:
+    """
+    Diretório da base sintética da escala, gerada só se ainda não existir (as bases grandes
+    levam minutos para gerar e podem ser reaproveitadas entre execuções).
+    """
+    diretorio = os.path.join(diretorio_base, f"c{colaboradores}_a{anos}_s{semente}")
+    if not os.path.exists(os.path.join(diretorio, ARQ_PONTO)):
+        gerar_dados_sinteticos(diretorio, colaboradores, anos, INICIO_SINTETICO, semente)
+    return diretorio
+
+def _medir(funcao: Callable[[], Any], memoria: bool) -> Tuple[float, Optional[int]]:
+    gc.collect()
+    inicio = perf_counter()
+    funcao()
+    segundos = perf_counter() - inicio
+    if not memoria:
+        return segundos, None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return segundos, pico
+
+def medir_escala(diretorio: str, colaboradores: int, anos: int, dias_periodo: int = DIAS_PERIODO, memoria: bool = True,
+                 ao_medir: Optional[Callable[[MedicaoEtapa], None]] = None) -> List[MedicaoEtapa]:
+    """
+    Mede as etapas sobre a base do diretório. dias_periodo = 0 usa a base inteira; ao_medir é
+    chamada a cada etapa medida, para mostrar o progresso.
+    """
+    data_manager = DataManager.no_diretorio(diretorio)
+    dados = data_manager.carregar_tudo()
+    df_pontos, df_colab = dados.pontos, dados.colaboradores
+    calendario = dados.carregar_calendario()
+
+    datas = pd.to_datetime(df_pontos["Data"])
+    data_fim = datas.max().date()
+    data_inicio = datas.min().date() if dias_periodo <= 0 else max(datas.min().date(), data_fim - timedelta(days=dias_periodo - 1))
+    # O pacote holidays calcula os feriados de cada ano na primeira consulta: fora da medição
+    for ano in range(data_inicio.year, data_fim.year + 1):
+        calendario.eh_feriado(date(ano, 1, 1))
+
+    df_periodo = filtrar_pontos_periodo(df_pontos, data_inicio, data_fim)
+    nomes_he = [nome for nome, funcao in zip(df_colab["Nome"], df_colab["Funcao"]) if not eh_vigia(funcao)]
+    conjunto_he = set(nomes_he)
+    pontos_por_nome = {nome: df for nome, df in df_periodo.groupby("Nome") if nome in conjunto_he}
+    dias_uteis = sum(1 for dia in pd.date_range(data_inicio, data_fim) if dia.weekday() < 5 and not calendario.eh_feriado(dia.date()))
+
+    resultados_he = {}
+    def horas_extras():
+        for nome in nomes_he:
+            df_nome = pontos_por_nome.get(nome)
+            resultados_he[nome] = calcular_horas_extras(df_nome.copy(), calendario) if df_nome is not None else None
+
+    faltas = calcular_faltas(data_inicio, data_fim, df_colab, df_pontos, calendario)
+    df_ausencias = dados.resolver_status_faltas(faltas_para_dataframe(faltas))
+
+    etapas = [
+        ("carregar_pontos", len(df_pontos), "registros", data_manager.carregar_pontos),
+        ("calcular_horas", len(df_periodo), "registros", lambda: calcular_horas(df_periodo.copy())),
+        ("calcular_horas_extras", sum(len(df) for df in pontos_por_nome.values()), "registros", horas_extras),
+        ("calcular_faltas", len(df_colab) * dias_uteis, "colaborador-dias", lambda: calcular_faltas(data_inicio, data_fim, df_colab, df_pontos, calendario)),
+    ]
+    medicoes = []
+    def registrar(etapa: str, itens: int, unidade: str, funcao: Callable[[], Any]):
+        segundos, pico = _medir(funcao, memoria)
+        medicoes.append(MedicaoEtapa(colaboradores, anos, etapa, itens, unidade, segundos, pico))
+        if ao_medir is not None:
+            ao_medir(medicoes[-1])
+
+    for etapa in etapas:
+        registrar(*etapa)
+    df_resumo, dados_he, ausencias = preparar_dados_relatorio(
+        df_colab, df_periodo, lambda nome: resultados_he.get(nome) or resultado_horas_extras_vazio(), df_ausencias,
+    )
+    registrar("gerar_relatorio_html", len(df_colab), "colaboradores", lambda: gerar_relatorio_html(data_inicio, data_fim, df_resumo, dados_he, ausencias))
+    return medicoes
+
+def executar_benchmark(escalas: Iterable[Tuple[int, int]] = ESCALAS_PADRAO, diretorio_base: str = "bases_sinteticas", dias_periodo: int = DIAS_PERIODO, memoria: bool = True,
+                       semente: int = 0, ao_medir: Optional[Callable[[MedicaoEtapa], None]] = None) -> List[MedicaoEtapa]:
+    """
+    Gera (ou reaproveita) a base de cada escala e mede todas as etapas, na ordem das escalas.
+    """
+    medicoes = []
+    for colaboradores, anos in escalas:
+        diretorio = preparar_base(diretorio_base, colaboradores, anos, semente)
+        medicoes += medir_escala(diretorio, colaboradores, anos, dias_periodo, memoria, ao_medir)
+    return medicoes
+
+def medicoes_para_dataframe(medicoes: List[MedicaoEtapa]) -> pd.DataFrame:
+    return pd.DataFrame([
+        {
+            "Colaboradores": m.colaboradores,
+            "Anos": m.anos,
+            "Etapa": m.etapa,
+            "Itens": m.itens,
+            "Unidade": m.unidade,
+            "Segundos": round(m.segundos, 4),
+            "Itens/s": round(m.por_segundo, 1),
+            "Pico (MB)": None if m.pico_bytes is None else round(m.pico_bytes / (1024 * 1024), 1),
+        }
+        for m in medicoes
+    ])
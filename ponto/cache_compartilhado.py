@@ -0,0 +1,146 @@
+"""
+Cache de resultados compartilhado entre processos. Quando há mais de um processo do
+Streamlit atrás do proxy, o cache do Streamlit de cada um é separado e todos recalculariam
+os mesmos relatórios; com este cache, o resultado calculado por um processo é reaproveitado
+pelos demais.
+
+As entradas ficam em um banco SQLite, guardadas com pickle. A chave inclui a versão dos
+dados, então uma gravação nunca faz um resultado antigo ser servido: as entradas das versões
+anteriores deixam de ser pedidas e saem pela política LRU quando o tamanho total passa do
+limite.
+"""
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Hashable, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARQ_CACHE_COMPARTILHADO = "cache_compartilhado.sqlite3"
+LIMITE_CACHE_COMPARTILHADO = 256 * 1024 * 1024
+# Depois de exceder o limite, remove as entradas menos usadas até este tanto do limite
+FRACAO_APOS_REMOCAO = 0.9
+
+def _forma_chave(valor: Any) -> Any:
+    # DataFrames e Series entram na chave pelo hash do conteúdo, não pelo pickle inteiro
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        hashes = pd.util.hash_pandas_object(valor, index=True).to_numpy()
+        colunas = tuple(valor.columns) if isinstance(valor, pd.DataFrame) else valor.name
+        return (type(valor).__name__, colunas, hashlib.sha256(hashes.tobytes()).hexdigest())
+    if isinstance(valor, (list, tuple)):
+        return tuple(_forma_chave(item) for item in valor)
+    return valor
+
+def chave_cache(espaco: str, versao: Hashable, argumentos: Tuple) -> str:
+    conteudo = pickle.dumps((espaco, versao, _forma_chave(argumentos)), protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha256(conteudo).hexdigest()
+
+class CacheCompartilhado:
+    """
+    Cache LRU em disco, limitado a limite_bytes. Falhas do banco (travado, corrompido, disco
+    cheio) não interrompem ninguém: o valor é simplesmente recalculado.
+    """
+    def __init__(self, caminho: str = ARQ_CACHE_COMPARTILHADO, limite_bytes: int = LIMITE_CACHE_COMPARTILHADO):
+        self.caminho = caminho
+        self.limite_bytes = limite_bytes
+        self.acertos = 0
+        self.falhas = 0
+        # Conexões SQLite não podem passar de uma thread para outra
+        self._local = threading.local()
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS entradas (
+                    chave TEXT PRIMARY KEY,
+                    valor BLOB NOT NULL,
+                    tamanho INTEGER NOT NULL,
+                    usado_em REAL NOT NULL
+                )
+            """)
+            conexao.execute("CREATE INDEX IF NOT EXISTS idx_entradas_usado_em ON entradas (usado_em)")
+
+    def _conexao(self) -> sqlite3.Connection:
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=5)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            # É só um cache: perder as últimas entradas numa queda de energia não tem problema
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+        return conexao
+
+    def obter(self, chave: str) -> Tuple[bool, Any]:
+        """
+        Devolve (encontrou, valor) e marca a entrada como usada agora.
+        """
+        conexao = self._conexao()
+        linha = conexao.execute("SELECT valor FROM entradas WHERE chave = ?", (chave,)).fetchone()
+        if linha is None:
+            return False, None
+        try:
+            valor = pickle.loads(linha[0])
+        except Exception:
+            # Entrada gravada por outra versão do código: descarta e recalcula
+            with conexao:
+                conexao.execute("DELETE FROM entradas WHERE chave = ?", (chave,))
+            return False, None
+        with conexao:
+            conexao.execute("UPDATE entradas SET usado_em = ? WHERE chave = ?", (time.time(), chave))
+        return True, valor
+
+    def guardar(self, chave: str, valor: Any):
+        conteudo = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(conteudo) > self.limite_bytes * (1 - FRACAO_APOS_REMOCAO):
+            return # Grande demais: expulsaria boa parte do cache por um único resultado
+        conexao = self._conexao()
+        with conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO entradas (chave, valor, tamanho, usado_em) VALUES (?, ?, ?, ?)",
+                (chave, conteudo, len(conteudo), time.time()),
+            )
+            total = conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM entradas").fetchone()[0]
+            if total > self.limite_bytes:
+                self._remover_menos_usadas(conexao)
+
+    def _remover_menos_usadas(self, conexao: sqlite3.Connection):
+        # Mantém as mais recentes cujo tamanho acumulado cabe na fração do limite
+        conexao.execute("""
+            DELETE FROM entradas WHERE chave IN (
+                SELECT chave FROM (
+                    SELECT chave, SUM(tamanho) OVER (ORDER BY usado_em DESC, chave) AS acumulado FROM entradas
+                ) WHERE acumulado > ?
+            )
+        """, (int(self.limite_bytes * FRACAO_APOS_REMOCAO),))
+
+    def memorizar(self, espaco: str, versao: Hashable, argumentos: Tuple, calcular: Callable[[], Any]) -> Any:
+        """
+        Devolve o resultado guardado para (espaco, versao, argumentos) ou o calcula e guarda.
+        """
+        chave = chave_cache(espaco, versao, argumentos)
+        try:
+            encontrou, valor = self.obter(chave)
+        except sqlite3.Error:
+            logger.warning("Cache compartilhado indisponível para leitura", exc_info=True)
+            encontrou = False
+        if encontrou:
+            self.acertos += 1
+            return valor
+        self.falhas += 1
+        valor = calcular()
+        try:
+            self.guardar(chave, valor)
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+            logger.warning("Não foi possível guardar no cache compartilhado", exc_info=True)
+        return valor
+
+    def tamanho_total(self) -> int:
+        return self._conexao().execute("SELECT COALESCE(SUM(tamanho), 0) FROM entradas").fetchone()[0]
+
+    def limpar(self):
+        with self._conexao() as conexao:
+            conexao.execute("DELETE FROM entradas")
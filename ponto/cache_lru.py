@@ -0,0 +1,80 @@
+"""
+Cache LRU em memória com limite de entradas e de bytes. Serve para resultados que o
+administrador consulta colaborador a colaborador e período a período: cada combinação nova
+ocupa uma entrada, e num servidor que fica dias no ar elas acumulariam sem limite. Quando um
+dos limites é passado, saem primeiro as entradas usadas há mais tempo.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+def tamanho_aproximado(valor: Any) -> int:
+    """
+    Usa o atributo nbytes quando o valor tem (arrays, HorasExtrasCompactas) e sys.getsizeof nos demais.
+    """
+    nbytes = getattr(valor, "nbytes", None)
+    return int(nbytes) if nbytes is not None else sys.getsizeof(valor)
+
+class CacheLRU:
+    """
+    Dicionário ordenado pelo uso, protegido por um lock (as sessões do Streamlit rodam em
+    threads diferentes). Um valor maior que max_bytes não é guardado.
+    """
+    def __init__(self, max_entradas: int, max_bytes: int, medir: Callable[[Any], int] = tamanho_aproximado):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.medir = medir
+        self.acertos = 0
+        self.falhas = 0
+        self.bytes_usados = 0
+        self._entradas: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obter(self, chave: Hashable) -> Tuple[bool, Any]:
+        """
+        Devolve (encontrou, valor) e marca a entrada como usada agora.
+        """
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                return False, None
+            self._entradas.move_to_end(chave)
+            return True, entrada[0]
+
+    def guardar(self, chave: Hashable, valor: Any):
+        tamanho = self.medir(valor)
+        if tamanho > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self.bytes_usados -= anterior[1]
+            self._entradas[chave] = (valor, tamanho)
+            self.bytes_usados += tamanho
+            while len(self._entradas) > self.max_entradas or self.bytes_usados > self.max_bytes:
+                _, (_, tamanho_removido) = self._entradas.popitem(last=False)
+                self.bytes_usados -= tamanho_removido
+
+    def memorizar(self, chave: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Devolve o valor guardado para a chave ou o calcula e guarda. O cálculo roda fora do
+        lock: duas sessões pedindo a mesma chave ao mesmo tempo podem calculá-la duas vezes,
+        mas nenhuma espera pelo cálculo de outra chave.
+        """
+        encontrou, valor = self.obter(chave)
+        if encontrou:
+            self.acertos += 1
+            return valor
+        self.falhas += 1
+        valor = calcular()
+        self.guardar(chave, valor)
+        return valor
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.bytes_usados = 0
@@ -0,0 +1,346 @@
+"""
+Motores de cálculo do controle de ponto: horas trabalhadas, horas extras e faltas.
+As funções recebem os dados já carregados e não dependem do Streamlit.
+"""
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ponto.calendario import CalendarioFeriados
+from ponto.dados import AcaoPonto
+
+# Expediente da jornada padrão; em dias úteis, o trabalho fora dele é hora extra 50%
+HORA_INICIO_EXPEDIENTE = "07:00"
+HORA_FIM_EXPEDIENTE = "17:00"
+HORA_FIM_EXPEDIENTE_SEXTA = "16:00"
+
+def hora_fim_expediente(dia) -> str:
+    return HORA_FIM_EXPEDIENTE_SEXTA if dia.weekday() == 4 else HORA_FIM_EXPEDIENTE
+
+def _no_horario(dia: pd.Timestamp, hora: str) -> pd.Timestamp:
+    horas, minutos = map(int, hora.split(":"))
+    return dia.replace(hour=horas, minute=minutos)
+
+def formatar_timedelta(td: timedelta) -> str:
+    total_segundos = int(td.total_seconds())
+    horas = total_segundos // 3600
+    minutos = (total_segundos % 3600) // 60
+    return f"{horas:02}:{minutos:02}"
+
+def calcular_horas(df: pd.DataFrame) -> pd.DataFrame:
+    resultado = []
+    df["DataHora"] = pd.to_datetime(df["Data"] + " " + df["Hora"], format="%Y-%m-%d %H:%M", errors='coerce')
+    df = df.dropna(subset=["DataHora"]).sort_values(by=["Nome", "DataHora"])
+
+    for nome, df_nome in df.groupby("Nome"):
+        df_nome = df_nome.sort_values("DataHora").reset_index(drop=True)
+        i = 0
+        while i < len(df_nome):
+            row = df_nome.iloc[i]
+            if row["Ação"] == AcaoPonto.ENTRADA.value:
+                data_entrada = row["Data"]
+                if i + 1 < len(df_nome) and df_nome.iloc[i + 1]["Ação"] == AcaoPonto.SAIDA.value:
+                    duracao = df_nome.iloc[i + 1]["DataHora"] - row["DataHora"]
+                    resultado.append((nome, data_entrada, formatar_timedelta(duracao)))
+                    i += 2
+                elif (i + 3 < len(df_nome) and
+                      df_nome.iloc[i + 1]["Ação"] == AcaoPonto.PAUSA.value and
+                      df_nome.iloc[i + 2]["Ação"] == AcaoPonto.RETORNO.value and
+                      df_nome.iloc[i + 3]["Ação"] == AcaoPonto.SAIDA.value):
+                    periodo1 = df_nome.iloc[i + 1]["DataHora"] - df_nome.iloc[i]["DataHora"]
+                    periodo2 = df_nome.iloc[i + 3]["DataHora"] - df_nome.iloc[i + 2]["DataHora"]
+                    duracao = periodo1 + periodo2
+                    resultado.append((nome, data_entrada, formatar_timedelta(duracao)))
+                    i += 4
+                else:
+                    resultado.append((nome, data_entrada, "Registro Incompleto"))
+                    i += 1
+            else:
+                i += 1
+    return pd.DataFrame(resultado, columns=["Nome", "Data", "Horas Trabalhadas"])
+
+PERIODOS_DO_DIA = ("Madrugada", "Manhã", "Tarde", "Noite")
+TIPOS_HORAS_EXTRAS = ("50%", "100%")
+
+def get_periodo_do_dia(dt_object: datetime) -> str:
+    hour = dt_object.hour
+    if 0 <= hour < 5:
+        return "Madrugada"
+    elif 5 <= hour < 12:
+        return "Manhã"
+    elif 12 <= hour < 18:
+        return "Tarde"
+    else:
+        return "Noite"
+
+# --- LÓGICA DE CÁLCULO DE HORAS EXTRAS REATORADA E SIMPLIFICADA ---
+
+def _parear_registros(df_colaborador: pd.DataFrame) -> List[Tuple[datetime, datetime]]:
+    """
+    Analisa os registros de ponto de um colaborador e os agrupa em intervalos de trabalho (início, fim).
+    """
+    periodos_trabalho = []
+    df_colaborador = df_colaborador.sort_values("DataHora").reset_index(drop=True)
+
+    i = 0
+    while i < len(df_colaborador):
+        row = df_colaborador.iloc[i]
+        acao = row["Ação"]
+
+        if acao == AcaoPonto.ENTRADA.value:
+            # Cenário 1: Entrada -> Saída
+            if i + 1 < len(df_colaborador) and df_colaborador.iloc[i + 1]["Ação"] == AcaoPonto.SAIDA.value:
+                periodos_trabalho.append((row["DataHora"], df_colaborador.iloc[i + 1]["DataHora"]))
+                i += 2
+            # Cenário 2: Entrada -> Pausa -> Retorno -> Saída
+            elif (i + 3 < len(df_colaborador) and
+                  df_colaborador.iloc[i + 1]["Ação"] == AcaoPonto.PAUSA.value and
+                  df_colaborador.iloc[i + 2]["Ação"] == AcaoPonto.RETORNO.value and
+                  df_colaborador.iloc[i + 3]["Ação"] == AcaoPonto.SAIDA.value):
+                periodos_trabalho.append((row["DataHora"], df_colaborador.iloc[i + 1]["DataHora"])) # Antes da pausa
+                periodos_trabalho.append((df_colaborador.iloc[i + 2]["DataHora"], df_colaborador.iloc[i + 3]["DataHora"])) # Depois da pausa
+                i += 4
+            else:
+                # Se não encontrar um par correspondente, avança para o próximo registro
+                i += 1
+        else:
+            i += 1
+
+    return periodos_trabalho
+
+def calcular_horas_extras(df_colaborador: pd.DataFrame, calendario: CalendarioFeriados) -> Dict[str, Dict[str, Any]]:
+    """
+    Calcula as horas extras (50% e 100%) para um determinado colaborador.
+    A lógica foi simplificada para primeiro identificar os períodos de trabalho
+    e depois aplicar as regras de horas extras a cada período.
+    """
+    extras_50_datas = defaultdict(list)
+    extras_100_datas = defaultdict(list)
+
+    df_colaborador["DataHora"] = pd.to_datetime(df_colaborador["Data"] + " " + df_colaborador["Hora"], format="%Y-%m-%d %H:%M", errors='coerce')
+    df_colaborador = df_colaborador.dropna(subset=["DataHora"])
+
+    periodos_trabalho = _parear_registros(df_colaborador)
+
+    for inicio_turno, fim_turno in periodos_trabalho:
+        data_atual_dt = inicio_turno.normalize()
+
+        while data_atual_dt <= fim_turno:
+            dia_semana = data_atual_dt.weekday()
+            data_atual = data_atual_dt.date()
+
+            # Define os limites de trabalho do dia atual
+            inicio_calculo = max(inicio_turno, data_atual_dt)
+            fim_calculo = min(fim_turno, data_atual_dt + timedelta(days=1, microseconds=-1))
+
+            if inicio_calculo >= fim_calculo:
+                data_atual_dt += timedelta(days=1)
+                continue
+
+            # Verifica se é um feriado ou domingo (100% HE)
+            is_holiday = calendario.eh_feriado(data_atual)
+            is_sunday = dia_semana == 6
+
+            if is_holiday or is_sunday:
+                duracao = fim_calculo - inicio_calculo
+                if duracao.total_seconds() > 0:
+                    extras_100_datas[data_atual].append({"duracao": duracao, "inicio_turno": inicio_turno, "periodo": get_periodo_do_dia(inicio_calculo)})
+            else: # Dias de semana (50% HE)
+                # Regra 1: Horas antes do início do expediente
+                limite_inicio = _no_horario(data_atual_dt, HORA_INICIO_EXPEDIENTE)
+                if inicio_calculo < limite_inicio:
+                    he_matinal = min(fim_calculo, limite_inicio) - inicio_calculo
+                    if he_matinal.total_seconds() > 0:
+                        extras_50_datas[data_atual].append({"duracao": he_matinal, "inicio_turno": inicio_turno, "periodo": get_periodo_do_dia(inicio_calculo)})
+
+                # Regra 2: Sábado - todas as horas são 50%
+                if dia_semana == 5: # Sábado
+                    inicio_sabado = max(inicio_calculo, limite_inicio)
+                    he_sabado = fim_calculo - inicio_sabado
+                    if he_sabado.total_seconds() > 0:
+                         extras_50_datas[data_atual].append({"duracao": he_sabado, "inicio_turno": inicio_turno, "periodo": get_periodo_do_dia(inicio_sabado)})
+
+                # Regra 3: Horas após o fim do expediente
+                if 0 <= dia_semana <= 4: # Seg a Sex (a sexta termina mais cedo)
+                    limite_fim = _no_horario(data_atual_dt, hora_fim_expediente(data_atual_dt))
+                else: # Domingo (já tratado) ou Sábado
+                    limite_fim = None
+
+                if limite_fim and fim_calculo > limite_fim:
+                    inicio_he_tarde = max(inicio_calculo, limite_fim)
+                    he_tarde = fim_calculo - inicio_he_tarde
+                    if he_tarde.total_seconds() > 0:
+                        extras_50_datas[data_atual].append({"duracao": he_tarde, "inicio_turno": inicio_turno, "periodo": get_periodo_do_dia(inicio_he_tarde)})
+
+            data_atual_dt += timedelta(days=1)
+
+    total_50 = sum([item['duracao'] for sublist in extras_50_datas.values() for item in sublist], timedelta())
+    total_100 = sum([item['duracao'] for sublist in extras_100_datas.values() for item in sublist], timedelta())
+
+    return {
+        "50%": {"total": total_50, "datas": extras_50_datas},
+        "100%": {"total": total_100, "datas": extras_100_datas},
+    }
+
+def resultado_horas_extras_vazio() -> Dict[str, Dict[str, Any]]:
+    return {
+        "50%": {"total": timedelta(), "datas": {}},
+        "100%": {"total": timedelta(), "datas": {}},
+    }
+
+@dataclass(frozen=True)
+class HorasExtrasCompactas:
+    """
+    Resultado de calcular_horas_extras guardado em arrays, um registro por posição, ordenados
+    por tipo, dia e início do turno. A duração fica em microssegundos inteiros (o último
+    instante do dia é 23:59:59.999999), então os totais são exatamente os do resultado original.
+    Ocupa uma fração dos dicionários de timedelta e Timestamp e é o formato guardado nos caches.
+    """
+    tipos: np.ndarray # uint8, índice em TIPOS_HORAS_EXTRAS
+    dias: np.ndarray # datetime64[D]
+    duracoes: np.ndarray # int64, microssegundos
+    inicios_turno: np.ndarray # datetime64[us]
+    periodos: np.ndarray # uint8, índice em PERIODOS_DO_DIA
+
+    @classmethod
+    def de_resultado(cls, resultado: Dict[str, Dict[str, Any]]) -> "HorasExtrasCompactas":
+        linhas = [
+            (indice_tipo, data, registro)
+            for indice_tipo, tipo in enumerate(TIPOS_HORAS_EXTRAS)
+            for data, lista in resultado[tipo]["datas"].items()
+            for registro in lista
+        ]
+        tipos = np.array([linha[0] for linha in linhas], dtype=np.uint8)
+        dias = np.array([linha[1] for linha in linhas], dtype="datetime64[D]")
+        duracoes = np.array([linha[2]["duracao"] // timedelta(microseconds=1) for linha in linhas], dtype=np.int64)
+        inicios = np.array([pd.Timestamp(linha[2]["inicio_turno"]).to_datetime64() for linha in linhas], dtype="datetime64[us]")
+        periodos = np.array([PERIODOS_DO_DIA.index(linha[2]["periodo"]) for linha in linhas], dtype=np.uint8)
+        # lexsort é estável: empates mantêm a ordem em que os registros foram calculados
+        ordem = np.lexsort((inicios, dias, tipos))
+        return cls(tipos[ordem], dias[ordem], duracoes[ordem], inicios[ordem], periodos[ordem])
+
+    @property
+    def nbytes(self) -> int:
+        # Memória ocupada, contando o cabeçalho de cada array (que domina nos resultados vazios)
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(array) for array in (self.tipos, self.dias, self.duracoes, self.inicios_turno, self.periodos)
+        )
+
+    def _filtro(self, tipo: str) -> np.ndarray:
+        return self.tipos == TIPOS_HORAS_EXTRAS.index(tipo)
+
+    def total(self, tipo: str) -> timedelta:
+        return timedelta(microseconds=int(self.duracoes[self._filtro(tipo)].sum()))
+
+    def registros(self, tipo: str) -> List[Dict[str, Any]]:
+        """
+        Registros de um tipo já em ordem de dia e início do turno.
+        """
+        filtro = self._filtro(tipo)
+        return [
+            {
+                "data_evento": dia.item(),
+                "duracao": timedelta(microseconds=int(duracao)),
+                "inicio_turno": pd.Timestamp(inicio),
+                "periodo": PERIODOS_DO_DIA[periodo],
+            }
+            for dia, duracao, inicio, periodo in zip(
+                self.dias[filtro], self.duracoes[filtro], self.inicios_turno[filtro], self.periodos[filtro]
+            )
+        ]
+
+    def expandir(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Volta ao formato de calcular_horas_extras, usado pelo relatório e pela planilha.
+        """
+        resultado = {}
+        for tipo in TIPOS_HORAS_EXTRAS:
+            datas = defaultdict(list)
+            for registro in self.registros(tipo):
+                data = registro.pop("data_evento")
+                datas[data].append(registro)
+            resultado[tipo] = {"total": self.total(tipo), "datas": datas}
+        return resultado
+
+def calcular_horas_extras_periodo(df_pontos: pd.DataFrame, nome_colaborador: str, data_inicio_str: str, data_fim_str: str, calendario: CalendarioFeriados) -> Dict[str, Dict[str, Any]]:
+    """
+    Filtra os registros do colaborador no período e calcula suas horas extras.
+    """
+    df_pontos_periodo = df_pontos[
+        (pd.to_datetime(df_pontos["Data"]) >= pd.to_datetime(data_inicio_str)) &
+        (pd.to_datetime(df_pontos["Data"]) <= pd.to_datetime(data_fim_str)) &
+        (df_pontos["Nome"] == nome_colaborador)
+    ]
+
+    if df_pontos_periodo.empty:
+        return resultado_horas_extras_vazio()
+
+    return calcular_horas_extras(df_pontos_periodo.copy(), calendario)
+
+def eh_vigia(funcao: Any) -> bool:
+    """
+    Vigias não são elegíveis para horas extras nem entram no cálculo de faltas.
+    """
+    return "vigia" in str(funcao).lower()
+
+def calcular_faltas(data_inicio, data_fim, df_colab: pd.DataFrame, df_pontos: pd.DataFrame, calendario: CalendarioFeriados) -> Dict[str, List[str]]:
+    """
+    Calcula os dias de falta para colaboradores (exceto vigias) no período especificado.
+    """
+
+    colabs_normais = df_colab[~df_colab['Funcao'].str.contains("vigia", case=False, na=False)]
+    nomes_esperados_set = set(colabs_normais['Nome'])
+
+    datas_periodo = pd.date_range(start=data_inicio, end=data_fim)
+    faltas_por_colaborador = defaultdict(list)
+
+    for data in datas_periodo:
+        data_atual = data.date()
+        # Considera apenas dias úteis (Seg-Sex) que não são feriados
+        if data.weekday() < 5 and not calendario.eh_feriado(data_atual):
+            data_str = data.strftime("%Y-%m-%d")
+
+            presentes_no_dia = set(df_pontos[
+                (df_pontos['Data'] == data_str) &
+                (df_pontos['Ação'] == AcaoPonto.ENTRADA.value)
+            ]['Nome'])
+
+            ausentes = nomes_esperados_set - presentes_no_dia
+
+            for nome_ausente in ausentes:
+                faltas_por_colaborador[nome_ausente].append(data.strftime('%Y-%m-%d')) # Salva no formato YYYY-MM-DD
+
+    return {nome: datas for nome, datas in faltas_por_colaborador.items() if datas}
+
+def faltas_para_dataframe(faltas: Dict[str, List[str]]) -> pd.DataFrame:
+    """
+    Converte o resultado de calcular_faltas em um DataFrame (Nome, Data) ordenado e sem repetições.
+    """
+    linhas = [(nome, data_str) for nome, datas in faltas.items() for data_str in datas]
+    df = pd.DataFrame(linhas, columns=["Nome", "Data"])
+    return df.drop_duplicates().sort_values(by=["Nome", "Data"], ignore_index=True)
+
+def horas_para_segundos(tempo: str) -> int:
+    try:
+        h, m = map(int, tempo.split(':'))
+        return (h * 3600) + (m * 60)
+    except (ValueError, TypeError, AttributeError):
+        return 0
+
+def resumir_horas_trabalhadas(df_horas_diarias: pd.DataFrame) -> pd.DataFrame:
+    """
+    Soma as horas diárias completas (resultado de calcular_horas) por colaborador.
+    Retorna as colunas Nome, Segundos e Total de Horas (HH:MM).
+    """
+    df_validas = df_horas_diarias[df_horas_diarias['Horas Trabalhadas'] != 'Registro Incompleto'].copy()
+    if df_validas.empty:
+        return pd.DataFrame(columns=['Nome', 'Segundos', 'Total de Horas'])
+    df_validas['Segundos'] = df_validas['Horas Trabalhadas'].apply(horas_para_segundos)
+    resumo = df_validas.groupby('Nome')['Segundos'].sum().reset_index()
+    resumo['Total de Horas'] = resumo['Segundos'].apply(lambda s: formatar_timedelta(timedelta(seconds=int(s))))
+    return resumo
@@ -0,0 +1,29 @@
+"""
+Calendário de feriados usado nos cálculos de horas extras e faltas.
+"""
+from datetime import date
+from typing import Iterable
+
+class CalendarioFeriados:
+    """
+    Reúne os feriados do sistema (nacionais e do Ceará), os feriados personalizados e os
+    feriados do sistema que o usuário decidiu ignorar.
+    """
+    def __init__(self, feriados_personalizados: Iterable[date] = (), feriados_ignorados: Iterable[date] = ()):
+        self._feriados_sistema = None
+        self.feriados_personalizados = set(feriados_personalizados)
+        self.feriados_ignorados = set(feriados_ignorados)
+
+    @property
+    def feriados_sistema(self):
+        # O pacote holidays só é importado na primeira consulta
+        if self._feriados_sistema is None:
+            import holidays
+            self._feriados_sistema = holidays.Brazil(state='CE')
+        return self._feriados_sistema
+
+    def eh_feriado_sistema(self, data: date) -> bool:
+        return data in self.feriados_sistema and data not in self.feriados_ignorados
+
+    def eh_feriado(self, data: date) -> bool:
+        return self.eh_feriado_sistema(data) or data in self.feriados_personalizados
@@ -0,0 +1,342 @@
+"""
+Linha de comando do controle de ponto, para rodar relatórios e importações sem o servidor
+do Streamlit (por exemplo, em tarefas agendadas no fechamento do mês).
+
+Uso:
+    python -m ponto report --inicio 2025-09-01 --fim 2025-09-30 --funcao PEDREIRO --saida relatorios
+    python -m ponto lote --referencia 2025-09-30 --meses 3 --por-funcao --saida relatorios
+    python -m ponto migrar
+    python -m ponto afd AFD00001.txt --simular
+    python -m ponto importar registros.csv --rejeitados rejeitados.csv
+    python -m ponto folha --competencia 2025-09 --formato fixo
+    PONTO_API_CHAVE=segredo python -m ponto api --porta 8765
+    python -m ponto fila sincronizar --url http://servidor:8765 --chave segredo
+    python -m ponto sintetico --colaboradores 500 --anos 2 --saida base_teste
+    python -m ponto benchmark --escalas 50x1 500x2 5000x5 --csv medicoes.csv
+    python -m ponto partida --orcamento 3
+"""
+import argparse
+import os
+import subprocess
+import sys
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from ponto.afd import importar_arquivo_afd
+from ponto.dados import ARQ_PONTO, DataManager
+from ponto.fila import ARQ_FILA_OFFLINE, FilaOffline, enviador_api, enviador_local
+from ponto.folha import gravar_folha, linhas_folha
+from ponto.importacao import importar_pontos, ler_planilha_pontos
+from ponto.lote import gerar_relatorios_em_lote, periodos_mensais, planejar_tarefas
+from ponto.partida import ORCAMENTO_PRIMEIRA_PAGINA, medir_partida
+from ponto.planilha import xlsx_disponivel
+from ponto.relatorio import gerar_relatorio_diretoria, salvar_relatorio
+
+def _data(valor: str) -> date:
+    for formato in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"Data inválida: '{valor}'. Use AAAA-MM-DD ou DD/MM/AAAA.")
+
+def _verificar_xlsx(args: argparse.Namespace) -> bool:
+    if args.xlsx and not xlsx_disponivel():
+        print("A opção --xlsx requer o pacote openpyxl (pip install openpyxl).", file=sys.stderr)
+        return False
+    return True
+
+def comando_relatorio(args: argparse.Namespace) -> int:
+    if not _verificar_xlsx(args):
+        return 2
+    if args.fim < args.inicio:
+        print("A data final deve ser igual ou posterior à data inicial.", file=sys.stderr)
+        return 2
+    data_manager = DataManager.no_diretorio(args.dados)
+    relatorio = gerar_relatorio_diretoria(data_manager, args.inicio, args.fim, args.funcao)
+    for arquivo in salvar_relatorio(relatorio, args.saida, args.gzip, args.xlsx):
+        print(arquivo)
+    return 0
+
+def comando_lote(args: argparse.Namespace) -> int:
+    if not _verificar_xlsx(args):
+        return 2
+    data_manager = DataManager.no_diretorio(args.dados)
+    dados = data_manager.carregar_tudo()
+
+    funcoes = [None]
+    if args.funcao:
+        funcoes = args.funcao
+    elif args.por_funcao:
+        funcoes += sorted(dados.colaboradores["Funcao"].dropna().unique().tolist())
+
+    tarefas = planejar_tarefas(periodos_mensais(args.referencia, args.meses), funcoes)
+    resultados = gerar_relatorios_em_lote(dados, tarefas, args.saida, args.gzip, args.processos, args.xlsx)
+
+    falhas = 0
+    for tarefa, arquivos, erro in resultados:
+        if erro:
+            falhas += 1
+            print(f"[ERRO] {tarefa.descricao}: {erro}", file=sys.stderr)
+        else:
+            print(f"[OK] {tarefa.descricao}: {len(arquivos)} arquivo(s)")
+    print(f"{len(resultados) - falhas} de {len(resultados)} relatório(s) gerado(s) em {args.saida}")
+    return 1 if falhas else 0
+
+def comando_migrar(args: argparse.Namespace) -> int:
+    if DataManager.no_diretorio(args.dados).migrar_pontos():
+        print("Registros de ponto atualizados com ID e versão.")
+    else:
+        print("Os registros de ponto já estão no formato atual.")
+    return 0
+
+def comando_afd(args: argparse.Namespace) -> int:
+    data_manager = DataManager.no_diretorio(args.dados)
+    resultado = importar_arquivo_afd(args.arquivo, data_manager, args.simular)
+    print(resultado.resumo)
+    for identificador, quantidade in resultado.sem_colaborador.most_common(10):
+        print(f"  PIS/CPF {identificador} sem colaborador cadastrado: {quantidade} marcação(ões)")
+    if args.simular:
+        print("Simulação: nenhum registro foi gravado.")
+    return 0
+
+def comando_importar(args: argparse.Namespace) -> int:
+    data_manager = DataManager.no_diretorio(args.dados)
+    try:
+        resultado = importar_pontos(ler_planilha_pontos(args.arquivo), data_manager, args.simular)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    print(resultado.resumo)
+    if not resultado.rejeitados.empty:
+        if args.rejeitados:
+            resultado.rejeitados.to_csv(args.rejeitados, index=False)
+            print(f"Linhas rejeitadas gravadas em {args.rejeitados}")
+        else:
+            print(resultado.rejeitados.to_string(index=False))
+    if args.simular:
+        print("Simulação: nenhum registro foi gravado.")
+    return 0
+
+def _competencia(valor: str) -> date:
+    try:
+        return datetime.strptime(valor, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Competência inválida: '{valor}'. Use AAAA-MM.")
+
+def comando_folha(args: argparse.Namespace) -> int:
+    inicio = args.inicio or args.competencia
+    fim = args.fim or (args.competencia.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    if fim < inicio:
+        print("A data final deve ser igual ou posterior à data inicial.", file=sys.stderr)
+        return 2
+    dados = DataManager.no_diretorio(args.dados).carregar_tudo()
+    linhas = linhas_folha(dados, inicio, fim, args.funcao)
+
+    extensao = "csv" if args.formato == "csv" else "txt"
+    caminho = args.saida or f"folha_{args.competencia.strftime('%Y%m')}.{extensao}"
+    resultado = gravar_folha(linhas, caminho, args.formato, args.competencia.strftime("%Y%m"))
+    print(f"{resultado.resumo} Arquivo: {caminho}")
+    for nome, motivo in resultado.rejeitadas:
+        print(f"  {nome}: {motivo}", file=sys.stderr)
+    # Com rejeitados, o arquivo é gravado sem eles e o código de saída avisa a tarefa agendada
+    return 1 if resultado.rejeitadas else 0
+
+def comando_api(args: argparse.Namespace) -> int:
+    from ponto.api import criar_servidor
+    chave = args.chave or os.environ.get("PONTO_API_CHAVE")
+    if not chave:
+        print("Informe a chave de acesso com --chave ou na variável de ambiente PONTO_API_CHAVE.", file=sys.stderr)
+        return 2
+    servidor = criar_servidor(DataManager.no_diretorio(args.dados), chave, args.host, args.porta)
+    print(f"API de registro de ponto em http://{args.host}:{args.porta} (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+def comando_fila_registrar(args: argparse.Namespace) -> int:
+    fila = FilaOffline(args.fila, args.dispositivo)
+    try:
+        id_cliente = fila.registrar(args.nome, args.acao)
+    except ValueError:
+        print(f"Ação inválida: '{args.acao}'.", file=sys.stderr)
+        return 2
+    print(f"Registro {id_cliente} guardado na fila ({fila.quantidade_pendente()} pendente(s)).")
+    return 0
+
+def comando_fila_sincronizar(args: argparse.Namespace) -> int:
+    fila = FilaOffline(args.fila, args.dispositivo)
+    if args.url:
+        chave = args.chave or os.environ.get("PONTO_API_CHAVE")
+        if not chave:
+            print("Informe a chave de acesso com --chave ou na variável de ambiente PONTO_API_CHAVE.", file=sys.stderr)
+            return 2
+        enviar = enviador_api(args.url, chave)
+    else:
+        enviar = enviador_local(DataManager.no_diretorio(args.dados))
+    resultado = fila.sincronizar(enviar)
+    print(resultado.resumo)
+    for conflito in resultado.conflitos:
+        print(f"  {conflito['data']} {conflito['hora']} {conflito['nome']} ({conflito['acao']}): {conflito['motivo']}")
+    return 1 if resultado.erro else 0
+
+def comando_fila_conflitos(args: argparse.Namespace) -> int:
+    conflitos = FilaOffline(args.fila, args.dispositivo).conflitos()
+    if conflitos.empty:
+        print("Nenhum conflito registrado.")
+    elif args.saida:
+        conflitos.to_csv(args.saida, index=False)
+        print(f"{len(conflitos)} conflito(s) gravado(s) em {args.saida}")
+    else:
+        print(conflitos.to_string(index=False))
+    return 0
+
+def comando_sintetico(args: argparse.Namespace) -> int:
+    from ponto.sintetico import gerar_dados_sinteticos
+    if os.path.exists(os.path.join(args.saida, ARQ_PONTO)) and not args.sobrescrever:
+        print(f"{args.saida} já tem registros de ponto. Use --sobrescrever para substituí-los.", file=sys.stderr)
+        return 2
+    resultado = gerar_dados_sinteticos(args.saida, args.colaboradores, args.anos, args.inicio, args.semente)
+    print(resultado.resumo)
+    return 0
+
+def comando_benchmark(args: argparse.Namespace) -> int:
+    from ponto.benchmark import ESCALAS_PADRAO, executar_benchmark, interpretar_escala, medicoes_para_dataframe
+    try:
+        escalas = [interpretar_escala(escala) for escala in args.escalas] if args.escalas else ESCALAS_PADRAO
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    def mostrar(medicao):
+        pico = "" if medicao.pico_bytes is None else f", pico de {medicao.pico_bytes / (1024 * 1024):.1f} MB"
+        print(f"{medicao.colaboradores}x{medicao.anos} {medicao.etapa}: {medicao.segundos:.3f} s "
+              f"({medicao.por_segundo:,.0f} {medicao.unidade}/s{pico})", flush=True)
+    medicoes = executar_benchmark(escalas, args.bases, args.dias, not args.sem_memoria, args.semente, mostrar)
+    df = medicoes_para_dataframe(medicoes)
+    print()
+    print(df.to_string(index=False))
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+        print(f"Medições gravadas em {args.csv}")
+    return 0
+
+def comando_partida(args: argparse.Namespace) -> int:
+    try:
+        segundos = medir_partida(args.dados)
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    print(f"Primeira página exibida em {segundos:.2f} s (orçamento: {args.orcamento:.1f} s).")
+    if segundos > args.orcamento:
+        print("Orçamento de partida ultrapassado.", file=sys.stderr)
+        return 1
+    return 0
+
+def criar_parser() -> argparse.ArgumentParser:
+    hoje = date.today()
+    parser = argparse.ArgumentParser(prog="python -m ponto", description="Controle de Ponto sem interface gráfica.")
+    parser.add_argument("--dados", default=".", help="Diretório com os arquivos CSV do sistema (padrão: diretório atual).")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    p_relatorio = subparsers.add_parser("report", aliases=["relatorio"], help="Gera o relatório da diretoria (HTML e resumos em CSV).")
+    p_relatorio.add_argument("--inicio", type=_data, default=hoje.replace(day=1), help="Data inicial (padrão: primeiro dia do mês).")
+    p_relatorio.add_argument("--fim", type=_data, default=hoje, help="Data final (padrão: hoje).")
+    p_relatorio.add_argument("--funcao", default=None, help="Filtra os colaboradores por função (padrão: todas).")
+    p_relatorio.add_argument("--saida", default="relatorios", help="Diretório onde os arquivos serão gravados.")
+    p_relatorio.add_argument("--gzip", action="store_true", help="Grava também o HTML compactado (.html.gz).")
+    p_relatorio.add_argument("--xlsx", action="store_true", help="Grava também a planilha Excel (requer openpyxl).")
+    p_relatorio.set_defaults(func=comando_relatorio)
+
+    p_lote = subparsers.add_parser("lote", aliases=["batch"], help="Gera relatórios de vários meses e funções em paralelo.")
+    p_lote.add_argument("--referencia", type=_data, default=hoje, help="Último dia do mês mais recente (padrão: hoje).")
+    p_lote.add_argument("--meses", type=int, default=1, help="Quantidade de meses, contando o de referência (padrão: 1).")
+    grupo_funcoes = p_lote.add_mutually_exclusive_group()
+    grupo_funcoes.add_argument("--por-funcao", action="store_true", help="Gera também um relatório para cada função cadastrada.")
+    grupo_funcoes.add_argument("--funcao", action="append", help="Gera relatórios apenas das funções informadas (pode repetir).")
+    p_lote.add_argument("--processos", type=int, default=None, help="Número de processos (padrão: um por núcleo).")
+    p_lote.add_argument("--saida", default="relatorios", help="Diretório onde os arquivos serão gravados.")
+    p_lote.add_argument("--gzip", action="store_true", help="Grava também o HTML compactado (.html.gz).")
+    p_lote.add_argument("--xlsx", action="store_true", help="Grava também a planilha Excel (requer openpyxl).")
+    p_lote.set_defaults(func=comando_lote)
+
+    p_migrar = subparsers.add_parser("migrar", aliases=["migrate"], help="Grava ID e versão nos registros de ponto de antes dessas colunas.")
+    p_migrar.set_defaults(func=comando_migrar)
+
+    p_afd = subparsers.add_parser("afd", help="Importa as marcações de um arquivo AFD de relógio de ponto (REP).")
+    p_afd.add_argument("arquivo", help="Caminho do arquivo AFD (.txt).")
+    p_afd.add_argument("--simular", action="store_true", help="Apenas mostra o que seria importado, sem gravar.")
+    p_afd.set_defaults(func=comando_afd)
+
+    p_importar = subparsers.add_parser("importar", aliases=["import"], help="Importa registros de ponto de uma planilha .csv (Nome, Ação, Data, Hora).")
+    p_importar.add_argument("arquivo", help="Caminho da planilha .csv (separada por vírgula ou ponto e vírgula).")
+    p_importar.add_argument("--simular", action="store_true", help="Apenas valida a planilha, sem gravar.")
+    p_importar.add_argument("--rejeitados", default=None, help="Grava as linhas rejeitadas (com o motivo) neste arquivo .csv.")
+    p_importar.set_defaults(func=comando_importar)
+
+    mes_anterior = (hoje.replace(day=1) - timedelta(days=1)).replace(day=1)
+    p_folha = subparsers.add_parser("folha", aliases=["payroll"], help="Exporta horas, horas extras e faltas do mês para a folha de pagamento.")
+    p_folha.add_argument("--competencia", type=_competencia, default=mes_anterior, help="Mês de referência AAAA-MM (padrão: mês anterior).")
+    p_folha.add_argument("--inicio", type=_data, default=None, help="Data inicial, se o período da folha não for o mês civil.")
+    p_folha.add_argument("--fim", type=_data, default=None, help="Data final, se o período da folha não for o mês civil.")
+    p_folha.add_argument("--funcao", default=None, help="Exporta apenas os colaboradores de uma função (padrão: todas).")
+    p_folha.add_argument("--formato", choices=["csv", "fixo"], default="csv", help="CSV ou layout de largura fixa (padrão: csv).")
+    p_folha.add_argument("--saida", default=None, help="Arquivo de saída (padrão: folha_AAAAMM.csv ou .txt).")
+    p_folha.set_defaults(func=comando_folha)
+
+    p_api = subparsers.add_parser("api", help="Inicia a API HTTP de registro de ponto para os tablets das portarias.")
+    p_api.add_argument("--host", default="0.0.0.0", help="Endereço de escuta (padrão: 0.0.0.0).")
+    p_api.add_argument("--porta", type=int, default=8765, help="Porta de escuta (padrão: 8765).")
+    p_api.add_argument("--chave", default=None, help="Chave de acesso (padrão: variável de ambiente PONTO_API_CHAVE).")
+    p_api.set_defaults(func=comando_api)
+
+    p_fila = subparsers.add_parser("fila", aliases=["queue"], help="Fila local de registros para tablets sem conexão.")
+    p_fila.add_argument("--fila", default=ARQ_FILA_OFFLINE, help=f"Arquivo SQLite da fila (padrão: {ARQ_FILA_OFFLINE}).")
+    p_fila.add_argument("--dispositivo", default=None, help="Identificação do tablet nos ids dos registros (padrão: nome da máquina).")
+    acoes_fila = p_fila.add_subparsers(dest="acao_fila", required=True)
+
+    p_fila_registrar = acoes_fila.add_parser("registrar", help="Guarda um registro na fila.")
+    p_fila_registrar.add_argument("nome", help="Nome do colaborador, como cadastrado.")
+    p_fila_registrar.add_argument("acao", help="Entrada, Saída, Pausa ou Retorno.")
+    p_fila_registrar.set_defaults(func=comando_fila_registrar)
+
+    p_fila_sincronizar = acoes_fila.add_parser("sincronizar", help="Envia os registros pendentes em lotes, na ordem de captura.")
+    p_fila_sincronizar.add_argument("--url", default=None, help="Endereço da API (padrão: gravar direto nos arquivos de --dados).")
+    p_fila_sincronizar.add_argument("--chave", default=None, help="Chave de acesso da API (padrão: variável de ambiente PONTO_API_CHAVE).")
+    p_fila_sincronizar.set_defaults(func=comando_fila_sincronizar)
+
+    p_fila_conflitos = acoes_fila.add_parser("conflitos", help="Lista os registros rejeitados na sincronização.")
+    p_fila_conflitos.add_argument("--saida", default=None, help="Grava os conflitos neste arquivo .csv.")
+    p_fila_conflitos.set_defaults(func=comando_fila_conflitos)
+
+    p_sintetico = subparsers.add_parser("sintetico", aliases=["synthetic"], help="Gera uma base sintética para testes de carga.")
+    p_sintetico.add_argument("--colaboradores", type=int, default=50, help="Quantidade de colaboradores (padrão: 50).")
+    p_sintetico.add_argument("--anos", type=int, default=1, help="Anos de registros (padrão: 1).")
+    p_sintetico.add_argument("--inicio", type=_data, default=date(2024, 1, 1), help="Primeiro dia dos registros (padrão: 2024-01-01).")
+    p_sintetico.add_argument("--semente", type=int, default=0, help="Semente do gerador: a mesma semente gera os mesmos dados.")
+    p_sintetico.add_argument("--saida", required=True, help="Diretório onde os arquivos CSV serão gravados.")
+    p_sintetico.add_argument("--sobrescrever", action="store_true", help="Substitui os arquivos se o diretório já tiver dados.")
+    p_sintetico.set_defaults(func=comando_sintetico)
+
+    p_benchmark = subparsers.add_parser("benchmark", help="Mede tempo, vazão e memória dos cálculos em bases sintéticas.")
+    p_benchmark.add_argument("--escalas", nargs="+", default=None, help="Escalas COLABORADORESxANOS (padrão: 50x1 500x2).")
+    p_benchmark.add_argument("--dias", type=int, default=31, help="Dias do período calculado, no fim da base; 0 usa a base inteira (padrão: 31).")
+    p_benchmark.add_argument("--bases", default="bases_sinteticas", help="Diretório das bases geradas, reaproveitadas entre execuções.")
+    p_benchmark.add_argument("--semente", type=int, default=0, help="Semente do gerador das bases.")
+    p_benchmark.add_argument("--sem-memoria", action="store_true", help="Mede só o tempo (o pico de memória é medido repetindo cada etapa, bem mais devagar).")
+    p_benchmark.add_argument("--csv", default=None, help="Grava as medições neste arquivo .csv.")
+    p_benchmark.set_defaults(func=comando_benchmark)
+
+    p_partida = subparsers.add_parser("partida", aliases=["startup"], help="Mede a partida a frio da interface e falha se passar do orçamento.")
+    p_partida.add_argument("--orcamento", type=float, default=ORCAMENTO_PRIMEIRA_PAGINA,
+                           help=f"Segundos até a primeira página (padrão: {ORCAMENTO_PRIMEIRA_PAGINA:g}).")
+    p_partida.set_defaults(func=comando_partida)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = criar_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,454 @@
+"""
+Camada de armazenamento do controle de ponto: arquivos CSV, tipos de ação e o DataManager.
+Não depende do Streamlit, para poder ser usada tanto pela interface quanto pela linha de comando.
+"""
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from filelock import FileLock
+except ImportError as e:
+    # Sem ele, a interface, a API e a linha de comando gravariam os mesmos arquivos sem se enxergar
+    raise ImportError("O pacote filelock é obrigatório para gravar os arquivos de dados: pip install filelock") from e
+
+from ponto.calendario import CalendarioFeriados
+
+# --- Constantes de Arquivos e Diretórios ---
+ARQ_PONTO = "registro_ponto.csv"
+ARQ_COLAB = "colaboradores.csv"
+ARQ_FERIADOS = "feriados.csv"
+ARQ_FERIADOS_IGNORADOS = "feriados_ignorados.csv"
+ARQ_JUSTIFICATIVAS = "justificativas_faltas.csv" # NOVO ARQUIVO
+ARQ_ESCALAS = "escalas.csv"
+FOTOS_DIR = "fotos_colaboradores"
+
+COLUNAS_COLAB = ["Nome", "Funcao"]
+# Coluna opcional de colaboradores.csv: PIS ou CPF usado pelos relógios de ponto (REP)
+COLUNA_PIS_CPF = "PIS_CPF"
+COLUNAS_PONTO = ["Nome", "Ação", "Data", "Hora"]
+# Identificador estável de cada registro e a sua versão, incrementada a cada alteração
+COLUNA_ID_PONTO = "ID"
+COLUNA_VERSAO_PONTO = "Versao"
+COLUNAS_PONTO_ARQUIVO = COLUNAS_PONTO + [COLUNA_ID_PONTO, COLUNA_VERSAO_PONTO]
+COLUNAS_FERIADOS = ["Data", "Descricao"]
+COLUNAS_JUSTIFICATIVAS = ["Nome", "Data", "Status"]
+# Modelos de turno. Padrao: dias de trabalho (1) e de folga (0) do ciclo, ex.: "10" para 12x36
+COLUNAS_ESCALAS = ["Nome", "Entrada", "Saida", "Pausa", "Retorno", "Padrao"]
+ESCALAS_INICIAIS = [
+    ["Vigia Noturno 12x36", "18:00", "06:00", "", "", "10"],
+    ["Vigia Diurno 12x36", "06:00", "18:00", "", "", "10"],
+]
+
+# Situações possíveis de uma ausência; "Falta" é o padrão quando não há justificativa
+OPCOES_STATUS_JUSTIFICATIVA = ["Falta", "Atestado", "Folga", "Não Apto"]
+# Leituras de carregar_tudo antes de aceitar um instantâneo com arquivos ainda mudando
+TENTATIVAS_INSTANTANEO = 3
+
+# Utilitário para lock de arquivo
+@contextmanager
+def safe_csv_write(filepath):
+    lock = FileLock(filepath + ".lock")
+    with lock:
+        yield
+
+class ConflitoVersao(Exception):
+    """
+    O registro foi alterado ou excluído por outra pessoa depois de ter sido lido.
+    """
+
+def _ids_pelo_conteudo(df: pd.DataFrame) -> pd.Series:
+    # Registros iguais são diferenciados pela ordem em que aparecem
+    ocorrencia = df.groupby(COLUNAS_PONTO, dropna=False, sort=False).cumcount()
+    hashes = pd.util.hash_pandas_object(df[COLUNAS_PONTO].astype(str).assign(Ocorrencia=ocorrencia), index=False)
+    return hashes.map("{:016x}".format)
+
+def preencher_ids_pontos(df: pd.DataFrame, novos: bool) -> pd.DataFrame:
+    """
+    Completa ID e Versao dos registros que não os têm. Registros novos recebem IDs aleatórios;
+    registros antigos (de antes da coluna ID) recebem IDs derivados do conteúdo, que não mudam
+    entre leituras até serem gravados.
+    """
+    if COLUNA_ID_PONTO not in df.columns:
+        df[COLUNA_ID_PONTO] = None
+    sem_id = df[COLUNA_ID_PONTO].isna()
+    if sem_id.any():
+        if novos:
+            df.loc[sem_id, COLUNA_ID_PONTO] = [uuid.uuid4().hex[:16] for _ in range(sem_id.sum())]
+        else:
+            df.loc[sem_id, COLUNA_ID_PONTO] = _ids_pelo_conteudo(df)[sem_id]
+    versoes = df[COLUNA_VERSAO_PONTO] if COLUNA_VERSAO_PONTO in df.columns else pd.Series(1, index=df.index)
+    df[COLUNA_VERSAO_PONTO] = versoes.fillna(1).astype(int)
+    return df
+
+class AcaoPonto(str, Enum):
+    ENTRADA = "Entrada"
+    SAIDA = "Saída"
+    PAUSA = "Pausa"
+    RETORNO = "Retorno"
+
+def construir_indice_justificativas(df_justificativas: pd.DataFrame) -> pd.Series:
+    """
+    Índice em hash (Nome, Data) -> Status. Em caso de repetição vale a primeira justificativa.
+    """
+    df = df_justificativas.drop_duplicates(subset=["Nome", "Data"], keep="first")
+    return df.set_index(["Nome", "Data"])["Status"]
+
+def aplicar_justificativas(df_faltas: pd.DataFrame, indice: pd.Series) -> pd.DataFrame:
+    """
+    Acrescenta a coluna Status a um DataFrame de ausências (colunas Nome e Data) com uma
+    única junção contra o índice de justificativas. Ausências sem justificativa ficam como "Falta".
+    """
+    df = df_faltas[["Nome", "Data"]].join(indice.rename("Status"), on=["Nome", "Data"])
+    df["Status"] = df["Status"].fillna("Falta")
+    return df
+
+@dataclass
+class InstantaneoDados:
+    """
+    Cópia de todos os conjuntos de dados lidos de uma só vez. Todas as etapas de um relatório
+    que recebem o mesmo instantâneo enxergam a mesma versão dos dados. Pode ser enviado a
+    outros processos (é serializável com pickle).
+    """
+    colaboradores: pd.DataFrame
+    pontos: pd.DataFrame
+    feriados: pd.DataFrame
+    feriados_ignorados: pd.DataFrame
+    justificativas: pd.DataFrame
+    # versao_dados() dos arquivos lidos (None quando o instantâneo não veio de um DataManager)
+    versao: Optional[Tuple[Tuple[int, int], ...]] = None
+    _indice_justificativas: Optional[pd.Series] = field(default=None, repr=False)
+
+    def carregar_calendario(self) -> CalendarioFeriados:
+        return CalendarioFeriados(set(self.feriados['Data']), set(self.feriados_ignorados['Data']))
+
+    def indice_justificativas(self) -> pd.Series:
+        if self._indice_justificativas is None:
+            self._indice_justificativas = construir_indice_justificativas(self.justificativas)
+        return self._indice_justificativas
+
+    def resolver_status_faltas(self, df_faltas: pd.DataFrame) -> pd.DataFrame:
+        return aplicar_justificativas(df_faltas, self.indice_justificativas())
+
+def _localizar_versao(df: pd.DataFrame, id_ponto: str, versao: int):
+    linhas = df.index[df[COLUNA_ID_PONTO] == id_ponto]
+    if len(linhas) == 0:
+        raise ConflitoVersao("O registro foi excluído por outra pessoa.")
+    if int(df.loc[linhas[0], COLUNA_VERSAO_PONTO]) != versao:
+        raise ConflitoVersao("O registro foi alterado por outra pessoa. Confira os dados atuais antes de salvar.")
+    return linhas[0]
+
+def _com_ids_pontos(alteracao: Callable[[pd.DataFrame], Tuple[Optional[pd.DataFrame], Any]]):
+    # Registros acrescentados por uma alteração saem dela já com ID e versão
+    def aplicar(df: pd.DataFrame):
+        novo, resultado = alteracao(df)
+        return (None if novo is None else preencher_ids_pontos(novo, novos=True)), resultado
+    return aplicar
+
+class DataManager:
+    def __init__(self, arq_colab: str, arq_ponto: str, fotos_dir: str, arq_feriados: str, arq_feriados_ignorados: str, arq_justificativas: str, arq_escalas: str):
+        self.arq_colab = arq_colab
+        self.arq_ponto = arq_ponto
+        self.fotos_dir = fotos_dir
+        self.arq_feriados = arq_feriados
+        self.arq_feriados_ignorados = arq_feriados_ignorados
+        self.arq_justificativas = arq_justificativas # NOVO
+        self.arq_escalas = arq_escalas
+        self._indice_justificativas: Optional[Tuple[Tuple[int, int], pd.Series]] = None
+        self._inicializar_arquivos()
+
+    @classmethod
+    def no_diretorio(cls, diretorio: str = ".") -> "DataManager":
+        """
+        Cria um DataManager com os nomes de arquivo padrão dentro do diretório informado.
+        """
+        return cls(
+            os.path.join(diretorio, ARQ_COLAB),
+            os.path.join(diretorio, ARQ_PONTO),
+            os.path.join(diretorio, FOTOS_DIR),
+            os.path.join(diretorio, ARQ_FERIADOS),
+            os.path.join(diretorio, ARQ_FERIADOS_IGNORADOS),
+            os.path.join(diretorio, ARQ_JUSTIFICATIVAS),
+            os.path.join(diretorio, ARQ_ESCALAS),
+        )
+
+    def _inicializar_arquivos(self):
+        # Garante que os arquivos CSV existam
+        if not os.path.exists(self.arq_colab):
+            pd.DataFrame(columns=COLUNAS_COLAB).to_csv(self.arq_colab, index=False)
+        if not os.path.exists(self.arq_ponto):
+            pd.DataFrame(columns=COLUNAS_PONTO_ARQUIVO).to_csv(self.arq_ponto, index=False)
+        if not os.path.exists(self.arq_feriados):
+            pd.DataFrame(columns=COLUNAS_FERIADOS).to_csv(self.arq_feriados, index=False)
+        if not os.path.exists(self.arq_feriados_ignorados):
+            pd.DataFrame(columns=COLUNAS_FERIADOS).to_csv(self.arq_feriados_ignorados, index=False)
+        # NOVO - Inicializa arquivo de justificativas
+        if not os.path.exists(self.arq_justificativas):
+            pd.DataFrame(columns=COLUNAS_JUSTIFICATIVAS).to_csv(self.arq_justificativas, index=False)
+        if not os.path.exists(self.arq_escalas):
+            pd.DataFrame(ESCALAS_INICIAIS, columns=COLUNAS_ESCALAS).to_csv(self.arq_escalas, index=False)
+
+        os.makedirs(self.fotos_dir, exist_ok=True)
+
+    def _apos_salvar(self, arquivo: str):
+        """
+        Ponto de extensão chamado depois de cada gravação. A interface o usa para limpar seus caches.
+        """
+
+    @staticmethod
+    def versao_arquivo(arquivo: str) -> Tuple[int, int]:
+        """
+        Versão dos dados de um arquivo: muda sempre que o arquivo é regravado.
+        """
+        try:
+            info = os.stat(arquivo)
+            return (info.st_mtime_ns, info.st_size)
+        except FileNotFoundError:
+            return (0, 0)
+
+    def arquivos_dados(self) -> Tuple[str, ...]:
+        """
+        Arquivos usados nos cálculos (os modelos de turno ficam de fora).
+        """
+        return (self.arq_colab, self.arq_ponto, self.arq_feriados, self.arq_feriados_ignorados, self.arq_justificativas)
+
+    def versao_dados(self) -> Tuple[Tuple[int, int], ...]:
+        """
+        Versão conjunta de todos os arquivos de dados.
+        """
+        return tuple(self.versao_arquivo(arquivo) for arquivo in self.arquivos_dados())
+
+    @staticmethod
+    def _ler_csv(arquivo: str, colunas: List[str], dtype: Optional[dict] = None) -> pd.DataFrame:
+        try:
+            return pd.read_csv(arquivo, dtype=dtype)
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return pd.DataFrame(columns=colunas)
+
+    def _ler_arquivo(self, arquivo: str) -> pd.DataFrame:
+        # Leituras diretas do disco pelos leitores desta classe, nunca pelos carregar_* que as
+        # subclasses sobrescrevem com caches: o escritor único lê sob o lock e precisa do
+        # conteúdo atual do arquivo, não de uma versão guardada
+        leitores = {
+            self.arq_colab: self._ler_colaboradores,
+            self.arq_ponto: self._ler_pontos,
+            self.arq_feriados: lambda: self._ler_feriados(self.arq_feriados),
+            self.arq_feriados_ignorados: lambda: self._ler_feriados(self.arq_feriados_ignorados),
+            self.arq_justificativas: self._ler_justificativas,
+            self.arq_escalas: self._ler_escalas,
+        }
+        return leitores[arquivo]()
+
+    def alterar(self, arquivo: str, alteracao: Callable[[pd.DataFrame], Tuple[Optional[pd.DataFrame], Any]]) -> Any:
+        """
+        Lê, altera e grava o arquivo pelo escritor único (ponto/escritor.py). A alteração recebe
+        o conteúdo atual e devolve (novo conteúdo ou None para não gravar, resultado); o
+        resultado é devolvido depois da gravação.
+        """
+        from ponto.escritor import escritor_unico # importação local: escritor depende deste módulo
+        if arquivo == self.arq_ponto:
+            alteracao = _com_ids_pontos(alteracao)
+        gravou, resultado = escritor_unico().executar(arquivo, lambda: self._ler_arquivo(arquivo), alteracao)
+        if gravou:
+            self._apos_salvar(arquivo)
+        return resultado
+
+    def _gravar_csv(self, df: pd.DataFrame, arquivo: str):
+        self.alterar(arquivo, lambda _: (df, None))
+
+    def _ler_colaboradores(self) -> pd.DataFrame:
+        # PIS/CPF lido como texto para preservar os zeros à esquerda
+        return self._ler_csv(self.arq_colab, COLUNAS_COLAB, dtype={COLUNA_PIS_CPF: str})
+
+    def carregar_colaboradores(self) -> pd.DataFrame:
+        return self._ler_colaboradores()
+
+    def salvar_colaboradores(self, df: pd.DataFrame):
+        self._gravar_csv(df, self.arq_colab)
+
+    def _ler_pontos(self) -> pd.DataFrame:
+        df = self._ler_csv(self.arq_ponto, COLUNAS_PONTO_ARQUIVO, dtype={COLUNA_ID_PONTO: str})
+        return preencher_ids_pontos(df, novos=False)
+
+    def carregar_pontos(self) -> pd.DataFrame:
+        return self._ler_pontos()
+
+    def salvar_pontos(self, df: pd.DataFrame):
+        self._gravar_csv(df, self.arq_ponto)
+
+    def atualizar_ponto(self, id_ponto: str, versao: int, valores: Dict[str, str]) -> int:
+        """
+        Altera um registro se ele ainda estiver na versão informada (compare-and-set) e
+        devolve a nova versão. Levanta ConflitoVersao se ele tiver sido alterado ou excluído.
+        """
+        def aplicar(df: pd.DataFrame):
+            linha = _localizar_versao(df, id_ponto, versao)
+            for coluna, valor in valores.items():
+                df.loc[linha, coluna] = valor
+            df.loc[linha, COLUNA_VERSAO_PONTO] = versao + 1
+            return df, versao + 1
+        return self.alterar(self.arq_ponto, aplicar)
+
+    def excluir_ponto(self, id_ponto: str, versao: int):
+        """
+        Exclui um registro se ele ainda estiver na versão informada. Levanta ConflitoVersao caso contrário.
+        """
+        def aplicar(df: pd.DataFrame):
+            return df.drop(_localizar_versao(df, id_ponto, versao)), None
+        self.alterar(self.arq_ponto, aplicar)
+
+    def migrar_pontos(self) -> bool:
+        """
+        Grava, pelo escritor único, os IDs e versões de um arquivo de pontos de antes dessas
+        colunas (os IDs derivados do conteúdo, os mesmos que as leituras já usam). Devolve True
+        se o arquivo foi regravado. As leituras nunca alteram o arquivo: a migração é feita
+        por este passo explícito (python -m ponto migrar, ou na partida da interface).
+        """
+        def ja_migrado() -> bool:
+            try:
+                return COLUNA_ID_PONTO in pd.read_csv(self.arq_ponto, nrows=0).columns
+            except (FileNotFoundError, pd.errors.EmptyDataError):
+                return False
+
+        # Só o cabeçalho é lido quando não há o que migrar; a checagem se repete sob o lock
+        if ja_migrado():
+            return False
+        return self.alterar(self.arq_ponto, lambda df: (None, False) if ja_migrado() else (df, True))
+
+    def anexar_pontos_validados(self, validar: Callable[[pd.DataFrame], Tuple[pd.DataFrame, Any]]) -> Any:
+        """
+        Acrescenta registros ao arquivo de pontos pelo escritor único. validar recebe os
+        registros atuais e devolve (registros a acrescentar, resultado): a checagem de
+        repetição roda dentro da alteração, contra o conteúdo que será gravado, então duas
+        importações simultâneas não gravam o mesmo registro. Registros com ID já preenchido
+        são gravados com ele; os demais recebem um ID novo.
+        """
+        def aplicar(df: pd.DataFrame):
+            novos, resultado = validar(df)
+            if novos.empty:
+                return None, resultado
+            colunas = COLUNAS_PONTO + [COLUNA_ID_PONTO] if COLUNA_ID_PONTO in novos.columns else COLUNAS_PONTO
+            return pd.concat([df, novos[colunas]], ignore_index=True), resultado
+        return self.alterar(self.arq_ponto, aplicar)
+
+    def anexar_pontos(self, df_novos: pd.DataFrame) -> int:
+        """
+        Acrescenta registros já validados ao arquivo de pontos, com uma única gravação.
+        """
+        return self.anexar_pontos_validados(lambda _: (df_novos, len(df_novos)))
+
+    def _ler_feriados(self, arquivo: str) -> pd.DataFrame:
+        df = self._ler_csv(arquivo, COLUNAS_FERIADOS)
+        df['Data'] = pd.to_datetime(df['Data']).dt.date
+        return df
+
+    def carregar_feriados(self) -> pd.DataFrame:
+        return self._ler_feriados(self.arq_feriados)
+
+    def salvar_feriados(self, df: pd.DataFrame):
+        self._gravar_csv(df, self.arq_feriados)
+
+    def carregar_feriados_ignorados(self) -> pd.DataFrame:
+        return self._ler_feriados(self.arq_feriados_ignorados)
+
+    def salvar_feriados_ignorados(self, df: pd.DataFrame):
+        self._gravar_csv(df, self.arq_feriados_ignorados)
+
+    def carregar_calendario(self) -> CalendarioFeriados:
+        """
+        Calendário com os feriados válidos: do sistema (menos os ignorados) e personalizados.
+        """
+        return CalendarioFeriados(
+            set(self.carregar_feriados()['Data']),
+            set(self.carregar_feriados_ignorados()['Data']),
+        )
+
+    # --- NOVAS FUNÇÕES PARA GERENCIAR JUSTIFICATIVAS ---
+    def _ler_justificativas(self) -> pd.DataFrame:
+        return self._ler_csv(self.arq_justificativas, COLUNAS_JUSTIFICATIVAS)
+
+    def carregar_justificativas(self) -> pd.DataFrame:
+        return self._ler_justificativas()
+
+    def _construir_indice_justificativas(self, versao: Tuple[int, int]) -> pd.Series:
+        if self._indice_justificativas is None or self._indice_justificativas[0] != versao:
+            self._indice_justificativas = (versao, construir_indice_justificativas(self._ler_justificativas()))
+        return self._indice_justificativas[1]
+
+    def indice_justificativas(self) -> pd.Series:
+        """
+        Índice em hash (Nome, Data) -> Status das justificativas, construído uma única vez
+        por versão do arquivo. Permite consultas diretas com indice.get((nome, data)).
+        """
+        return self._construir_indice_justificativas(self.versao_arquivo(self.arq_justificativas))
+
+    def resolver_status_faltas(self, df_faltas: pd.DataFrame) -> pd.DataFrame:
+        """
+        Acrescenta a coluna Status a um DataFrame de ausências (colunas Nome e Data) com uma
+        única junção contra o índice de justificativas. Ausências sem justificativa ficam como "Falta".
+        """
+        return aplicar_justificativas(df_faltas, self.indice_justificativas())
+
+    def _ler_escalas(self) -> pd.DataFrame:
+        # Horários e padrões como texto ("10" não pode virar o número 10)
+        return self._ler_csv(self.arq_escalas, COLUNAS_ESCALAS, dtype=dict.fromkeys(COLUNAS_ESCALAS, str))
+
+    def carregar_escalas(self) -> pd.DataFrame:
+        return self._ler_escalas()
+
+    def salvar_escalas(self, df: pd.DataFrame):
+        self._gravar_csv(df, self.arq_escalas)
+
+    def _inicializador_leitura(self) -> Optional[Callable[[], None]]:
+        """
+        Preparação das threads de leitura de carregar_tudo (as subclasses podem precisar de um contexto).
+        """
+        return None
+
+    def carregar_tudo(self) -> InstantaneoDados:
+        """
+        Lê todos os conjuntos de dados ao mesmo tempo, em um pool de threads (o leitor de CSV do
+        pandas libera o GIL), e os devolve juntos em um InstantaneoDados. Se algum arquivo mudar
+        durante a leitura, os dados são lidos de novo, para que o instantâneo corresponda a uma
+        única versão.
+        """
+        leitores = {
+            "colaboradores": self.carregar_colaboradores,
+            "pontos": self.carregar_pontos,
+            "feriados": self.carregar_feriados,
+            "feriados_ignorados": self.carregar_feriados_ignorados,
+            "justificativas": self.carregar_justificativas,
+        }
+        for _ in range(TENTATIVAS_INSTANTANEO):
+            versao = self.versao_dados()
+            with ThreadPoolExecutor(max_workers=len(leitores), thread_name_prefix="carregar-tudo", initializer=self._inicializador_leitura()) as pool:
+                futuros = {campo: pool.submit(ler) for campo, ler in leitores.items()}
+                conjuntos = {campo: futuro.result() for campo, futuro in futuros.items()}
+            if self.versao_dados() == versao:
+                break
+        return InstantaneoDados(**conjuntos, versao=versao)
+
+    def salvar_justificativas(self, df: pd.DataFrame):
+        self._gravar_csv(df, self.arq_justificativas)
+
+    def salvar_justificativas_em_lote(self, alteracoes: pd.DataFrame) -> int:
+        """
+        Aplica várias alterações de status (colunas Nome, Data, Status) com uma única escrita.
+        Alterações para "Falta" removem a justificativa, pois esse já é o status padrão.
+        """
+        if alteracoes.empty:
+            return 0
+        alteracoes = alteracoes.drop_duplicates(subset=["Nome", "Data"], keep="last")
+
+        def aplicar(df: pd.DataFrame):
+            chaves_alteradas = pd.MultiIndex.from_frame(alteracoes[["Nome", "Data"]])
+            manter = ~pd.MultiIndex.from_frame(df[["Nome", "Data"]]).isin(chaves_alteradas)
+            novas = alteracoes[alteracoes["Status"] != "Falta"][COLUNAS_JUSTIFICATIVAS]
+            return pd.concat([df[manter], novas], ignore_index=True), len(alteracoes)
+        return self.alterar(self.arq_justificativas, aplicar)
@@ -0,0 +1,128 @@
+"""
+Escritor único dos arquivos de dados.
+
+Cada alteração é uma função que recebe o conteúdo atual do arquivo e devolve o novo conteúdo
+(ou None, se não houver mudança) e um resultado para quem a pediu. Todas as alterações do
+processo passam por uma fila e são aplicadas em série por uma única thread, sempre sobre o
+conteúdo mais recente do arquivo: duas sessões registrando ao mesmo tempo não perdem registros
+uma da outra. As alterações que se acumulam na fila enquanto uma gravação acontece são
+aplicadas juntas, com uma só gravação por arquivo, e cada chamador recebe o seu resultado
+depois que os dados estão no disco.
+
+A leitura, as alterações e a gravação acontecem dentro de safe_csv_write, que também protege
+o arquivo contra outros processos (API, linha de comando) com o filelock.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ponto.dados import DataManager, safe_csv_write
+
+# Recebe o conteúdo atual e devolve (novo conteúdo ou None, resultado)
+Alteracao = Callable[[pd.DataFrame], Tuple[Optional[pd.DataFrame], Any]]
+
+@dataclass
+class _Pedido:
+    arquivo: str
+    ler: Callable[[], pd.DataFrame]
+    alteracao: Alteracao
+    # (gravou, resultado)
+    futuro: "Future[Tuple[bool, Any]]" = field(default_factory=Future)
+
+class EscritorUnico:
+    def __init__(self):
+        self._fila: "queue.Queue[_Pedido]" = queue.Queue()
+        # arquivo -> (versão, conteúdo): evita reler o arquivo entre gravações consecutivas
+        self._conteudos: Dict[str, Tuple[Tuple[int, int], pd.DataFrame]] = {}
+        self.gravacoes = 0
+        self.alteracoes = 0
+        self._thread = threading.Thread(target=self._laco, name="escritor-unico", daemon=True)
+        self._thread.start()
+
+    def executar(self, arquivo: str, ler: Callable[[], pd.DataFrame], alteracao: Alteracao, timeout: float = 60.0) -> Tuple[bool, Any]:
+        """
+        Enfileira a alteração e espera a sua confirmação. Devolve (gravou, resultado); exceções
+        levantadas pela alteração são repassadas a quem a pediu.
+        """
+        pedido = _Pedido(os.path.abspath(arquivo), ler, alteracao)
+        self._fila.put(pedido)
+        return pedido.futuro.result(timeout)
+
+    def _laco(self):
+        while True:
+            pedidos = [self._fila.get()]
+            # Reúne o que chegou enquanto a gravação anterior acontecia
+            while True:
+                try:
+                    pedidos.append(self._fila.get_nowait())
+                except queue.Empty:
+                    break
+            por_arquivo: Dict[str, List[_Pedido]] = {}
+            for pedido in pedidos:
+                por_arquivo.setdefault(pedido.arquivo, []).append(pedido)
+            for arquivo, grupo in por_arquivo.items():
+                self._aplicar(arquivo, grupo)
+
+    def _ler(self, arquivo: str, ler: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        versao = DataManager.versao_arquivo(arquivo)
+        em_memoria = self._conteudos.get(arquivo)
+        if em_memoria is None or em_memoria[0] != versao:
+            em_memoria = (versao, ler())
+            self._conteudos[arquivo] = em_memoria
+        return em_memoria[1]
+
+    def _gravar(self, arquivo: str, df: pd.DataFrame):
+        # Arquivo temporário + os.replace: quem lê sem o lock nunca vê um arquivo pela metade
+        temporario = f"{arquivo}.{os.getpid()}.tmp"
+        df.to_csv(temporario, index=False)
+        os.replace(temporario, arquivo)
+        self._conteudos[arquivo] = (DataManager.versao_arquivo(arquivo), df)
+        self.gravacoes += 1
+
+    def _aplicar(self, arquivo: str, grupo: List[_Pedido]):
+        respostas = []
+        try:
+            with safe_csv_write(arquivo):
+                df = self._ler(arquivo, grupo[0].ler)
+                alterado = False
+                for pedido in grupo:
+                    try:
+                        novo, resultado = pedido.alteracao(df.copy())
+                    except Exception as e:
+                        respostas.append((pedido, e))
+                        continue
+                    if novo is not None:
+                        df, alterado = novo, True
+                    respostas.append((pedido, (novo is not None, resultado)))
+                if alterado:
+                    self._gravar(arquivo, df)
+        except Exception as e:
+            # Falha ao ler ou gravar: nenhuma alteração do grupo foi confirmada
+            self._conteudos.pop(arquivo, None)
+            for pedido in grupo:
+                pedido.futuro.set_exception(e)
+            return
+        self.alteracoes += len(grupo)
+        for pedido, resposta in respostas:
+            if isinstance(resposta, Exception):
+                pedido.futuro.set_exception(resposta)
+            else:
+                pedido.futuro.set_result(resposta)
+
+_escritor: Optional[EscritorUnico] = None
+_lock_escritor = threading.Lock()
+
+def escritor_unico() -> EscritorUnico:
+    """
+    O escritor do processo, criado no primeiro uso.
+    """
+    global _escritor
+    with _lock_escritor:
+        if _escritor is None:
+            _escritor = EscritorUnico()
+        return _escritor
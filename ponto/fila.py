@@ -0,0 +1,181 @@
+"""
+Fila local dos tablets das portarias para funcionar sem conexão. Cada registro recebe um id
+do cliente e fica gravado em um banco SQLite até ser sincronizado; na reconexão, os pendentes
+são enviados em ordem cronológica (no mesmo minuto, na ordem da captura), em lotes de até
+TAMANHO_LOTE_SINCRONIZACAO registros, e os rejeitados (por exemplo, repetidos a menos de um
+minuto de um registro já existente) ficam na fila como conflitos.
+
+A sincronização pode ser feita pela API (ponto/api.py) ou, quando o tablet enxerga o
+diretório de dados, diretamente nos arquivos CSV. Nos dois casos o id do cliente torna o
+reenvio seguro: um registro já confirmado não é gravado de novo.
+"""
+import json
+import socket
+import sqlite3
+import urllib.request
+import uuid
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from ponto.api import ConfirmadorEmGrupo, caminho_recibos
+from ponto.dados import AcaoPonto, DataManager
+
+ARQ_FILA_OFFLINE = "fila_offline.sqlite3"
+# Registros por requisição: mantém cada envio bem abaixo do limite de corpo da API
+TAMANHO_LOTE_SINCRONIZACAO = 500
+
+PENDENTE = "pendente"
+ACEITO = "aceito"
+REJEITADO = "rejeitado"
+
+# Recebe os registros no formato da API e devolve um recibo {"id", "status", "motivo"} para cada um
+Enviador = Callable[[List[dict]], List[dict]]
+
+@dataclass
+class ResultadoSincronizacao:
+    enviados: int = 0
+    aceitos: int = 0
+    conflitos: List[dict] = field(default_factory=list)
+    pendentes: int = 0
+    erro: Optional[str] = None
+
+    @property
+    def resumo(self) -> str:
+        texto = f"{self.enviados} registro(s) enviado(s), {self.aceitos} aceito(s), {len(self.conflitos)} conflito(s), {self.pendentes} pendente(s)."
+        if self.erro:
+            texto += f" Sincronização interrompida: {self.erro}"
+        return texto
+
+class FilaOffline:
+    """
+    Fila durável de registros de ponto em SQLite. Cada operação abre a sua própria conexão,
+    então a fila pode ser usada por mais de uma thread ou processo no mesmo tablet.
+    """
+    def __init__(self, caminho: str = ARQ_FILA_OFFLINE, dispositivo: Optional[str] = None):
+        self.caminho = caminho
+        self.dispositivo = dispositivo or socket.gethostname()
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute("""
+                CREATE TABLE IF NOT EXISTS registros (
+                    id TEXT PRIMARY KEY,
+                    nome TEXT NOT NULL,
+                    acao TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    hora TEXT NOT NULL,
+                    capturado_em TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pendente',
+                    motivo TEXT,
+                    sincronizado_em TEXT
+                )
+            """)
+            conexao.execute("CREATE INDEX IF NOT EXISTS idx_registros_status ON registros (status, data, hora)")
+
+    def _conectar(self) -> sqlite3.Connection:
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        # Tablets perdem energia sem aviso: cada registro precisa estar no disco ao retornar
+        conexao.execute("PRAGMA journal_mode=WAL")
+        conexao.execute("PRAGMA synchronous=FULL")
+        return conexao
+
+    def registrar(self, nome: str, acao: str, momento: Optional[datetime] = None) -> str:
+        """
+        Guarda um registro na fila e devolve o seu id. O horário é o da captura, não o da sincronização.
+        """
+        acao = AcaoPonto(acao).value
+        momento = momento or datetime.now()
+        id_cliente = f"{self.dispositivo}-{uuid.uuid4().hex}"
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.execute(
+                "INSERT INTO registros (id, nome, acao, data, hora, capturado_em) VALUES (?, ?, ?, ?, ?, ?)",
+                (id_cliente, nome, acao, momento.strftime("%Y-%m-%d"), momento.strftime("%H:%M"), datetime.now().isoformat(timespec="seconds")),
+            )
+        return id_cliente
+
+    def pendentes(self) -> List[dict]:
+        # Ordem cronológica; no mesmo minuto vale a ordem de captura (rowid cresce a cada registro),
+        # para que uma Pausa e um Retorno do mesmo minuto sejam enviados na sequência em que foram feitos
+        with closing(self._conectar()) as conexao:
+            cursor = conexao.execute(
+                "SELECT id, nome, acao, data, hora FROM registros WHERE status = ? ORDER BY data, hora, rowid",
+                (PENDENTE,),
+            )
+            return [dict(zip(("id", "nome", "acao", "data", "hora"), linha)) for linha in cursor]
+
+    def quantidade_pendente(self) -> int:
+        with closing(self._conectar()) as conexao:
+            return conexao.execute("SELECT COUNT(*) FROM registros WHERE status = ?", (PENDENTE,)).fetchone()[0]
+
+    def conflitos(self) -> pd.DataFrame:
+        with closing(self._conectar()) as conexao:
+            return pd.read_sql_query(
+                "SELECT id, nome AS Nome, acao AS 'Ação', data AS Data, hora AS Hora, motivo AS Motivo, sincronizado_em "
+                "FROM registros WHERE status = ? ORDER BY data, hora, rowid",
+                conexao, params=(REJEITADO,),
+            )
+
+    def _marcar(self, recibos: List[dict]):
+        agora = datetime.now().isoformat(timespec="seconds")
+        with closing(self._conectar()) as conexao, conexao:
+            conexao.executemany(
+                "UPDATE registros SET status = ?, motivo = ?, sincronizado_em = ? WHERE id = ?",
+                [(recibo["status"], recibo.get("motivo"), agora, recibo["id"]) for recibo in recibos],
+            )
+
+    def sincronizar(self, enviar: Enviador, tamanho_lote: int = TAMANHO_LOTE_SINCRONIZACAO) -> ResultadoSincronizacao:
+        """
+        Envia todos os pendentes, em lotes, e registra o recibo de cada um. Registros com erro
+        continuam pendentes para a próxima tentativa. Se um lote não puder ser enviado (qualquer
+        falha do envio, inclusive uma resposta inválida), ele e os seguintes continuam
+        pendentes, para não enviar registros posteriores antes dos anteriores, e o erro é
+        informado no resultado.
+        """
+        resultado = ResultadoSincronizacao()
+        pendentes = self.pendentes()
+        for inicio in range(0, len(pendentes), tamanho_lote):
+            lote = pendentes[inicio:inicio + tamanho_lote]
+            try:
+                recibos = enviar(lote)
+                ids_lote = {registro["id"] for registro in lote}
+                if any(recibo.get("id") not in ids_lote or "status" not in recibo for recibo in recibos):
+                    raise ValueError("resposta inválida: recibo sem status ou de registro que não foi enviado")
+            except Exception as e:
+                resultado.erro = str(e) or type(e).__name__
+                break
+            resultado.enviados += len(lote)
+            definitivos = [r for r in recibos if r["status"] in (ACEITO, REJEITADO)]
+            self._marcar(definitivos)
+            por_id = {registro["id"]: registro for registro in lote}
+            for recibo in definitivos:
+                if recibo["status"] == ACEITO:
+                    resultado.aceitos += 1
+                else:
+                    resultado.conflitos.append({**por_id[recibo["id"]], "motivo": recibo.get("motivo")})
+        resultado.pendentes = self.quantidade_pendente()
+        return resultado
+
+def enviador_api(url: str, chave: str, timeout: float = 60.0) -> Enviador:
+    """
+    Envia os registros para a API de ponto (POST /pontos), um lote por requisição.
+    """
+    endereco = url.rstrip("/") + "/pontos"
+
+    def enviar(registros: List[dict]) -> List[dict]:
+        requisicao = urllib.request.Request(
+            endereco,
+            data=json.dumps({"pontos": registros}).encode("utf-8"),
+            headers={"Authorization": f"Bearer {chave}", "Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+            return json.loads(resposta.read())["resultados"]
+    return enviar
+
+def enviador_local(data_manager: DataManager) -> Enviador:
+    """
+    Grava os registros diretamente nos arquivos do sistema, com uma escrita por lote e os
+    mesmos recibos da API.
+    """
+    return ConfirmadorEmGrupo(data_manager, caminho_recibos(data_manager), iniciar=False).confirmar
@@ -0,0 +1,180 @@
+"""
+Exportação mensal para a folha de pagamento: horas trabalhadas, horas extras (50% e 100%) e
+faltas de cada colaborador, gravadas linha a linha em CSV ou em layout de largura fixa.
+"""
+import csv
+import os
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from ponto.afd import normalizar_identificador
+from ponto.calculos import (
+    calcular_faltas, calcular_horas, calcular_horas_extras, eh_vigia, faltas_para_dataframe,
+    formatar_timedelta, resultado_horas_extras_vazio, resumir_horas_trabalhadas,
+)
+from ponto.dados import COLUNA_PIS_CPF, InstantaneoDados
+from ponto.relatorio import filtrar_pontos_periodo
+
+@dataclass
+class LinhaFolha:
+    nome: str
+    funcao: str
+    pis_cpf: str
+    horas_trabalhadas: timedelta
+    he_50: timedelta
+    he_100: timedelta
+    faltas: int
+    ausencias_justificadas: int
+
+CABECALHO_CSV = [
+    "Nome", "Funcao", "PIS_CPF", "Horas Trabalhadas", "HE 50%", "HE 100%",
+    "Minutos Trabalhados", "Minutos HE 50%", "Minutos HE 100%", "Faltas", "Ausencias Justificadas",
+]
+
+@dataclass
+class ResultadoFolha:
+    gravadas: int = 0
+    # (nome, motivo) dos colaboradores que ficaram fora do arquivo
+    rejeitadas: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def resumo(self) -> str:
+        return f"{self.gravadas} colaborador(es) exportado(s), {len(self.rejeitadas)} com erro."
+
+# Layout de largura fixa: (campo, largura, alinhamento). Números à direita com zeros, textos à esquerda.
+LAYOUT_LARGURA_FIXA: List[Tuple[str, int, str]] = [
+    ("competencia", 6, "0"),
+    ("pis_cpf", 11, "0"),
+    ("nome", 40, "<"),
+    ("minutos_trabalhados", 6, "0"),
+    ("minutos_he_50", 5, "0"),
+    ("minutos_he_100", 5, "0"),
+    ("faltas", 3, "0"),
+    ("ausencias_justificadas", 3, "0"),
+]
+
+def _minutos(td: timedelta) -> int:
+    return int(td.total_seconds()) // 60
+
+def linhas_folha(dados: InstantaneoDados, data_inicio: date, data_fim: date, funcao: Optional[str] = None) -> Iterator[LinhaFolha]:
+    """
+    Gera uma linha por colaborador, em ordem alfabética. Os registros do período são separados
+    por colaborador uma única vez; horas e horas extras são calculadas sob demanda, à medida
+    que as linhas são consumidas.
+    """
+    df_colab = dados.colaboradores if funcao is None else dados.colaboradores[dados.colaboradores["Funcao"] == funcao]
+    df_colab = df_colab.sort_values("Nome")
+    calendario = dados.carregar_calendario()
+    df_pontos_periodo = filtrar_pontos_periodo(dados.pontos, data_inicio, data_fim, df_colab["Nome"].unique())
+    pontos_por_nome = dict(tuple(df_pontos_periodo.groupby("Nome")))
+
+    faltas = calcular_faltas(data_inicio, data_fim, df_colab, df_pontos_periodo, calendario)
+    df_ausencias = dados.resolver_status_faltas(faltas_para_dataframe(faltas))
+    contagem = df_ausencias.assign(Falta=df_ausencias["Status"] == "Falta").groupby("Nome")["Falta"].agg(["sum", "count"])
+
+    identificadores = df_colab[COLUNA_PIS_CPF] if COLUNA_PIS_CPF in df_colab.columns else pd.Series("", index=df_colab.index)
+    for nome, funcao_colab, pis_cpf in zip(df_colab["Nome"], df_colab["Funcao"], identificadores):
+        df_nome = pontos_por_nome.get(nome)
+        horas = timedelta()
+        extras = resultado_horas_extras_vazio()
+        if df_nome is not None:
+            resumo = resumir_horas_trabalhadas(calcular_horas(df_nome.copy()))
+            if not resumo.empty:
+                horas = timedelta(seconds=int(resumo["Segundos"].iloc[0]))
+            if not eh_vigia(funcao_colab):
+                extras = calcular_horas_extras(df_nome.copy(), calendario)
+        faltas_nome, ausencias_nome = contagem.loc[nome] if nome in contagem.index else (0, 0)
+        yield LinhaFolha(
+            nome=nome,
+            funcao="" if pd.isna(funcao_colab) else str(funcao_colab),
+            pis_cpf="" if pd.isna(pis_cpf) else str(pis_cpf),
+            horas_trabalhadas=horas,
+            he_50=extras["50%"]["total"],
+            he_100=extras["100%"]["total"],
+            faltas=int(faltas_nome),
+            ausencias_justificadas=int(ausencias_nome - faltas_nome),
+        )
+
+def escrever_csv(linhas: Iterable[LinhaFolha], arquivo: IO) -> ResultadoFolha:
+    escritor = csv.writer(arquivo)
+    escritor.writerow(CABECALHO_CSV)
+    resultado = ResultadoFolha()
+    for linha in linhas:
+        escritor.writerow([
+            linha.nome, linha.funcao, linha.pis_cpf,
+            formatar_timedelta(linha.horas_trabalhadas), formatar_timedelta(linha.he_50), formatar_timedelta(linha.he_100),
+            _minutos(linha.horas_trabalhadas), _minutos(linha.he_50), _minutos(linha.he_100),
+            linha.faltas, linha.ausencias_justificadas,
+        ])
+        resultado.gravadas += 1
+    return resultado
+
+def formatar_largura_fixa(linha: LinhaFolha, competencia: str) -> str:
+    """
+    A linha do colaborador no LAYOUT_LARGURA_FIXA. O PIS/CPF é normalizado como na importação
+    do AFD (só dígitos, sem os zeros à esquerda) antes de ser completado com zeros, então um
+    PIS gravado com 12 posições ("012345678901") cabe nas 11 do layout. Lança ValueError se um
+    valor não couber no seu campo.
+    """
+    valores = {
+        "competencia": competencia,
+        "pis_cpf": normalizar_identificador(linha.pis_cpf),
+        "nome": linha.nome,
+        "minutos_trabalhados": _minutos(linha.horas_trabalhadas),
+        "minutos_he_50": _minutos(linha.he_50),
+        "minutos_he_100": _minutos(linha.he_100),
+        "faltas": linha.faltas,
+        "ausencias_justificadas": linha.ausencias_justificadas,
+    }
+    campos = []
+    for campo, largura, alinhamento in LAYOUT_LARGURA_FIXA:
+        valor = str(valores[campo])
+        if alinhamento == "0":
+            if len(valor) > largura:
+                raise ValueError(f"Valor de '{campo}' excede {largura} posições para {linha.nome}: {valor}")
+            campos.append(valor.rjust(largura, "0"))
+        else:
+            campos.append(valor[:largura].ljust(largura))
+    return "".join(campos)
+
+def escrever_largura_fixa(linhas: Iterable[LinhaFolha], arquivo: IO, competencia: str) -> ResultadoFolha:
+    """
+    Uma linha por colaborador, sem cabeçalho, no LAYOUT_LARGURA_FIXA. A competência é AAAAMM.
+    Um colaborador com algum valor que não cabe no layout fica fora do arquivo e é listado
+    em rejeitadas, sem impedir a exportação dos demais.
+    """
+    resultado = ResultadoFolha()
+    for linha in linhas:
+        try:
+            texto = formatar_largura_fixa(linha, competencia)
+        except ValueError as e:
+            resultado.rejeitadas.append((linha.nome, str(e)))
+            continue
+        arquivo.write(texto + "\n")
+        resultado.gravadas += 1
+    return resultado
+
+def gravar_folha(linhas: Iterable[LinhaFolha], caminho: str, formato: str, competencia: str) -> ResultadoFolha:
+    """
+    Grava a exportação em um arquivo temporário ao lado do destino e só o coloca no lugar
+    (os.replace) quando todas as linhas foram processadas: uma falha no meio não deixa um
+    arquivo pela metade para o sistema da folha importar.
+    """
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        if formato == "csv":
+            with open(temporario, "w", newline="", encoding="utf-8") as arquivo:
+                resultado = escrever_csv(linhas, arquivo)
+        else:
+            # Sistemas de folha costumam ler o layout fixo em ISO-8859-1 (um byte por caractere)
+            with open(temporario, "w", encoding="latin-1", errors="replace") as arquivo:
+                resultado = escrever_largura_fixa(linhas, arquivo, competencia)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return resultado
@@ -0,0 +1,110 @@
+"""
+Fotos dos colaboradores: localização da foto pelo nome e miniaturas reduzidas, geradas uma
+vez por arquivo de origem.
+"""
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+# Largura das miniaturas: o dobro da exibida na tela de registro, para telas de alta densidade
+LARGURA_MINIATURA = 200
+QUALIDADE_MINIATURA = 80
+DIRETORIO_MINIATURAS = ".miniaturas"
+# Em caso de fotos com o mesmo nome, vale a primeira extensão da lista
+EXTENSOES_FOTO = (".jpg", ".jpeg", ".png")
+
+_ESPACOS = re.compile(r"\s+")
+
+def normalizar_nome(nome: str) -> str:
+    """
+    Chave de comparação de nomes: sem acentos, sem diferença entre maiúsculas e minúsculas
+    e com espaços repetidos reduzidos a um. "ADÃO  da Silva" e "Adao da silva" são iguais.
+    """
+    decomposto = unicodedata.normalize("NFKD", str(nome))
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return _ESPACOS.sub(" ", sem_acentos).strip().casefold()
+
+def _ler_diretorio_fotos(diretorio: str) -> Dict[str, str]:
+    indice: Dict[str, Tuple[int, str]] = {}
+    with os.scandir(diretorio) as entradas:
+        for entrada in entradas:
+            nome, extensao = os.path.splitext(entrada.name)
+            extensao = extensao.lower()
+            if extensao not in EXTENSOES_FOTO or not entrada.is_file():
+                continue
+            prioridade = EXTENSOES_FOTO.index(extensao)
+            chave = normalizar_nome(nome)
+            if chave not in indice or prioridade < indice[chave][0]:
+                indice[chave] = (prioridade, entrada.path)
+    return {chave: caminho for chave, (_, caminho) in indice.items()}
+
+# diretório -> (mtime do diretório, índice nome normalizado -> caminho da foto)
+_indices_fotos: Dict[str, Tuple[int, Dict[str, str]]] = {}
+_lock_indices = threading.Lock()
+
+def indice_fotos(diretorio: str) -> Dict[str, str]:
+    """
+    Índice das fotos do diretório, montado com uma única listagem e refeito apenas quando o
+    diretório muda (foto adicionada, removida ou renomeada altera o mtime do diretório).
+    """
+    try:
+        versao = os.stat(diretorio).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    em_cache = _indices_fotos.get(diretorio)
+    if em_cache is not None and em_cache[0] == versao:
+        return em_cache[1]
+    with _lock_indices:
+        indice = _ler_diretorio_fotos(diretorio)
+        _indices_fotos[diretorio] = (versao, indice)
+    return indice
+
+def localizar_foto(diretorio: str, nome: str) -> Optional[str]:
+    return indice_fotos(diretorio).get(normalizar_nome(nome))
+
+def caminho_miniatura(foto_path: str, largura: int = LARGURA_MINIATURA) -> str:
+    diretorio, arquivo = os.path.split(foto_path)
+    nome, _ = os.path.splitext(arquivo)
+    return os.path.join(diretorio, DIRETORIO_MINIATURAS, f"{nome}.{largura}.jpg")
+
+def miniatura(foto_path: str, largura: int = LARGURA_MINIATURA) -> str:
+    """
+    Caminho de uma versão JPEG reduzida da foto, criada na primeira vez e recriada apenas quando
+    a foto original for mais nova que ela. Se a miniatura não puder ser gerada (Pillow ausente ou
+    imagem ilegível), devolve a própria foto.
+    """
+    if Image is None:
+        return foto_path
+    destino = caminho_miniatura(foto_path, largura)
+    try:
+        if os.stat(destino).st_mtime_ns >= os.stat(foto_path).st_mtime_ns:
+            return destino
+    except FileNotFoundError:
+        pass
+    try:
+        os.makedirs(os.path.dirname(destino), exist_ok=True)
+        with Image.open(foto_path) as imagem:
+            imagem = ImageOps.exif_transpose(imagem).convert("RGB")
+            imagem.thumbnail((largura, largura * 4))
+            temporario = f"{destino}.{os.getpid()}.tmp"
+            imagem.save(temporario, "JPEG", quality=QUALIDADE_MINIATURA, optimize=True)
+        os.replace(temporario, destino)
+        return destino
+    except OSError:
+        return foto_path
+
+def gerar_miniaturas(diretorio: str, largura: int = LARGURA_MINIATURA) -> int:
+    """
+    Gera (ou atualiza) as miniaturas de todas as fotos do diretório. Retorna quantas fotos foram processadas.
+    """
+    fotos = indice_fotos(diretorio).values()
+    for foto_path in fotos:
+        miniatura(foto_path, largura)
+    return len(fotos)
@@ -0,0 +1,159 @@
+"""
+Importação em lote de registros de ponto a partir de planilhas (.csv), por exemplo registros
+anotados em papel durante uma queda do sistema. A validação é feita de uma vez sobre todas as
+linhas e os registros válidos são gravados com uma única escrita.
+"""
+from dataclasses import dataclass
+from typing import IO, Sequence, Union
+
+import pandas as pd
+
+from ponto.dados import COLUNAS_PONTO, AcaoPonto, DataManager
+
+# Mesma regra do registro manual: registros do mesmo colaborador a menos de um minuto são repetidos
+TOLERANCIA_REPETICAO = pd.Timedelta(seconds=59)
+
+@dataclass
+class ResultadoImportacaoCSV:
+    validos: pd.DataFrame
+    rejeitados: pd.DataFrame
+    gravados: int = 0
+
+    @property
+    def resumo(self) -> str:
+        return f"{len(self.validos)} registro(s) válido(s), {self.gravados} gravado(s), {len(self.rejeitados)} rejeitado(s)."
+
+def ler_planilha_pontos(origem: Union[str, IO]) -> pd.DataFrame:
+    """
+    Lê a planilha como texto, detectando o separador (vírgula ou ponto e vírgula).
+    """
+    try:
+        return pd.read_csv(origem, dtype=str, sep=None, engine="python", encoding="utf-8-sig", keep_default_na=False)
+    except UnicodeDecodeError:
+        if hasattr(origem, "seek"):
+            origem.seek(0)
+        return pd.read_csv(origem, dtype=str, sep=None, engine="python", encoding="latin-1", keep_default_na=False)
+
+def _normalizar_acoes(acoes: pd.Series) -> pd.Series:
+    por_nome = {acao.value.casefold(): acao.value for acao in AcaoPonto}
+    por_nome["saida"] = AcaoPonto.SAIDA.value
+    return acoes.str.casefold().map(por_nome)
+
+def _converter_datas(datas: pd.Series) -> pd.Series:
+    convertidas = pd.to_datetime(datas, format="%Y-%m-%d", errors="coerce")
+    return convertidas.fillna(pd.to_datetime(datas, format="%d/%m/%Y", errors="coerce"))
+
+def momentos_registrados(df_pontos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Nome e DataHora (datetime64[ns]) de cada registro existente, em ordem cronológica, prontos
+    para merge_asof. Registros com data ou hora ilegível são descartados.
+    """
+    return pd.DataFrame({
+        # astype(str): um arquivo sem registros é lido com Nome object, e o merge_asof exige o
+        # mesmo tipo de texto dos dois lados
+        "Nome": df_pontos["Nome"].astype(str),
+        "DataHora": pd.to_datetime(
+            df_pontos["Data"].astype(str) + " " + df_pontos["Hora"].astype(str).str[:5],
+            format="%Y-%m-%d %H:%M", errors="coerce",
+        ).astype("datetime64[ns]"),
+    }).dropna().sort_values("DataHora")
+
+def _repetidos_existentes(df: pd.DataFrame, df_existentes: pd.DataFrame) -> pd.Series:
+    """
+    Para cada linha (já ordenada por DataHora), indica se há um registro existente do mesmo
+    colaborador a menos de um minuto (merge_asof).
+    """
+    existentes = momentos_registrados(df_existentes).rename(columns={"DataHora": "DataHoraExistente"})
+    lote = df[["Nome", "DataHora"]].astype({"DataHora": "datetime64[ns]"}).reset_index()
+    combinados = pd.merge_asof(
+        lote, existentes,
+        left_on="DataHora", right_on="DataHoraExistente", by="Nome",
+        tolerance=TOLERANCIA_REPETICAO, direction="nearest",
+    ).set_index("index")
+    return combinados["DataHoraExistente"].notna().reindex(df.index)
+
+def _marcar_repetidos(df: pd.DataFrame, df_existentes: pd.DataFrame) -> pd.Series:
+    """
+    Como _repetidos_existentes, marcando também as linhas a menos de um minuto de uma linha
+    anterior do próprio lote.
+    """
+    repetido_existente = _repetidos_existentes(df, df_existentes)
+    intervalo_anterior = df.sort_values(["Nome", "DataHora"]).groupby("Nome")["DataHora"].diff()
+    repetido_lote = (intervalo_anterior <= TOLERANCIA_REPETICAO).reindex(df.index)
+    return repetido_existente | repetido_lote
+
+def validar_pontos(df_entrada: pd.DataFrame, df_colab: pd.DataFrame, df_pontos: pd.DataFrame, manter_colunas: Sequence[str] = ()) -> ResultadoImportacaoCSV:
+    """
+    Valida as colunas Nome, Ação, Data e Hora de todas as linhas de uma vez. Cada linha
+    rejeitada recebe o número da linha na planilha e o motivo. As colunas de manter_colunas
+    são copiadas sem alteração da entrada para os registros válidos.
+    """
+    faltando = [coluna for coluna in COLUNAS_PONTO if coluna not in df_entrada.columns]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes na planilha: {', '.join(faltando)}")
+
+    df = df_entrada[COLUNAS_PONTO].astype(str).apply(lambda coluna: coluna.str.strip())
+    for coluna in manter_colunas:
+        df[coluna] = df_entrada[coluna]
+    df["Linha"] = range(2, len(df) + 2) # Linha 1 é o cabeçalho
+    df["Motivo"] = None
+
+    acoes = _normalizar_acoes(df["Ação"])
+    datas = _converter_datas(df["Data"])
+    horas = pd.to_datetime(df["Hora"].str[:5], format="%H:%M", errors="coerce")
+
+    regras = [
+        (df["Nome"] == "", "Nome vazio"),
+        (~df["Nome"].isin(set(df_colab["Nome"])), "Colaborador não cadastrado"),
+        (acoes.isna(), "Ação inválida"),
+        (datas.isna(), "Data inválida"),
+        (horas.isna(), "Hora inválida"),
+    ]
+    # A primeira regra violada é o motivo registrado
+    for condicao, motivo in reversed(regras):
+        df.loc[condicao, "Motivo"] = motivo
+
+    df["Ação"] = acoes
+    df["Data"] = datas.dt.strftime("%Y-%m-%d")
+    df["Hora"] = horas.dt.strftime("%H:%M")
+
+    validos = df[df["Motivo"].isna()].copy()
+    validos["DataHora"] = pd.to_datetime(validos["Data"] + " " + validos["Hora"], format="%Y-%m-%d %H:%M")
+    validos = validos.sort_values("DataHora", kind="stable")
+    repetidos = _marcar_repetidos(validos, df_pontos)
+    df.loc[repetidos[repetidos].index, "Motivo"] = "Registro repetido (menos de 1 minuto de outro registro)"
+
+    rejeitados = df[df["Motivo"].notna()]
+    rejeitados = pd.concat([rejeitados[["Linha"]], df_entrada.loc[rejeitados.index, COLUNAS_PONTO], rejeitados[["Motivo"]]], axis=1)
+    return ResultadoImportacaoCSV(
+        validos=validos.loc[~repetidos, COLUNAS_PONTO + list(manter_colunas)].sort_values(["Nome", "Data", "Hora"], ignore_index=True),
+        rejeitados=rejeitados.reset_index(drop=True),
+    )
+
+def descartar_repetidos(df_novos: pd.DataFrame, df_existentes: pd.DataFrame) -> pd.DataFrame:
+    """
+    As linhas de df_novos (Nome, Ação, Data e Hora já normalizados) que não estão a menos de
+    um minuto de um registro existente do mesmo colaborador.
+    """
+    if df_novos.empty:
+        return df_novos
+    df = df_novos.assign(DataHora=pd.to_datetime(df_novos["Data"] + " " + df_novos["Hora"], format="%Y-%m-%d %H:%M"))
+    repetidos = _repetidos_existentes(df.sort_values("DataHora", kind="stable"), df_existentes)
+    return df_novos[~repetidos.reindex(df_novos.index)]
+
+def importar_pontos(df_entrada: pd.DataFrame, data_manager: DataManager, simular: bool = False) -> ResultadoImportacaoCSV:
+    """
+    Valida a planilha contra os colaboradores e os registros existentes e grava todos os
+    registros válidos de uma só vez. A checagem contra os registros existentes é feita dentro
+    da gravação, pelo escritor único. Com simular=True nada é gravado.
+    """
+    df_colab = data_manager.carregar_colaboradores()
+    if simular:
+        return validar_pontos(df_entrada, df_colab, data_manager.carregar_pontos())
+
+    def validar(df_pontos: pd.DataFrame):
+        resultado = validar_pontos(df_entrada, df_colab, df_pontos)
+        return resultado.validos, resultado
+    resultado = data_manager.anexar_pontos_validados(validar)
+    resultado.gravados = len(resultado.validos)
+    return resultado
@@ -0,0 +1,210 @@
+"""
+Jornadas pré-definidas, geradas de uma vez para vários colaboradores e gravadas com uma
+única escrita.
+
+Jornada padrão: Entrada no horário informado, Pausa às 12:00, Retorno às 13:00 e Saída no fim
+do expediente usado no cálculo das horas extras (17:00 de segunda a quinta, 16:00 na sexta).
+
+Escalas: modelos de turno cadastrados em escalas.csv (entrada, saída, intervalo opcional e
+padrão de recorrência), aplicados a vários colaboradores ao longo de um período.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ponto.calculos import hora_fim_expediente
+from ponto.dados import COLUNAS_PONTO, AcaoPonto, DataManager
+from ponto.importacao import ResultadoImportacaoCSV, momentos_registrados, validar_pontos
+
+HORA_PAUSA_PADRAO = "12:00"
+HORA_RETORNO_PADRAO = "13:00"
+
+def registros_jornada_padrao(nomes: Sequence[str], dia: date, hora_entrada: str) -> pd.DataFrame:
+    """
+    Os quatro registros da jornada padrão de cada colaborador, na ordem do dia.
+    """
+    acoes = [AcaoPonto.ENTRADA.value, AcaoPonto.PAUSA.value, AcaoPonto.RETORNO.value, AcaoPonto.SAIDA.value]
+    horas = [hora_entrada, HORA_PAUSA_PADRAO, HORA_RETORNO_PADRAO, hora_fim_expediente(dia)]
+    return pd.DataFrame({
+        "Nome": np.repeat(np.asarray(nomes, dtype=object), len(acoes)),
+        "Ação": np.tile(acoes, len(nomes)),
+        "Data": dia.strftime("%Y-%m-%d"),
+        "Hora": np.tile(horas, len(nomes)),
+    }, columns=COLUNAS_PONTO)
+
+def registrar_jornada_padrao(data_manager: DataManager, nomes: Sequence[str], dia: date, hora_entrada: str) -> ResultadoImportacaoCSV:
+    """
+    Registra a jornada padrão do dia para todos os colaboradores informados. A checagem de
+    repetição (menos de um minuto de um registro existente) é feita de uma vez para todos,
+    dentro da gravação.
+    """
+    registros = registros_jornada_padrao(nomes, dia, hora_entrada)
+    df_colab = data_manager.carregar_colaboradores()
+
+    def validar(df_pontos: pd.DataFrame):
+        resultado = validar_pontos(registros, df_colab, df_pontos)
+        rejeitados = resultado.rejeitados.drop(columns="Linha")
+
+        # Como no registro individual: sem a entrada, nenhum outro registro do dia é feito
+        sem_entrada = rejeitados.loc[rejeitados["Ação"] == AcaoPonto.ENTRADA.value, "Nome"]
+        descartados = resultado.validos["Nome"].isin(sem_entrada)
+        if descartados.any():
+            rejeitados = pd.concat([rejeitados, resultado.validos[descartados].assign(Motivo="Entrada do dia não registrada")])
+        resultado.validos = resultado.validos[~descartados].reset_index(drop=True)
+        resultado.rejeitados = rejeitados.sort_values(["Nome", "Hora"], ignore_index=True)
+        return resultado.validos, resultado
+
+    resultado = data_manager.anexar_pontos_validados(validar)
+    resultado.gravados = len(resultado.validos)
+    return resultado
+
+def _minutos_do_dia(hora: str) -> int:
+    momento = datetime.strptime(hora.strip(), "%H:%M")
+    return momento.hour * 60 + momento.minute
+
+@dataclass
+class Escala:
+    """
+    Modelo de turno. O padrão indica, dia a dia, se o ciclo tem trabalho (1) ou folga (0) a
+    partir do início do ciclo: "10" é a escala 12x36, "1" é todos os dias e "1111100",
+    começando numa segunda-feira, é a semana 5x2. Horários anteriores ao da entrada
+    pertencem ao dia seguinte, então turnos que atravessam a meia-noite não precisam de
+    nenhuma marcação especial.
+    """
+    nome: str
+    entrada: str
+    saida: str
+    pausa: Optional[str] = None
+    retorno: Optional[str] = None
+    padrao: str = "1"
+
+    def __post_init__(self):
+        for campo in ("entrada", "saida", "pausa", "retorno"):
+            valor = getattr(self, campo)
+            if valor is None or (isinstance(valor, float) and np.isnan(valor)) or not str(valor).strip():
+                if campo in ("entrada", "saida"):
+                    raise ValueError(f"Escala '{self.nome}': o horário de {campo} é obrigatório.")
+                setattr(self, campo, None)
+                continue
+            try:
+                _minutos_do_dia(str(valor))
+            except ValueError:
+                raise ValueError(f"Escala '{self.nome}': horário de {campo} inválido ('{valor}'). Use HH:MM.")
+            setattr(self, campo, str(valor).strip())
+        if (self.pausa is None) != (self.retorno is None):
+            raise ValueError(f"Escala '{self.nome}': informe a pausa e o retorno, ou nenhum dos dois.")
+        self.padrao = str(self.padrao or "1").strip()
+        if not self.padrao or set(self.padrao) - {"0", "1"} or "1" not in self.padrao:
+            raise ValueError(f"Escala '{self.nome}': padrão inválido ('{self.padrao}'). Use 1 para trabalho e 0 para folga, ex.: 10.")
+
+    @property
+    def cruza_meia_noite(self) -> bool:
+        return _minutos_do_dia(self.saida) <= _minutos_do_dia(self.entrada)
+
+    def eventos(self) -> List[Tuple[str, timedelta]]:
+        """
+        Ações do turno e o deslocamento de cada uma a partir da meia-noite do dia de início.
+        """
+        horarios = [(AcaoPonto.ENTRADA, self.entrada)]
+        if self.pausa is not None:
+            horarios += [(AcaoPonto.PAUSA, self.pausa), (AcaoPonto.RETORNO, self.retorno)]
+        horarios.append((AcaoPonto.SAIDA, self.saida))
+
+        inicio = _minutos_do_dia(self.entrada)
+        eventos = []
+        for acao, hora in horarios:
+            minutos = _minutos_do_dia(hora)
+            if minutos < inicio or (acao is AcaoPonto.SAIDA and minutos == inicio):
+                minutos += 24 * 60
+            eventos.append((acao.value, timedelta(minutes=minutos)))
+        return eventos
+
+def escalas_cadastradas(df_escalas: pd.DataFrame) -> List[Escala]:
+    return [
+        Escala(linha["Nome"], linha["Entrada"], linha["Saida"], linha["Pausa"], linha["Retorno"], linha["Padrao"])
+        for linha in df_escalas.to_dict("records")
+    ]
+
+def dias_de_trabalho(escala: Escala, inicio: date, fim: date, inicio_ciclo: Optional[date] = None) -> pd.DatetimeIndex:
+    dias = pd.date_range(inicio, fim, freq="D")
+    posicao = (dias - pd.Timestamp(inicio_ciclo or inicio)).days % len(escala.padrao)
+    trabalha = np.array([c == "1" for c in escala.padrao])[posicao]
+    return dias[trabalha]
+
+def registros_escala(escala: Escala, nomes: Sequence[str], inicio: date, fim: date, inicio_ciclo: Optional[date] = None) -> pd.DataFrame:
+    """
+    Todos os registros da escala para os colaboradores no período, montados de uma vez sobre a
+    grade colaboradores x dias de trabalho x ações do turno. A coluna Turno é o dia de início
+    do turno a que o registro pertence.
+    """
+    dias = dias_de_trabalho(escala, inicio, fim, inicio_ciclo).values
+    acoes, deslocamentos = zip(*escala.eventos())
+    deslocamentos = np.array(deslocamentos, dtype="timedelta64[ns]")
+    nomes = np.asarray(nomes, dtype=object)
+    por_nome = len(dias) * len(acoes)
+
+    turnos = np.tile(np.repeat(dias, len(acoes)), len(nomes))
+    momentos = pd.DatetimeIndex(turnos + np.tile(deslocamentos, len(nomes) * len(dias)))
+    return pd.DataFrame({
+        "Nome": np.repeat(nomes, por_nome),
+        "Ação": np.tile(np.array(acoes, dtype=object), len(nomes) * len(dias)),
+        "Data": momentos.strftime("%Y-%m-%d"),
+        "Hora": momentos.strftime("%H:%M"),
+        "Turno": pd.DatetimeIndex(turnos).strftime("%Y-%m-%d"),
+    })
+
+def _turnos_com_registros(df: pd.DataFrame, df_pontos: pd.DataFrame) -> pd.Series:
+    """
+    Indica, para cada linha, se o colaborador já tem algum registro entre o início e o fim do
+    turno dela (um merge_asof para todos os turnos).
+    """
+    momentos = pd.to_datetime(df["Data"] + " " + df["Hora"], format="%Y-%m-%d %H:%M").astype("datetime64[ns]")
+    turnos = (
+        df.assign(Momento=momentos).groupby(["Nome", "Turno"])["Momento"]
+        .agg(Inicio="min", Fim="max").reset_index().sort_values("Inicio")
+    )
+    proximo = pd.merge_asof(
+        turnos, momentos_registrados(df_pontos).rename(columns={"DataHora": "Existente"}),
+        left_on="Inicio", right_on="Existente", by="Nome", direction="forward",
+    )
+    ocupados = proximo.loc[proximo["Existente"] <= proximo["Fim"], ["Nome", "Turno"]]
+    return pd.MultiIndex.from_frame(df[["Nome", "Turno"]]).isin(pd.MultiIndex.from_frame(ocupados))
+
+def registrar_escala(
+    data_manager: DataManager, escala: Escala, nomes: Sequence[str], inicio: date, fim: date, inicio_ciclo: Optional[date] = None,
+) -> ResultadoImportacaoCSV:
+    """
+    Aplica a escala aos colaboradores no período com uma única escrita. Cada turno é gravado
+    inteiro ou não é gravado: turnos em que o colaborador já tem registros, ou com algum
+    registro rejeitado na validação, ficam de fora e são listados com o motivo. As checagens
+    contra os registros existentes são feitas dentro da gravação.
+    """
+    df = registros_escala(escala, nomes, inicio, fim, inicio_ciclo)
+    if df.empty:
+        return ResultadoImportacaoCSV(validos=df[COLUNAS_PONTO], rejeitados=df[COLUNAS_PONTO].assign(Motivo=None))
+    df_colab = data_manager.carregar_colaboradores()
+    chaves = pd.MultiIndex.from_frame(df[["Nome", "Turno"]])
+
+    def validar(df_pontos: pd.DataFrame):
+        motivos = pd.Series(None, index=df.index, dtype=object)
+        motivos[_turnos_com_registros(df, df_pontos)] = "Turno já possui registros"
+
+        livres = df[motivos.isna()]
+        resultado = validar_pontos(livres, df_colab, df_pontos)
+        posicoes = resultado.rejeitados["Linha"].to_numpy() - 2 # Linha da planilha -> posição em livres
+        motivos.loc[livres.index[posicoes]] = resultado.rejeitados["Motivo"].to_numpy()
+
+        turno_incompleto = chaves.isin(chaves[motivos.notna().to_numpy()]) & motivos.isna().to_numpy()
+        motivos[turno_incompleto] = "Outro registro do turno foi rejeitado"
+
+        gravar = motivos.isna()
+        resultado.validos = df.loc[gravar, COLUNAS_PONTO].reset_index(drop=True)
+        resultado.rejeitados = df.loc[~gravar, COLUNAS_PONTO].assign(Motivo=motivos[~gravar]).reset_index(drop=True)
+        return resultado.validos, resultado
+
+    resultado = data_manager.anexar_pontos_validados(validar)
+    resultado.gravados = len(resultado.validos)
+    return resultado
@@ -0,0 +1,73 @@
+"""
+Geração de relatórios em lote: vários períodos e funções processados em paralelo,
+um processo por núcleo, com todos os arquivos reunidos em um único diretório.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from ponto.dados import InstantaneoDados
+from ponto.relatorio import gerar_relatorio_do_instantaneo, salvar_relatorio
+
+@dataclass(frozen=True)
+class TarefaRelatorio:
+    data_inicio: date
+    data_fim: date
+    funcao: Optional[str] = None
+
+    @property
+    def descricao(self) -> str:
+        periodo = f"{self.data_inicio.strftime('%d/%m/%Y')} a {self.data_fim.strftime('%d/%m/%Y')}"
+        return f"{periodo} - {self.funcao or 'Todas as funções'}"
+
+def periodos_mensais(referencia: date, meses: int) -> List[Tuple[date, date]]:
+    """
+    O mês da data de referência e os (meses - 1) meses anteriores, do mais recente ao mais antigo.
+    O mês de referência termina na própria data de referência.
+    """
+    periodos = []
+    fim = referencia
+    for _ in range(meses):
+        inicio = fim.replace(day=1)
+        periodos.append((inicio, fim))
+        fim = inicio - timedelta(days=1)
+    return periodos
+
+def planejar_tarefas(periodos: Iterable[Tuple[date, date]], funcoes: Iterable[Optional[str]]) -> List[TarefaRelatorio]:
+    """
+    Uma tarefa para cada combinação de período e função (None = todas as funções).
+    """
+    funcoes = list(funcoes)
+    return [TarefaRelatorio(inicio, fim, funcao) for inicio, fim in periodos for funcao in funcoes]
+
+# Instantâneo dos dados de cada processo de trabalho, recebido uma única vez na inicialização
+_dados_trabalhador: Optional[InstantaneoDados] = None
+
+def _inicializar_trabalhador(dados: InstantaneoDados):
+    global _dados_trabalhador
+    _dados_trabalhador = dados
+
+def _executar_tarefa(tarefa: TarefaRelatorio, diretorio: str, compactar: bool, planilha: bool) -> List[str]:
+    relatorio = gerar_relatorio_do_instantaneo(_dados_trabalhador, tarefa.data_inicio, tarefa.data_fim, tarefa.funcao)
+    return salvar_relatorio(relatorio, diretorio, compactar, planilha)
+
+def gerar_relatorios_em_lote(dados: InstantaneoDados, tarefas: List[TarefaRelatorio], diretorio: str, compactar: bool = False, processos: Optional[int] = None, planilha: bool = False) -> List[Tuple[TarefaRelatorio, List[str], Optional[str]]]:
+    """
+    Distribui as tarefas entre processos. O instantâneo é enviado a cada processo uma única vez
+    e usado apenas para leitura. Retorna, para cada tarefa, os arquivos gerados e o erro (se houver).
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    processos = processos or os.cpu_count() or 1
+    resultados = []
+    with ProcessPoolExecutor(max_workers=min(processos, max(len(tarefas), 1)), initializer=_inicializar_trabalhador, initargs=(dados,)) as executor:
+        futuros = {executor.submit(_executar_tarefa, tarefa, diretorio, compactar, planilha): tarefa for tarefa in tarefas}
+        for futuro in as_completed(futuros):
+            tarefa = futuros[futuro]
+            try:
+                resultados.append((tarefa, futuro.result(), None))
+            except Exception as e:
+                resultados.append((tarefa, [], str(e)))
+    ordem = {tarefa: i for i, tarefa in enumerate(tarefas)}
+    return sorted(resultados, key=lambda r: ordem[r[0]])
@@ -0,0 +1,80 @@
+"""
+Observador dos arquivos de dados. Uma thread consulta periodicamente a versão de cada
+arquivo (os.stat: data de modificação e tamanho) e avisa quando alguma muda, seja por uma
+gravação da própria aplicação, da API dos tablets, da linha de comando ou por alguém
+editando o CSV à mão. Com isso os caches podem ser identificados pela versão dos arquivos e
+valer enquanto os dados não mudam, sem prazo de validade.
+
+A consulta por intervalo funciona igual em qualquer sistema de arquivos (inclusive pastas de
+rede, onde o inotify não enxerga alterações feitas por outras máquinas) e custa poucas
+chamadas a os.stat por segundo.
+"""
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from ponto.dados import DataManager
+
+logger = logging.getLogger(__name__)
+
+Versao = Tuple[int, int]
+
+class ObservadorArquivos:
+    """
+    Guarda a última versão vista de cada arquivo. verificar() relê as versões e chama
+    ao_mudar com os arquivos alterados; a thread iniciada por iniciar() faz isso a cada
+    intervalo segundos, e quem acabou de gravar pode chamá-la para não esperar o próximo ciclo.
+    """
+    def __init__(self, arquivos: Iterable[str], ao_mudar: Optional[Callable[[Set[str]], None]] = None, intervalo: float = 1.0):
+        self.arquivos = tuple(arquivos)
+        self.ao_mudar = ao_mudar
+        self.intervalo = intervalo
+        # Incrementada a cada mudança detectada
+        self.geracao = 0
+        self._versoes: Dict[str, Versao] = {arquivo: DataManager.versao_arquivo(arquivo) for arquivo in self.arquivos}
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def versao(self, arquivo: str) -> Versao:
+        versao = self._versoes.get(arquivo)
+        return versao if versao is not None else DataManager.versao_arquivo(arquivo)
+
+    def versoes(self, arquivos: Iterable[str]) -> Tuple[Versao, ...]:
+        return tuple(self.versao(arquivo) for arquivo in arquivos)
+
+    def verificar(self) -> Set[str]:
+        """
+        Atualiza as versões e devolve os arquivos que mudaram desde a última verificação.
+        """
+        with self._lock:
+            alterados = set()
+            for arquivo in self.arquivos:
+                versao = DataManager.versao_arquivo(arquivo)
+                if versao != self._versoes[arquivo]:
+                    self._versoes[arquivo] = versao
+                    alterados.add(arquivo)
+            if alterados:
+                self.geracao += 1
+        if alterados and self.ao_mudar is not None:
+            try:
+                self.ao_mudar(alterados)
+            except Exception:
+                logger.exception("Falha ao tratar a alteração dos arquivos de dados")
+        return alterados
+
+    def _laco(self):
+        while not self._parar.wait(self.intervalo):
+            self.verificar()
+
+    def iniciar(self) -> "ObservadorArquivos":
+        if self._thread is None or not self._thread.is_alive():
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._laco, name="observador-arquivos", daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self, timeout: Optional[float] = None):
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
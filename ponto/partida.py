@@ -0,0 +1,42 @@
+"""
+Orçamento de partida a frio da interface: o tempo, num processo novo, entre o início da
+execução de PONTOS.py e a primeira página exibida (a tela de login).
+
+A interface só registra esse tempo no log de cada processo do servidor. Quem verifica o
+orçamento é medir_partida, usada por python -m ponto partida, que termina com erro quando
+ele é ultrapassado (para rodar antes de publicar uma versão ou numa tarefa agendada).
+"""
+import os
+import subprocess
+import sys
+
+ORCAMENTO_PRIMEIRA_PAGINA = 3.0
+SCRIPT_INTERFACE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "PONTOS.py")
+
+# Roda no processo novo. A contagem começa antes da importação do Streamlit, como a da
+# interface, e inclui também a do executor de testes dele: o tempo medido fica um pouco
+# acima do registrado no log
+_MEDIR_PARTIDA = """
+import sys
+from time import perf_counter
+inicio = perf_counter()
+from streamlit.testing.v1 import AppTest
+execucao = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[2])).run()
+if execucao.exception:
+    sys.exit("A interface falhou na partida: " + execucao.exception[0].message)
+print(perf_counter() - inicio)
+"""
+
+def medir_partida(diretorio_dados: str = ".", script: str = SCRIPT_INTERFACE, timeout: float = 120.0) -> float:
+    """
+    Segundos até a primeira página do script ser exibida num processo Python novo, com os
+    arquivos de dados do diretório informado. Levanta RuntimeError se a página falhar.
+    """
+    processo = subprocess.run(
+        [sys.executable, "-c", _MEDIR_PARTIDA, os.path.abspath(script), str(timeout)],
+        cwd=diretorio_dados, capture_output=True, text=True, timeout=timeout + 30,
+    )
+    if processo.returncode != 0:
+        linhas = processo.stderr.strip().splitlines()
+        raise RuntimeError(linhas[-1] if linhas else f"O processo de medição terminou com o código {processo.returncode}.")
+    return float(processo.stdout.strip().splitlines()[-1])
@@ -0,0 +1,91 @@
+"""
+Exportação do relatório da diretoria em planilha Excel (.xlsx).
+
+A pasta de trabalho é gravada em modo somente escrita do openpyxl: as linhas vão sendo
+enviadas ao arquivo à medida que são geradas, com memória constante mesmo para períodos longos.
+O openpyxl é opcional; sem ele as demais funções do sistema continuam disponíveis. Ele só é
+importado quando uma planilha é gerada (a importação leva mais tempo que a do resto do módulo).
+"""
+import importlib.util
+import re
+from datetime import datetime
+from typing import IO, Any, Dict, Iterator, Union
+
+from ponto.calculos import formatar_timedelta
+from ponto.relatorio import RelatorioDiretoria
+
+_CARACTERES_INVALIDOS_ABA = re.compile(r"[\[\]:*?/\\]")
+TAMANHO_MAXIMO_ABA = 31
+
+def xlsx_disponivel() -> bool:
+    return importlib.util.find_spec("openpyxl") is not None
+
+def _nome_aba(nome: str, usados: set) -> str:
+    base = _CARACTERES_INVALIDOS_ABA.sub("_", nome).strip()[:TAMANHO_MAXIMO_ABA] or "Colaborador"
+    titulo, n = base, 2
+    while titulo.casefold() in usados:
+        sufixo = f" ({n})"
+        titulo = base[:TAMANHO_MAXIMO_ABA - len(sufixo)] + sufixo
+        n += 1
+    usados.add(titulo.casefold())
+    return titulo
+
+def _horas_decimais(texto_hhmm: str) -> float:
+    try:
+        h, m = map(int, texto_hhmm.split(':'))
+        return round(h + m / 60, 2)
+    except (ValueError, AttributeError):
+        return 0.0
+
+def _linhas_detalhe_he(detalhes: Dict[str, Dict[str, Any]]) -> Iterator[list]:
+    for tipo in ("50%", "100%"):
+        registros = [
+            (data, registro) for data, lista in detalhes[tipo]["datas"].items() for registro in lista
+        ]
+        for data, registro in sorted(registros, key=lambda r: (r[0], r[1]["inicio_turno"])):
+            duracao = registro["duracao"]
+            yield [
+                tipo, data, registro["periodo"], formatar_timedelta(duracao),
+                round(duracao.total_seconds() / 3600, 2), registro["inicio_turno"].to_pydatetime(),
+            ]
+
+def escrever_relatorio_xlsx(relatorio: RelatorioDiretoria, destino: Union[str, IO]):
+    """
+    Uma aba para cada tabela do relatório (horas, horas extras e ausências) e uma aba de
+    detalhamento das horas extras 50% e 100% para cada colaborador que as tenha no período.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("A exportação em Excel requer o pacote openpyxl (pip install openpyxl).")
+
+    wb = Workbook(write_only=True)
+    usados: set = set()
+
+    ws = wb.create_sheet(_nome_aba("Resumo de Horas", usados))
+    ws.append([f"Período: {relatorio.data_inicio.strftime('%d/%m/%Y')} a {relatorio.data_fim.strftime('%d/%m/%Y')}"])
+    ws.append(["Nome", "Total de Horas", "Horas (decimal)"])
+    for nome, total in zip(relatorio.df_resumo_horas["Nome"], relatorio.df_resumo_horas["Total de Horas"]):
+        ws.append([nome, total, _horas_decimais(total)])
+
+    ws = wb.create_sheet(_nome_aba("Horas Extras", usados))
+    ws.append(["Nome", "HE 50%", "HE 100%", "HE 50% (decimal)", "HE 100% (decimal)"])
+    for item in relatorio.dados_he:
+        ws.append([item["nome"], item["he_50"], item["he_100"], _horas_decimais(item["he_50"]), _horas_decimais(item["he_100"])])
+
+    ws = wb.create_sheet(_nome_aba("Ausências", usados))
+    ws.append(["Nome", "Data", "Status"])
+    for item in relatorio.ausencias:
+        ws.append([item["nome"], datetime.strptime(item["data"], "%d/%m/%Y").date(), item["status"]])
+
+    for item in relatorio.dados_he:
+        detalhes = item.get("detalhes")
+        if not detalhes or not (detalhes["50%"]["datas"] or detalhes["100%"]["datas"]):
+            continue
+        ws = wb.create_sheet(_nome_aba(item["nome"], usados))
+        ws.append([item["nome"]])
+        ws.append(["Tipo", "Data", "Período", "Duração", "Horas (decimal)", "Início do Turno"])
+        for linha in _linhas_detalhe_he(detalhes):
+            ws.append(linha)
+
+    wb.save(destino)
@@ -0,0 +1,375 @@
+"""
+Relatório gerencial (diretoria) em HTML e a preparação dos dados que o compõem.
+"""
+import gzip
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ponto.calculos import (
+    calcular_faltas, calcular_horas, calcular_horas_extras_periodo, eh_vigia,
+    faltas_para_dataframe, formatar_timedelta, resumir_horas_trabalhadas,
+)
+from ponto.dados import DataManager, InstantaneoDados
+
+# Chart.js embutido nos relatórios (vendor/chartjs na raiz do projeto)
+ARQ_CHART_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "vendor", "chartjs", "chart.umd.min.js")
+
+CHART_JS_CDN = "https://cdn.jsdelivr.net/npm/chart.js"
+
+RELATORIO_CSS = """
+    <style>
+        body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 20px; background-color: #f9f9f9; color: #333; }
+        .report-container { max-width: 950px; margin: auto; background-color: #fff; border: 1px solid #ddd; padding: 30px; border-radius: 8px; box-shadow: 0 4px 8px rgba(0,0,0,0.05); }
+        .header { text-align: center; margin-bottom: 40px; border-bottom: 2px solid #eee; padding-bottom: 20px; }
+        .header h1 { margin: 0; color: #2c3e50; font-size: 24px; }
+        .header p { margin: 5px 0 0 0; color: #555; font-size: 14px; }
+        .section { margin-top: 35px; }
+        .section h2 { color: #34495e; border-bottom: 1px solid #ccc; padding-bottom: 10px; font-size: 18px; }
+        .section p.description { font-size: 14px; color: #666; margin-bottom: 20px; }
+        .chart-container { position: relative; margin-top: 25px; padding: 15px; border: 1px solid #eee; border-radius: 5px; }
+        table { width: 100%; border-collapse: collapse; margin-top: 15px; font-size: 14px; }
+        th, td { border: 1px solid #ddd; padding: 10px; text-align: left; }
+        th { background-color: #f2f5f7; font-weight: 600; color: #444; }
+        tr:nth-child(even) { background-color: #fcfcfc; }
+        .footer { text-align: center; margin-top: 40px; padding-top: 20px; border-top: 2px solid #eee; font-size: 12px; color: #888; }
+        .summary-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 20px; margin-top: 20px; }
+        .summary-card { background-color: #f8f9fa; border: 1px solid #dee2e6; border-left: 5px solid #007bff; padding: 15px; border-radius: 5px; }
+        .summary-card h3 { margin: 0 0 10px 0; font-size: 16px; color: #495057; }
+        .summary-card p { margin: 0; font-size: 22px; font-weight: 600; color: #212529; }
+        .summary-card.he-50 { border-left-color: #ffc107; }
+        .summary-card.he-100 { border-left-color: #dc3545; }
+        .summary-card.faltas { border-left-color: #6c757d; }
+        .summary-card.justificadas { border-left-color: #198754; }
+    </style>
+"""
+
+# Desenha os gráficos a partir dos dados em JSON embutidos no próprio relatório
+RELATORIO_SCRIPT_GRAFICOS = """
+    <script>
+        const dados = JSON.parse(document.getElementById('dados-graficos').textContent);
+        const chartOptions = {
+            indexAxis: 'y', responsive: true, maintainAspectRatio: false,
+            plugins: { legend: { position: 'top' }, title: { display: true, font: { size: 16 } } },
+            scales: { x: { beginAtZero: true, title: { display: true, text: 'Horas (formato decimal)' } } }
+        };
+
+        const totalHoursCtx = document.getElementById('totalHoursChart');
+        if (totalHoursCtx) {
+            new Chart(totalHoursCtx, {
+                type: 'bar',
+                data: {
+                    labels: dados.total.labels,
+                    datasets: [{
+                        label: 'Total de Horas Trabalhadas', data: dados.total.data,
+                        backgroundColor: 'rgba(54, 162, 235, 0.6)', borderColor: 'rgba(54, 162, 235, 1)', borderWidth: 1
+                    }]
+                },
+                options: { ...chartOptions, plugins: { ...chartOptions.plugins, title: { ...chartOptions.plugins.title, text: 'Gráfico 2.1: Horas Totais por Colaborador' } } }
+            });
+        }
+
+        const overtimeCtx = document.getElementById('overtimeChart');
+        if (overtimeCtx) {
+            new Chart(overtimeCtx, {
+                type: 'bar',
+                data: {
+                    labels: dados.he.labels,
+                    datasets: [
+                        { label: 'HE 50%', data: dados.he.he50, backgroundColor: 'rgba(255, 159, 64, 0.6)', borderColor: 'rgba(255, 159, 64, 1)', borderWidth: 1 },
+                        { label: 'HE 100%', data: dados.he.he100, backgroundColor: 'rgba(255, 99, 132, 0.6)', borderColor: 'rgba(255, 99, 132, 1)', borderWidth: 1 }
+                    ]
+                },
+                options: {
+                    ...chartOptions,
+                    plugins: { ...chartOptions.plugins, title: { ...chartOptions.plugins.title, text: 'Gráfico 2.2: Horas Extras Consolidadas' } },
+                    scales: { x: { ...chartOptions.scales.x, stacked: true }, y: { stacked: true } }
+                }
+            });
+        }
+    </script>
+"""
+
+@lru_cache(maxsize=1)
+def _template_relatorio_html() -> Tuple[str, str]:
+    """
+    Monta uma única vez as partes fixas do relatório: o cabeçalho com o CSS e o rodapé com o
+    Chart.js embutido e o script dos gráficos. Assim o relatório abre sem acesso à internet.
+    Se o arquivo do Chart.js não estiver disponível, usa a CDN como alternativa.
+    """
+    try:
+        with open(ARQ_CHART_JS, encoding="utf-8") as f:
+            chart_js = f.read()
+        script_runtime = f"<script>{chart_js}</script>"
+    except OSError:
+        script_runtime = f'<script src="{CHART_JS_CDN}"></script>'
+
+    cabecalho = "<!DOCTYPE html><html lang='pt-BR'><head><meta charset='UTF-8'><title>{titulo}</title>" + RELATORIO_CSS + "</head><body>"
+    rodape = script_runtime + RELATORIO_SCRIPT_GRAFICOS + "</body></html>"
+    return cabecalho, rodape
+
+def _json_compacto_para_html(dados: Any) -> str:
+    """
+    Serializa dados em JSON compacto, seguro para ser embutido dentro de uma tag <script>.
+    """
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+def compactar_relatorio_html(html_content: str) -> bytes:
+    """
+    Gera a versão compactada (gzip) do relatório, para envio por e-mail.
+    """
+    return gzip.compress(html_content.encode("utf-8"), compresslevel=9, mtime=0)
+
+def gerar_relatorio_html(data_inicio: datetime, data_fim: datetime, df_resumo_horas: pd.DataFrame, dados_he: list, ausencias: list):
+    """
+    Gera um relatório consolidado em HTML, incluindo gráficos, com base nos dados fornecidos.
+    Esta versão é otimizada para apresentação à diretoria.
+    """
+    # --- Funções auxiliares para conversão de dados ---
+    def he_para_decimal(tempo_str: str) -> float:
+        try:
+            h, m = map(int, tempo_str.split(':'))
+            return round(h + m / 60, 2)
+        except (ValueError, TypeError, AttributeError):
+            return 0
+
+    # --- Preparação de dados para os gráficos ---
+    df_resumo_horas['Horas Decimais'] = df_resumo_horas['Total de Horas'].apply(he_para_decimal)
+    chart_total_labels = df_resumo_horas['Nome'].tolist()
+    chart_total_data = df_resumo_horas['Horas Decimais'].tolist()
+
+    he_nomes = [item['nome'] for item in dados_he]
+    he_50_data = [he_para_decimal(item['he_50']) for item in dados_he]
+    he_100_data = [he_para_decimal(item['he_100']) for item in dados_he]
+    
+    # --- Cálculos para o Sumário Executivo ---
+    total_horas_trabalhadas_decimal = sum(chart_total_data)
+    total_he50_decimal = sum(he_50_data)
+    total_he100_decimal = sum(he_100_data)
+    
+    # MODIFICADO: Contagem de faltas e ausências justificadas
+    total_faltas = len([a for a in ausencias if a['status'] == 'Falta'])
+    # <<< ALTERAÇÃO AQUI >>>
+    total_ausencias_justificadas = len([a for a in ausencias if a['status'] in ['Atestado', 'Folga', 'Não Apto']])
+    colaboradores_com_faltas = len(set(a['nome'] for a in ausencias if a['status'] == 'Falta'))
+
+    def decimal_para_hms(horas_decimais: float) -> str:
+        horas = int(horas_decimais)
+        minutos = int((horas_decimais * 60) % 60)
+        return f"{horas:02}:{minutos:02}"
+        
+    # Calcular altura dinâmica dos gráficos
+    chart_total_height = 120 + (len(chart_total_labels) * 30)
+    chart_he_height = 120 + (len(he_nomes) * 30)
+
+    # --- Formatação de Datas e Geração das Tabelas ---
+    str_data_inicio = data_inicio.strftime('%d/%m/%Y')
+    str_data_fim = data_fim.strftime('%d/%m/%Y')
+    data_geracao = datetime.now().strftime('%d/%m/%Y às %H:%M:%S')
+
+    tabela_horas_html = df_resumo_horas[['Nome', 'Total de Horas']].to_html(index=False, classes="table", border=0) if not df_resumo_horas.empty else "<p>Não há registros de horas consolidadas.</p>"
+    
+    if not dados_he:
+        tabela_he_html = "<p>Nenhum registro de hora extra.</p>"
+    else:
+        he_rows = "".join([f"<tr><td>{item['nome']}</td><td>{item['he_50']}</td><td>{item['he_100']}</td></tr>" for item in dados_he])
+        tabela_he_html = f"""<table class="table"><thead><tr><th>Colaborador</th><th>Horas Extras (50%)</th><th>Horas Extras (100%)</th></tr></thead><tbody>{he_rows}</tbody></table>"""
+
+    # MODIFICADO: Tabela de ausências agora inclui o status
+    if not ausencias:
+        tabela_faltas_html = "<p>Nenhuma falta ou ausência registrada no período.</p>"
+    else:
+        ausencias_rows = "".join([f"<tr><td>{item['nome']}</td><td>{item['data']}</td><td>{item['status']}</td></tr>" for item in ausencias])
+        tabela_faltas_html = f"""<table class="table"><thead><tr><th>Colaborador</th><th>Data</th><th>Status</th></tr></thead><tbody>{ausencias_rows}</tbody></table>"""
+
+    # Dados dos gráficos em JSON compacto, lidos pelo script fixo do template
+    dados_graficos = {
+        "total": {"labels": chart_total_labels, "data": chart_total_data},
+        "he": {"labels": he_nomes, "he50": he_50_data, "he100": he_100_data},
+    }
+
+    # --- Montagem do Corpo do HTML ---
+    html_body = f"""
+    <div class="report-container">
+        <div class="header">
+            <h1>Relatório Gerencial de Ponto</h1>
+            <p>Análise consolidada de frequência e horas trabalhadas dos colaboradores.</p>
+            <p><strong>Período de Apuração:</strong> de {str_data_inicio} a {str_data_fim}</p>
+        </div>
+
+        <div class="section">
+            <h2>1. Sumário Executivo</h2>
+            <p class="description">Principais indicadores consolidados para o período e filtros selecionados.</p>
+            <div class="summary-grid">
+                <div class="summary-card"><h3>Total de Horas Trabalhadas</h3><p>{decimal_para_hms(total_horas_trabalhadas_decimal)}</p></div>
+                <div class="summary-card he-50"><h3>Total HE 50%</h3><p>{decimal_para_hms(total_he50_decimal)}</p></div>
+                <div class="summary-card he-100"><h3>Total HE 100%</h3><p>{decimal_para_hms(total_he100_decimal)}</p></div>
+                <div class="summary-card faltas"><h3>Faltas Não Justificadas</h3><p>{total_faltas} ({colaboradores_com_faltas} colab.)</p></div>
+                <div class="summary-card justificadas"><h3>Ausências Justificadas</h3><p>{total_ausencias_justificadas}</p></div>
+            </div>
+        </div>
+
+        <div class="section">
+            <h2>2. Indicadores Visuais de Desempenho</h2>
+            <p class="description">Comparativo visual do volume de horas por colaborador.</p>
+            
+            {f'<div class="chart-container"><canvas id="totalHoursChart" style="height: {chart_total_height}px;"></canvas></div>' if chart_total_data else ''}
+            {f'<div class="chart-container"><canvas id="overtimeChart" style="height: {chart_he_height}px;"></canvas></div>' if he_50_data or he_100_data else ''}
+        </div>
+
+        <div class="section">
+            <h2>3. Detalhamento por Colaborador</h2>
+            <p class="description">Tabelas com os dados detalhados que compõem os indicadores.</p>
+            
+            <h3>Tabela 3.1: Resumo de Horas Trabalhadas</h3>
+            {tabela_horas_html}
+            
+            <h3 style="margin-top: 25px;">Tabela 3.2: Horas Extras Apuradas</h3>
+            {tabela_he_html}
+            
+            <h3 style="margin-top: 25px;">Tabela 3.3: Relatório de Faltas e Ausências</h3>
+            {tabela_faltas_html}
+        </div>
+
+        <div class="footer">
+            <p>Relatório gerado em {data_geracao} pelo Sistema de Controle de Ponto.</p>
+            <p>Desenvolvido Por Francelino Neto Santos.</p>
+        </div>
+    </div>
+    
+    <script type="application/json" id="dados-graficos">{_json_compacto_para_html(dados_graficos)}</script>
+    """
+    
+    cabecalho, rodape = _template_relatorio_html()
+    titulo = f"Relatório Gerencial - {str_data_inicio} a {str_data_fim}"
+    full_html = cabecalho.replace("{titulo}", titulo, 1) + html_body + rodape
+    return full_html
+
+def filtrar_pontos_periodo(df_pontos: pd.DataFrame, data_inicio, data_fim, nomes=None) -> pd.DataFrame:
+    """
+    Registros de ponto entre as datas informadas (inclusive), opcionalmente restritos a alguns nomes.
+    """
+    datas = pd.to_datetime(df_pontos["Data"])
+    mascara = (datas >= pd.to_datetime(data_inicio)) & (datas <= pd.to_datetime(data_fim))
+    if nomes is not None:
+        mascara &= df_pontos['Nome'].isin(nomes)
+    return df_pontos[mascara]
+
+def preparar_dados_relatorio(df_colab_filtrado: pd.DataFrame, df_pontos_periodo: pd.DataFrame, horas_extras_por_nome: Callable[[str], Dict[str, Dict[str, Any]]], df_ausencias: pd.DataFrame) -> Tuple[pd.DataFrame, List[dict], List[dict]]:
+    """
+    Monta as tabelas usadas pelo relatório da diretoria: resumo de horas, horas extras (sem vigias)
+    e ausências com status. O cálculo de horas extras por colaborador é recebido como função,
+    para que a interface possa usar sua versão com cache.
+    """
+    # 1. Preparar lista de colaboradores do filtro
+    df_colab_para_relatorio = df_colab_filtrado[['Nome', 'Funcao']].drop_duplicates().sort_values(by='Nome')
+
+    # 2. Preparar dados de Horas Extras (sem vigias)
+    dados_he = []
+    for _, row in df_colab_para_relatorio.iterrows():
+        if eh_vigia(row['Funcao']):
+            continue
+        resultado_extras = horas_extras_por_nome(row['Nome'])
+        dados_he.append({
+            "nome": row['Nome'],
+            "he_50": formatar_timedelta(resultado_extras["50%"]["total"]),
+            "he_100": formatar_timedelta(resultado_extras["100%"]["total"]),
+            "detalhes": resultado_extras, # datas de cada tipo, usadas no detalhamento da planilha
+        })
+
+    # 3. Preparar dados de Horas Totais para TODOS
+    resumo_segundos = resumir_horas_trabalhadas(calcular_horas(df_pontos_periodo.copy()))
+    df_resumo_horas = pd.merge(
+        df_colab_para_relatorio[['Nome']], resumo_segundos[['Nome', 'Total de Horas']],
+        on='Nome', how='left'
+    ).fillna({'Total de Horas': '00:00'})
+
+    # 4. Preparar dados de Faltas e Ausências com justificativas
+    df_ausencias_relatorio = df_ausencias.copy()
+    df_ausencias_relatorio["Data"] = pd.to_datetime(df_ausencias_relatorio["Data"]).dt.strftime('%d/%m/%Y')
+    ausencias = df_ausencias_relatorio.rename(columns=str.lower).to_dict('records')
+
+    return df_resumo_horas, dados_he, ausencias
+
+@dataclass
+class RelatorioDiretoria:
+    data_inicio: date
+    data_fim: date
+    funcao: Optional[str]
+    html: str
+    df_resumo_horas: pd.DataFrame
+    dados_he: List[dict]
+    ausencias: List[dict]
+
+    @property
+    def nome_base(self) -> str:
+        nome = f"Relatorio_Diretoria_{self.data_inicio.strftime('%Y%m%d')}_{self.data_fim.strftime('%Y%m%d')}"
+        if self.funcao:
+            nome += "_" + "".join(c if c.isalnum() else "_" for c in self.funcao)
+        return nome
+
+def gerar_relatorio_do_instantaneo(dados: InstantaneoDados, data_inicio: date, data_fim: date, funcao: Optional[str] = None) -> RelatorioDiretoria:
+    """
+    Calcula horas, horas extras e faltas do período (opcionalmente de uma só função) a partir de
+    um instantâneo dos dados e gera o relatório da diretoria, sem depender da interface.
+    """
+    df_pontos = dados.pontos
+    df_colab = dados.colaboradores
+    calendario = dados.carregar_calendario()
+
+    df_colab_filtrado = df_colab if funcao is None else df_colab[df_colab["Funcao"] == funcao]
+    df_pontos_periodo = filtrar_pontos_periodo(df_pontos, data_inicio, data_fim, df_colab_filtrado['Nome'].unique())
+
+    inicio_str, fim_str = data_inicio.strftime('%Y-%m-%d'), data_fim.strftime('%Y-%m-%d')
+    def horas_extras_por_nome(nome: str) -> Dict[str, Dict[str, Any]]:
+        return calcular_horas_extras_periodo(df_pontos_periodo, nome, inicio_str, fim_str, calendario)
+
+    faltas = calcular_faltas(data_inicio, data_fim, df_colab_filtrado, df_pontos, calendario)
+    df_ausencias = dados.resolver_status_faltas(faltas_para_dataframe(faltas))
+
+    df_resumo_horas, dados_he, ausencias = preparar_dados_relatorio(df_colab_filtrado, df_pontos_periodo, horas_extras_por_nome, df_ausencias)
+    html = gerar_relatorio_html(data_inicio, data_fim, df_resumo_horas, dados_he, ausencias)
+    return RelatorioDiretoria(data_inicio, data_fim, funcao, html, df_resumo_horas, dados_he, ausencias)
+
+def gerar_relatorio_diretoria(data_manager: DataManager, data_inicio: date, data_fim: date, funcao: Optional[str] = None) -> RelatorioDiretoria:
+    """
+    Lê os dados atuais e gera o relatório da diretoria do período.
+    """
+    return gerar_relatorio_do_instantaneo(data_manager.carregar_tudo(), data_inicio, data_fim, funcao)
+
+def salvar_relatorio(relatorio: RelatorioDiretoria, diretorio: str, compactar: bool = False, planilha: bool = False) -> List[str]:
+    """
+    Grava o HTML do relatório e os resumos em CSV no diretório informado (e, se pedido,
+    a planilha .xlsx). Retorna os arquivos criados.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    base = os.path.join(diretorio, relatorio.nome_base)
+    arquivos = []
+
+    with open(f"{base}.html", "w", encoding="utf-8") as f:
+        f.write(relatorio.html)
+    arquivos.append(f"{base}.html")
+    if compactar:
+        with open(f"{base}.html.gz", "wb") as f:
+            f.write(compactar_relatorio_html(relatorio.html))
+        arquivos.append(f"{base}.html.gz")
+
+    relatorio.df_resumo_horas[['Nome', 'Total de Horas']].to_csv(f"{base}_horas.csv", index=False)
+    pd.DataFrame(relatorio.dados_he, columns=["nome", "he_50", "he_100"]).rename(
+        columns={"nome": "Nome", "he_50": "HE 50%", "he_100": "HE 100%"}
+    ).to_csv(f"{base}_horas_extras.csv", index=False)
+    pd.DataFrame(relatorio.ausencias, columns=["nome", "data", "status"]).rename(columns=str.capitalize).to_csv(
+        f"{base}_ausencias.csv", index=False
+    )
+    arquivos += [f"{base}_horas.csv", f"{base}_horas_extras.csv", f"{base}_ausencias.csv"]
+
+    if planilha:
+        from ponto.planilha import escrever_relatorio_xlsx
+        escrever_relatorio_xlsx(relatorio, f"{base}.xlsx")
+        arquivos.append(f"{base}.xlsx")
+    return arquivos
@@ -0,0 +1,182 @@
+"""
+Gerador de dados sintéticos para testes de carga: colaboradores, registros de ponto,
+justificativas e feriados no formato dos arquivos do sistema, de 50 a milhares de
+colaboradores e de um a vários anos.
+
+Os dados são determinísticos: a mesma semente gera os mesmos arquivos, e cada colaborador
+tem o seu próprio gerador aleatório (semente + índice), então o colaborador 10 é o mesmo em
+uma base de 50 e em uma de 5.000. Os dias seguem o que aparece nos dados reais: jornada
+padrão com pausa para o almoço, saída mais cedo na sexta, horas extras antes das 07:00 e
+depois do expediente, sábados e alguns domingos e feriados trabalhados, vigias em 12x36
+(os noturnos atravessando a meia-noite), faltas com e sem justificativa e sequências
+incompletas (uma marcação esquecida).
+
+Os registros são gravados à medida que são gerados, então a memória usada não depende do
+tamanho da base.
+"""
+import csv
+import os
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import List, Tuple
+
+from ponto.calendario import CalendarioFeriados
+from ponto.dados import (
+    ARQ_COLAB, ARQ_FERIADOS, ARQ_FERIADOS_IGNORADOS, ARQ_JUSTIFICATIVAS, ARQ_PONTO, COLUNAS_COLAB,
+    COLUNAS_FERIADOS, COLUNAS_JUSTIFICATIVAS, COLUNAS_PONTO_ARQUIVO, OPCOES_STATUS_JUSTIFICATIVA, AcaoPonto,
+)
+
+INICIO_SINTETICO = date(2024, 1, 1)
+
+# Funções e pesos aproximados do quadro de uma obra
+FUNCOES_SINTETICAS = [
+    ("SERVENTE", 30), ("PEDREIRO", 25), ("CARPINTEIRO", 6), ("FERREIRO ARMADOR", 6),
+    ("BETONEIRO", 6), ("OPERADOR DE RETRO", 6), ("ELETRICISTA", 3), ("ENCARREGADO CIVIL", 4),
+    ("ALMOXARIFE", 2), ("TST", 2), ("ASSISTENTE ADIMINISTRATIVA", 2),
+    ("VIGIA DIURNO", 4), ("VIGIA NOTURNO", 4),
+]
+PRIMEIROS_NOMES = [
+    "ANTONIO", "FRANCISCO", "JOSE", "JOAO", "MARIA", "ANA", "PEDRO", "PAULO", "CARLOS", "LUCAS",
+    "MARCOS", "RAIMUNDO", "MANOEL", "FRANCISCA", "ANTONIA", "LUIZ", "JOSEFA", "RAFAEL", "DAMIAO",
+    "ERIVALDO", "JACKSON", "FRANCELINO", "CICERO", "SEBASTIAO", "EDILSON", "GABRIEL", "TIAGO",
+]
+SOBRENOMES = [
+    "DA SILVA", "DOS SANTOS", "PEREIRA", "DE SOUSA", "OLIVEIRA", "LIMA", "CARNEIRO", "GONZAGA",
+    "BRANDAO", "MOREIRA", "RODRIGUES", "FERREIRA", "ALVES", "COSTA", "GOMES", "MARTINS",
+    "ARAUJO", "BARBOSA", "CAVALCANTE", "NASCIMENTO", "MENDES", "FREITAS", "SARAIVA", "LOPES",
+]
+
+# Probabilidades por dia de cada colaborador (fora os vigias)
+PROB_FALTA = 0.03
+PROB_JUSTIFICADA = 0.5 # das faltas
+PROB_INCOMPLETO = 0.02
+PROB_HE_TARDE = 0.12
+PROB_HE_MANHA = 0.05
+PROB_SABADO = 0.15
+PROB_DOMINGO_FERIADO = 0.02
+# Feriado municipal acrescentado em feriados.csv a cada ano (dia, mês, descrição)
+FERIADO_MUNICIPAL = (22, 8, "Aniversário do Município")
+
+_HORAS = [f"{minuto // 60:02d}:{minuto % 60:02d}" for minuto in range(24 * 60)]
+
+@dataclass
+class ResumoSintetico:
+    diretorio: str
+    colaboradores: int
+    dias: int
+    registros: int
+    justificativas: int
+    feriados: int
+
+    @property
+    def resumo(self) -> str:
+        return (f"{self.colaboradores} colaborador(es), {self.dias} dia(s), {self.registros} registro(s) de ponto "
+                f"e {self.justificativas} justificativa(s) gerados em {self.diretorio}")
+
+def _nomes_unicos(quantidade: int, semente: int) -> List[str]:
+    rng = random.Random(f"{semente}:nomes")
+    nomes, vistos = [], set()
+    while len(nomes) < quantidade:
+        nome = f"{rng.choice(PRIMEIROS_NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+        if nome in vistos:
+            nome = f"{nome} {len(nomes) + 1}"
+        vistos.add(nome)
+        nomes.append(nome)
+    return nomes
+
+def _jornada_comum(rng: random.Random, dia_semana: int) -> List[Tuple[AcaoPonto, int]]:
+    # Minutos desde a meia-noite do dia; a sexta termina às 16:00
+    entrada = 7 * 60 + rng.randint(-5, 10)
+    if rng.random() < PROB_HE_MANHA:
+        entrada -= rng.choice((30, 60, 90))
+    pausa = 11 * 60 + rng.randint(0, 15)
+    retorno = pausa + 60 + rng.randint(0, 10)
+    saida = (16 if dia_semana == 4 else 17) * 60 + rng.randint(-5, 10)
+    if rng.random() < PROB_HE_TARDE:
+        saida += rng.choice((30, 60, 90, 120, 180))
+    marcacoes = [(AcaoPonto.ENTRADA, entrada), (AcaoPonto.PAUSA, pausa), (AcaoPonto.RETORNO, retorno), (AcaoPonto.SAIDA, saida)]
+    if rng.random() < PROB_INCOMPLETO:
+        del marcacoes[rng.randrange(len(marcacoes))]
+    return marcacoes
+
+def _marcacoes_do_dia(rng: random.Random, funcao: str, indice_dia: int, fase: int, dia_semana: int, folga: bool) -> List[Tuple[AcaoPonto, int]]:
+    """
+    Marcações (ação, minutos desde a meia-noite do dia) de um colaborador em um dia. Minutos
+    acima de 24 * 60 caem no dia seguinte (vigias noturnos). Lista vazia quando não trabalhou.
+    """
+    if funcao.startswith("VIGIA"):
+        if (indice_dia + fase) % 2:
+            return [] # 12x36: trabalha um dia sim, outro não
+        inicio = (18 if funcao == "VIGIA NOTURNO" else 6) * 60 + rng.randint(-10, 5)
+        return [(AcaoPonto.ENTRADA, inicio), (AcaoPonto.SAIDA, inicio + 12 * 60 + rng.randint(-5, 10))]
+    if folga: # domingo ou feriado
+        if rng.random() < PROB_DOMINGO_FERIADO:
+            inicio = 7 * 60 + rng.randint(0, 10)
+            return [(AcaoPonto.ENTRADA, inicio), (AcaoPonto.SAIDA, inicio + rng.choice((180, 240, 300)))]
+        return []
+    if dia_semana == 5:
+        if rng.random() < PROB_SABADO:
+            inicio = 7 * 60 + rng.randint(-5, 10)
+            return [(AcaoPonto.ENTRADA, inicio), (AcaoPonto.SAIDA, 11 * 60 + rng.randint(0, 60))]
+        return []
+    return _jornada_comum(rng, dia_semana)
+
+def gerar_dados_sinteticos(diretorio: str, colaboradores: int = 50, anos: int = 1, inicio: date = INICIO_SINTETICO, semente: int = 0) -> ResumoSintetico:
+    """
+    Grava no diretório os arquivos de colaboradores, pontos, justificativas e feriados de
+    uma base sintética com o número de colaboradores e de anos informados.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    # Dias de `anos` anos civis, sem depender de o início cair em 29 de fevereiro
+    fim = inicio + timedelta(days=(date(inicio.year + anos, 1, 1) - date(inicio.year, 1, 1)).days - 1)
+    dias = [inicio + timedelta(days=n) for n in range((fim - inicio).days + 2)] # + o dia seguinte ao último
+    datas_str = [dia.strftime("%Y-%m-%d") for dia in dias]
+
+    feriados_municipais = [date(ano, FERIADO_MUNICIPAL[1], FERIADO_MUNICIPAL[0]) for ano in range(inicio.year, fim.year + 1)]
+    feriados_municipais = [dia for dia in feriados_municipais if inicio <= dia <= fim]
+    calendario = CalendarioFeriados(feriados_municipais)
+    folgas = [dia.weekday() == 6 or calendario.eh_feriado(dia) for dia in dias]
+
+    with open(os.path.join(diretorio, ARQ_FERIADOS), "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(COLUNAS_FERIADOS)
+        escritor.writerows((dia.strftime("%Y-%m-%d"), FERIADO_MUNICIPAL[2]) for dia in feriados_municipais)
+    with open(os.path.join(diretorio, ARQ_FERIADOS_IGNORADOS), "w", newline="", encoding="utf-8") as arquivo:
+        csv.writer(arquivo).writerow(COLUNAS_FERIADOS)
+
+    nomes = _nomes_unicos(colaboradores, semente)
+    funcoes, pesos = zip(*FUNCOES_SINTETICAS)
+    status_justificados = [status for status in OPCOES_STATUS_JUSTIFICATIVA if status != "Falta"]
+    total_registros = total_justificativas = 0
+
+    with open(os.path.join(diretorio, ARQ_COLAB), "w", newline="", encoding="utf-8") as arq_colab, \
+         open(os.path.join(diretorio, ARQ_PONTO), "w", newline="", encoding="utf-8") as arq_ponto, \
+         open(os.path.join(diretorio, ARQ_JUSTIFICATIVAS), "w", newline="", encoding="utf-8") as arq_just:
+        escritor_colab, escritor_ponto, escritor_just = csv.writer(arq_colab), csv.writer(arq_ponto), csv.writer(arq_just)
+        escritor_colab.writerow(COLUNAS_COLAB)
+        escritor_ponto.writerow(COLUNAS_PONTO_ARQUIVO)
+        escritor_just.writerow(COLUNAS_JUSTIFICATIVAS)
+
+        for indice, nome in enumerate(nomes):
+            rng = random.Random(f"{semente}:{indice}")
+            funcao = rng.choices(funcoes, weights=pesos)[0]
+            fase = rng.randrange(2)
+            escritor_colab.writerow((nome, funcao))
+
+            linhas = []
+            for indice_dia in range(len(dias) - 1):
+                dia_semana = dias[indice_dia].weekday()
+                folga = folgas[indice_dia]
+                if not funcao.startswith("VIGIA") and not folga and dia_semana < 5 and rng.random() < PROB_FALTA:
+                    if rng.random() < PROB_JUSTIFICADA:
+                        escritor_just.writerow((nome, datas_str[indice_dia], rng.choice(status_justificados)))
+                        total_justificativas += 1
+                    continue
+                for acao, minutos in _marcacoes_do_dia(rng, funcao, indice_dia, fase, dia_semana, folga):
+                    dia_extra, minuto = divmod(minutos, 24 * 60)
+                    linhas.append((nome, acao.value, datas_str[indice_dia + dia_extra], _HORAS[minuto], f"{rng.getrandbits(64):016x}", 1))
+            escritor_ponto.writerows(linhas)
+            total_registros += len(linhas)
+
+    return ResumoSintetico(diretorio, colaboradores, len(dias) - 1, total_registros, total_justificativas, len(feriados_municipais))
@@ -0,0 +1,14 @@
+import pandas as pd
+import pytest
+
+from ponto.dados import ARQ_COLAB, DataManager
+
+COLABORADORES = [("ANA DA SILVA", "PEDREIRO"), ("JOSE DOS SANTOS", "SERVENTE")]
+
+@pytest.fixture
+def data_manager(tmp_path) -> DataManager:
+    """
+    DataManager sobre um diretório temporário com dois colaboradores e nenhum registro.
+    """
+    pd.DataFrame(COLABORADORES, columns=["Nome", "Funcao"]).to_csv(tmp_path / ARQ_COLAB, index=False)
+    return DataManager.no_diretorio(str(tmp_path))
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from ponto.afd import importar_afd, interpretar_linha
+from ponto.dados import COLUNA_PIS_CPF
+
+PIS_ANA = "012345678901"
+CPF_JOSE = "000987654321"
+
+def _marcacao_1510(nsr: int, data: str, hora: str, pis: str = PIS_ANA) -> str:
+    # data DDMMAAAA, hora HHMM
+    return f"{nsr:09d}3{data}{hora}{pis}"
+
+def _marcacao_671(nsr: int, data: str, hora: str, cpf: str = CPF_JOSE, tipo: str = "7") -> str:
+    # data AAAA-MM-DD, hora hh:mm; o CRC e os demais campos do fim da linha são ignorados
+    return f"{nsr:09d}{tipo}{data}T{hora}:00-0300{cpf}0000"
+
+@pytest.fixture
+def data_manager_afd(data_manager):
+    df = data_manager.carregar_colaboradores()
+    df[COLUNA_PIS_CPF] = [PIS_ANA, CPF_JOSE]
+    data_manager.salvar_colaboradores(df)
+    return data_manager
+
+def test_interpreta_os_layouts_1510_e_671():
+    assert interpretar_linha(_marcacao_1510(1, "10032025", "0702") + "\r\n") == ("12345678901", pd.Timestamp("2025-03-10 07:02").to_pydatetime())
+    assert interpretar_linha(_marcacao_671(2, "2025-03-10", "07:05")) == ("987654321", pd.Timestamp("2025-03-10 07:05").to_pydatetime())
+    assert interpretar_linha(_marcacao_671(3, "2025-03-10", "07:05", tipo="3")) == ("987654321", pd.Timestamp("2025-03-10 07:05").to_pydatetime())
+    # Cabeçalho, registros de outros tipos e linhas curtas não são marcações
+    assert interpretar_linha("0000000001" + "1" * 40) is None
+    assert interpretar_linha(f"{4:09d}4" + "0" * 30) is None
+    assert interpretar_linha("999999999") is None
+
+def test_linhas_invalidas_sao_contadas_e_puladas(data_manager_afd):
+    linhas = [
+        "000000000112345678901234567890123456789", # cabeçalho (tipo 1)
+        _marcacao_1510(2, "10032025", "0700"),
+        _marcacao_1510(3, "32032025", "1200"), # dia inválido
+        _marcacao_1510(4, "10032025", "1700", pis="000000000000"), # sem PIS
+        _marcacao_1510(5, "10032025", "1700"),
+    ]
+    resultado = importar_afd(linhas, data_manager_afd)
+
+    assert (resultado.linhas_lidas, resultado.marcacoes, resultado.invalidas, resultado.importadas) == (5, 2, 2, 2)
+    df = data_manager_afd.carregar_pontos()
+    assert df[["Ação", "Hora"]].values.tolist() == [["Entrada", "07:00"], ["Saída", "17:00"]]
+
+def test_importar_o_mesmo_arquivo_duas_vezes_nao_duplica(data_manager_afd):
+    linhas = [
+        _marcacao_1510(1, "10032025", "0700"),
+        _marcacao_671(2, "2025-03-10", "07:01"),
+        _marcacao_1510(3, "10032025", "1200"),
+        _marcacao_1510(4, "10032025", "1200"), # repetida no próprio arquivo
+        _marcacao_1510(5, "10032025", "1300"),
+        _marcacao_671(6, "2025-03-10", "17:00"),
+        _marcacao_1510(7, "10032025", "1700"),
+        _marcacao_1510(8, "999", "0"), # curta: ignorada
+    ]
+    primeira = importar_afd(linhas, data_manager_afd, tamanho_lote=2)
+    assert primeira.importadas == 6 and primeira.repetidas == 1 and primeira.lotes == 3
+    acoes = data_manager_afd.carregar_pontos().groupby("Nome")["Ação"].apply(list).to_dict()
+    assert acoes == {"ANA DA SILVA": ["Entrada", "Pausa", "Retorno", "Saída"], "JOSE DOS SANTOS": ["Entrada", "Saída"]}
+
+    segunda = importar_afd(linhas, data_manager_afd)
+    assert segunda.importadas == 0 and segunda.repetidas == 7
+    assert len(data_manager_afd.carregar_pontos()) == 6
+
+def test_simular_nao_grava(data_manager_afd):
+    resultado = importar_afd([_marcacao_1510(1, "10032025", "0700")], data_manager_afd, simular=True)
+    assert resultado.importadas == 1 and data_manager_afd.carregar_pontos().empty
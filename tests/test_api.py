@@ -0,0 +1,65 @@
+import pandas as pd
+from ponto import api
+from ponto.api import ConfirmadorEmGrupo, caminho_recibos, id_ponto_api
+from ponto.dados import COLUNA_ID_PONTO, DataManager
+
+def _ponto(id_cliente: str, hora: str = "07:00") -> dict:
+    return {"id": id_cliente, "nome": "ANA DA SILVA", "acao": "Entrada", "data": "2025-03-10", "hora": hora}
+
+def test_reenvio_do_mesmo_id_devolve_o_recibo_gravado(data_manager):
+    confirmador = ConfirmadorEmGrupo(data_manager, caminho_recibos(data_manager), iniciar=False)
+    primeiro = confirmador.confirmar([_ponto("tablet1-1")])
+    assert primeiro == [{"id": "tablet1-1", "status": "aceito", "motivo": None}]
+
+    # O mesmo id seria rejeitado como repetido se fosse validado de novo
+    assert confirmador.confirmar([_ponto("tablet1-1")]) == primeiro
+    assert len(data_manager.carregar_pontos()) == 1
+
+def test_recibos_sobrevivem_a_um_novo_confirmador(data_manager):
+    arquivo = caminho_recibos(data_manager)
+    ConfirmadorEmGrupo(data_manager, arquivo, iniciar=False).confirmar([_ponto("tablet1-1"), _ponto("tablet1-2", "07:00")])
+
+    # Depois de reiniciar a API, os reenvios recebem os recibos gravados em disco
+    recibos = ConfirmadorEmGrupo(data_manager, arquivo, iniciar=False).confirmar([_ponto("tablet1-2"), _ponto("tablet1-1")])
+    assert [(r["id"], r["status"]) for r in recibos] == [("tablet1-2", "rejeitado"), ("tablet1-1", "aceito")]
+    assert recibos[0]["motivo"]
+    assert len(data_manager.carregar_pontos()) == 1
+
+def test_id_repetido_no_mesmo_envio_grava_uma_vez(data_manager):
+    confirmador = ConfirmadorEmGrupo(data_manager, caminho_recibos(data_manager), iniciar=False)
+    recibos = confirmador.confirmar([_ponto("tablet1-1"), _ponto("tablet1-1")])
+    assert recibos[0] == recibos[1]
+    assert len(data_manager.carregar_pontos()) == 1
+
+def test_reenvio_de_aceito_e_reconhecido_pelo_arquivo_de_pontos(data_manager, tmp_path):
+    ConfirmadorEmGrupo(data_manager, caminho_recibos(data_manager), iniciar=False).confirmar([_ponto("tablet1-1")])
+
+    # Outro processo, sem os recibos do primeiro, reconhece o registro já gravado
+    outro = ConfirmadorEmGrupo(DataManager.no_diretorio(str(tmp_path)), str(tmp_path / "outros_recibos.csv"), iniciar=False)
+    assert outro.confirmar([_ponto("tablet1-1"), _ponto("tablet1-2", "12:00")]) == [
+        {"id": "tablet1-1", "status": "aceito", "motivo": None},
+        {"id": "tablet1-2", "status": "aceito", "motivo": None},
+    ]
+    df = data_manager.carregar_pontos()
+    assert sorted(df[COLUNA_ID_PONTO]) == sorted([id_ponto_api("tablet1-1"), id_ponto_api("tablet1-2")])
+
+def test_recibos_gravados_por_outro_processo_sao_relidos(data_manager):
+    arquivo = caminho_recibos(data_manager)
+    primeiro = ConfirmadorEmGrupo(data_manager, arquivo, iniciar=False)
+    segundo = ConfirmadorEmGrupo(data_manager, arquivo, iniciar=False)
+    rejeitado = primeiro.confirmar([{**_ponto("tablet1-1"), "nome": "MARIA SOUZA"}])
+    assert rejeitado[0]["status"] == "rejeitado"
+
+    # Mesmo com a colaboradora cadastrada depois, o reenvio ao outro processo recebe o recibo original
+    data_manager.salvar_colaboradores(pd.concat([data_manager.carregar_colaboradores(), pd.DataFrame([{"Nome": "MARIA SOUZA", "Funcao": "SERVENTE"}])]))
+    assert segundo.confirmar([{**_ponto("tablet1-1"), "nome": "MARIA SOUZA"}]) == rejeitado
+    assert data_manager.carregar_pontos().empty
+
+def test_arquivo_de_recibos_mantem_so_os_mais_recentes(data_manager, monkeypatch):
+    monkeypatch.setattr(api, "TAMANHO_MAXIMO_RECIBOS", 3)
+    arquivo = caminho_recibos(data_manager)
+    confirmador = ConfirmadorEmGrupo(data_manager, arquivo, iniciar=False)
+    for n in range(5):
+        confirmador.confirmar([{**_ponto(f"tablet1-{n}"), "acao": "Almoço"}])
+
+    assert list(pd.read_csv(arquivo)["id"]) == ["tablet1-2", "tablet1-3", "tablet1-4"]
@@ -0,0 +1,66 @@
+import itertools
+import threading
+
+import pandas as pd
+from ponto import cache_compartilhado
+from ponto.cache_compartilhado import CacheCompartilhado, chave_cache
+
+def _relogio(monkeypatch):
+    # usado_em crescente a cada operação, para a ordem LRU não depender da resolução do relógio
+    contador = itertools.count()
+    monkeypatch.setattr(cache_compartilhado.time, "time", lambda: float(next(contador)))
+
+def test_limite_de_bytes_remove_as_menos_usadas(tmp_path, monkeypatch):
+    _relogio(monkeypatch)
+    cache = CacheCompartilhado(str(tmp_path / "cache.sqlite3"), limite_bytes=10000)
+    for n in range(10):
+        cache.guardar(f"c{n}", b"x" * 900)
+    assert cache.obter("c0")[0] # c0 passa a ser a mais recente
+    cache.guardar("c10", b"x" * 900)
+
+    assert cache.tamanho_total() <= 10000 * cache_compartilhado.FRACAO_APOS_REMOCAO
+    presentes = [n for n in range(11) if cache.obter(f"c{n}")[0]]
+    assert 0 in presentes and 10 in presentes
+    assert presentes == [0] + list(range(11 - len(presentes) + 1, 11))
+
+    # Um valor maior que a margem de remoção não é guardado nem expulsa os outros
+    cache.guardar("grande", b"x" * 2000)
+    assert cache.obter("grande") == (False, None) and cache.obter("c10")[0]
+
+def test_processos_e_threads_compartilham_as_entradas(tmp_path):
+    caminho = str(tmp_path / "cache.sqlite3")
+    primeiro, segundo = CacheCompartilhado(caminho), CacheCompartilhado(caminho)
+    calculos = []
+
+    def calcular():
+        calculos.append(1)
+        return pd.DataFrame({"Nome": ["ANA DA SILVA"], "Horas": [8]})
+
+    primeiro.memorizar("horas", 1, ("2025-03",), calcular)
+    resultados = []
+    trabalho = threading.Thread(target=lambda: resultados.append(segundo.memorizar("horas", 1, ("2025-03",), calcular)))
+    trabalho.start()
+    trabalho.join()
+
+    assert len(calculos) == 1 and segundo.acertos == 1
+    pd.testing.assert_frame_equal(resultados[0], calcular())
+
+def test_nova_versao_dos_dados_nao_usa_o_resultado_antigo(tmp_path):
+    cache = CacheCompartilhado(str(tmp_path / "cache.sqlite3"))
+    df = pd.DataFrame({"Nome": ["ANA DA SILVA"], "Hora": ["07:00"]})
+
+    assert cache.memorizar("horas", (1, 100), (df,), lambda: "antigo") == "antigo"
+    assert cache.memorizar("horas", (1, 100), (df.copy(),), lambda: "novo") == "antigo"
+    assert cache.memorizar("horas", (2, 120), (df,), lambda: "novo") == "novo"
+    # Argumentos com outro conteúdo também são outra entrada
+    assert cache.memorizar("horas", (2, 120), (df.assign(Hora="08:00"),), lambda: "outro") == "outro"
+    assert chave_cache("horas", (1, 100), (df,)) != chave_cache("horas", (2, 120), (df,))
+
+def test_entrada_ilegivel_e_descartada_e_recalculada(tmp_path):
+    cache = CacheCompartilhado(str(tmp_path / "cache.sqlite3"))
+    chave = chave_cache("horas", 1, ())
+    with cache._conexao() as conexao:
+        conexao.execute("INSERT INTO entradas VALUES (?, ?, ?, ?)", (chave, b"lixo", 4, 0.0))
+
+    assert cache.memorizar("horas", 1, (), lambda: 42) == 42
+    assert cache.obter(chave) == (True, 42)
@@ -0,0 +1,41 @@
+from ponto.cache_lru import CacheLRU
+
+def _tamanho_fixo(valor) -> int:
+    return len(valor)
+
+def test_limite_de_entradas_remove_a_usada_ha_mais_tempo():
+    cache = CacheLRU(max_entradas=3, max_bytes=1000, medir=_tamanho_fixo)
+    for chave in "abc":
+        cache.guardar(chave, "x")
+    assert cache.obter("a") == (True, "x") # "a" passa a ser a mais recente
+    cache.guardar("d", "x")
+
+    assert len(cache) == 3
+    assert cache.obter("b") == (False, None)
+    assert all(cache.obter(chave)[0] for chave in "acd")
+
+def test_limite_de_bytes():
+    cache = CacheLRU(max_entradas=100, max_bytes=10, medir=_tamanho_fixo)
+    cache.guardar("a", "xxxx")
+    cache.guardar("b", "xxxx")
+    cache.guardar("c", "xxxx")
+
+    assert cache.bytes_usados <= 10
+    assert [chave for chave in "abc" if cache.obter(chave)[0]] == ["b", "c"]
+    # Um valor maior que o limite não é guardado nem remove os outros
+    cache.guardar("d", "x" * 11)
+    assert cache.obter("d") == (False, None) and len(cache) == 2
+
+def test_substituir_entrada_atualiza_os_bytes_e_memorizar_conta_acertos():
+    cache = CacheLRU(max_entradas=10, max_bytes=100, medir=_tamanho_fixo)
+    cache.guardar("a", "xxxx")
+    cache.guardar("a", "xx")
+    assert cache.bytes_usados == 2
+
+    calculos = []
+    for _ in range(3):
+        cache.memorizar("b", lambda: calculos.append(1) or "yyy")
+    assert len(calculos) == 1 and cache.acertos == 2 and cache.falhas == 1
+
+    cache.limpar()
+    assert len(cache) == 0 and cache.bytes_usados == 0
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from ponto.dados import COLUNA_ID_PONTO, COLUNA_VERSAO_PONTO, ConflitoVersao
+
+def _ponto_gravado(data_manager) -> pd.Series:
+    data_manager.anexar_pontos(pd.DataFrame([{"Nome": "ANA DA SILVA", "Ação": "Entrada", "Data": "2025-03-10", "Hora": "07:00"}]))
+    return data_manager.carregar_pontos().iloc[0]
+
+def test_atualizar_com_versao_antiga_levanta_conflito(data_manager):
+    ponto = _ponto_gravado(data_manager)
+    id_ponto, versao = ponto[COLUNA_ID_PONTO], int(ponto[COLUNA_VERSAO_PONTO])
+
+    assert data_manager.atualizar_ponto(id_ponto, versao, {"Hora": "07:05"}) == versao + 1
+    with pytest.raises(ConflitoVersao):
+        data_manager.atualizar_ponto(id_ponto, versao, {"Hora": "07:10"})
+    assert data_manager.carregar_pontos().iloc[0]["Hora"] == "07:05"
+
+def test_excluir_com_versao_antiga_ou_registro_excluido_levanta_conflito(data_manager):
+    ponto = _ponto_gravado(data_manager)
+    id_ponto, versao = ponto[COLUNA_ID_PONTO], int(ponto[COLUNA_VERSAO_PONTO])
+    data_manager.atualizar_ponto(id_ponto, versao, {"Hora": "07:05"})
+
+    with pytest.raises(ConflitoVersao):
+        data_manager.excluir_ponto(id_ponto, versao)
+    data_manager.excluir_ponto(id_ponto, versao + 1)
+    with pytest.raises(ConflitoVersao):
+        data_manager.atualizar_ponto(id_ponto, versao + 1, {"Hora": "07:10"})
+    assert data_manager.carregar_pontos().empty
+
+def test_ids_de_arquivo_antigo_sao_estaveis_entre_leituras(data_manager):
+    pd.DataFrame([
+        {"Nome": "ANA DA SILVA", "Ação": "Entrada", "Data": "2025-03-10", "Hora": "07:00"},
+        {"Nome": "ANA DA SILVA", "Ação": "Entrada", "Data": "2025-03-10", "Hora": "07:00"},
+    ]).to_csv(data_manager.arq_ponto, index=False)
+
+    ids = data_manager.carregar_pontos()[COLUNA_ID_PONTO].tolist()
+    assert len(set(ids)) == 2 and data_manager.carregar_pontos()[COLUNA_ID_PONTO].tolist() == ids
+    assert data_manager.migrar_pontos() and not data_manager.migrar_pontos()
+    assert data_manager.carregar_pontos()[COLUNA_ID_PONTO].tolist() == ids
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pandas as pd
+from ponto.dados import COLUNA_ID_PONTO, COLUNAS_PONTO, DataManager
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _registro(nome: str, minuto: int) -> dict:
+    return {"Nome": nome, "Ação": "Entrada", "Data": "2025-03-10", "Hora": f"{minuto // 60:02d}:{minuto % 60:02d}"}
+
+def test_alterar_e_anexar_simultaneos_nao_perdem_registros(data_manager, tmp_path):
+    # Duas "sessões" (DataManagers diferentes sobre os mesmos arquivos) gravando ao mesmo tempo
+    outra_sessao = DataManager.no_diretorio(str(tmp_path))
+    threads, por_thread = 8, 10
+
+    def anexar(indice: int):
+        for n in range(por_thread):
+            data_manager.anexar_pontos(pd.DataFrame([_registro("ANA DA SILVA", indice * por_thread + n)], columns=COLUNAS_PONTO))
+
+    def alterar(indice: int):
+        for n in range(por_thread):
+            novo = pd.DataFrame([_registro("JOSE DOS SANTOS", indice * por_thread + n)])
+            outra_sessao.alterar(outra_sessao.arq_ponto, lambda df: (pd.concat([df, novo], ignore_index=True), None))
+
+    trabalhos = [threading.Thread(target=anexar if i % 2 else alterar, args=(i,)) for i in range(threads)]
+    for trabalho in trabalhos:
+        trabalho.start()
+    for trabalho in trabalhos:
+        trabalho.join()
+
+    df = data_manager.carregar_pontos()
+    assert len(df) == threads * por_thread
+    assert df[COLUNA_ID_PONTO].notna().all() and df[COLUNA_ID_PONTO].is_unique
+    assert (df.groupby("Nome").size() == threads // 2 * por_thread).all()
+
+def test_anexar_pontos_validados_verifica_repeticao_contra_o_arquivo_atual(data_manager):
+    from ponto.importacao import importar_pontos
+
+    planilha = pd.DataFrame([_registro("ANA DA SILVA", 7 * 60)])
+    resultados = []
+    trabalhos = [threading.Thread(target=lambda: resultados.append(importar_pontos(planilha, data_manager))) for _ in range(4)]
+    for trabalho in trabalhos:
+        trabalho.start()
+    for trabalho in trabalhos:
+        trabalho.join()
+
+    assert sorted(resultado.gravados for resultado in resultados) == [0, 0, 0, 1]
+    assert len(data_manager.carregar_pontos()) == 1
+
+class _DataManagerComCache(DataManager):
+    """
+    Como o DataManagerStreamlit: carregar_pontos guarda a leitura pela versão que um
+    observador informou, que pode estar atrasada em relação ao disco.
+    """
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.versao_observada = None
+        self._cache = None
+
+    def carregar_pontos(self) -> pd.DataFrame:
+        if self._cache is None or self._cache[0] != self.versao_observada:
+            self._cache = (self.versao_observada, super().carregar_pontos())
+        return self._cache[1]
+
+def test_escritor_le_o_disco_e_nao_o_cache_da_subclasse(data_manager, tmp_path):
+    interface = _DataManagerComCache.no_diretorio(str(tmp_path))
+    interface.anexar_pontos(pd.DataFrame([_registro("ANA DA SILVA", 7 * 60)]))
+    assert len(interface.carregar_pontos()) == 1 # cache preenchido; o observador ainda não viu nada novo
+
+    # Outro processo (API, linha de comando) grava pelo seu próprio escritor
+    codigo = (
+        "import sys, pandas as pd; from ponto.dados import DataManager; "
+        "DataManager.no_diretorio(sys.argv[1]).anexar_pontos(pd.DataFrame([sys.argv[2:]], columns=['Nome', 'Ação', 'Data', 'Hora']))"
+    )
+    outro = _registro("JOSE DOS SANTOS", 8 * 60)
+    subprocess.run([sys.executable, "-c", codigo, str(tmp_path), *outro.values()], check=True, cwd=RAIZ)
+
+    interface.anexar_pontos(pd.DataFrame([_registro("ANA DA SILVA", 12 * 60)]))
+    df = DataManager.no_diretorio(str(tmp_path)).carregar_pontos()
+    assert sorted(df["Hora"]) == ["07:00", "08:00", "12:00"]
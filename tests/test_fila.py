@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from ponto.fila import FilaOffline, enviador_local
+
+MOMENTO = datetime(2025, 3, 10, 12, 0)
+
+def _aceitar_todos(enviados: list):
+    def enviar(registros):
+        enviados.extend(registros)
+        return [{"id": r["id"], "status": "aceito", "motivo": None} for r in registros]
+    return enviar
+
+def test_registros_do_mesmo_minuto_sao_enviados_na_ordem_de_captura(tmp_path):
+    fila = FilaOffline(str(tmp_path / "fila.sqlite3"), "tablet1")
+    capturados = []
+    for nome in ("JOSE DOS SANTOS", "ANA DA SILVA") * 20:
+        capturados.append(fila.registrar(nome, "Pausa", MOMENTO))
+        capturados.append(fila.registrar(nome, "Retorno", MOMENTO))
+    fila.registrar("ANA DA SILVA", "Entrada", datetime(2025, 3, 10, 7, 0))
+
+    enviados = []
+    resultado = fila.sincronizar(_aceitar_todos(enviados), tamanho_lote=7)
+    assert enviados[0]["acao"] == "Entrada"
+    assert [r["id"] for r in enviados[1:]] == capturados
+    assert resultado.aceitos == len(capturados) + 1 and resultado.pendentes == 0
+
+def test_falha_no_envio_mantem_o_lote_e_os_seguintes_pendentes(tmp_path):
+    fila = FilaOffline(str(tmp_path / "fila.sqlite3"), "tablet1")
+    for minuto in range(6):
+        fila.registrar("ANA DA SILVA", "Entrada", MOMENTO.replace(minute=minuto))
+    lotes = []
+
+    def enviar(registros):
+        lotes.append(registros)
+        if len(lotes) == 2:
+            raise ValueError("resposta inválida")
+        return _aceitar_todos([])(registros)
+
+    resultado = fila.sincronizar(enviar, tamanho_lote=2)
+    assert resultado.erro == "resposta inválida"
+    assert len(lotes) == 2 and resultado.aceitos == 2 and resultado.pendentes == 4
+    assert [r["hora"] for r in fila.pendentes()] == ["12:02", "12:03", "12:04", "12:05"]
+
+def test_sincronizacao_local_grava_e_registra_conflitos(data_manager, tmp_path):
+    fila = FilaOffline(str(tmp_path / "fila.sqlite3"), "tablet1")
+    fila.registrar("ANA DA SILVA", "Entrada", MOMENTO)
+    fila.registrar("ANA DA SILVA", "Entrada", MOMENTO) # repetido: menos de um minuto do anterior
+
+    resultado = fila.sincronizar(enviador_local(data_manager))
+    assert resultado.aceitos == 1 and len(resultado.conflitos) == 1 and resultado.pendentes == 0
+    assert len(data_manager.carregar_pontos()) == 1
+    # Sincronizar de novo não reenvia nada
+    assert fila.sincronizar(enviador_local(data_manager)).enviados == 0
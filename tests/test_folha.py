@@ -0,0 +1,59 @@
+import csv
+from datetime import date, timedelta
+
+import pandas as pd
+from ponto.dados import COLUNAS_PONTO
+from ponto.folha import CABECALHO_CSV, LAYOUT_LARGURA_FIXA, LinhaFolha, gravar_folha, linhas_folha
+
+LARGURA_LINHA = sum(largura for _, largura, _ in LAYOUT_LARGURA_FIXA)
+
+def _linha(nome: str, pis_cpf: str, horas: int = 176) -> LinhaFolha:
+    return LinhaFolha(
+        nome=nome, funcao="PEDREIRO", pis_cpf=pis_cpf, horas_trabalhadas=timedelta(hours=horas),
+        he_50=timedelta(hours=2, minutes=30), he_100=timedelta(minutes=45), faltas=1, ausencias_justificadas=2,
+    )
+
+def test_csv_tem_cabecalho_e_valores_por_colaborador(tmp_path):
+    caminho = tmp_path / "folha.csv"
+    resultado = gravar_folha([_linha("ANA DA SILVA", "012345678901"), _linha("JOSE DOS SANTOS", "")], str(caminho), "csv", "202503")
+
+    assert resultado.gravadas == 2 and not resultado.rejeitadas
+    with open(caminho, newline="", encoding="utf-8") as arquivo:
+        linhas = list(csv.reader(arquivo))
+    assert linhas[0] == CABECALHO_CSV
+    assert linhas[1] == ["ANA DA SILVA", "PEDREIRO", "012345678901", "176:00", "02:30", "00:45", "10560", "150", "45", "1", "2"]
+    assert linhas[2][0] == "JOSE DOS SANTOS" and len(linhas) == 3
+
+def test_largura_fixa_normaliza_pis_com_zero_a_esquerda(tmp_path):
+    caminho = tmp_path / "folha.txt"
+    resultado = gravar_folha([_linha("ANA DA SILVA", "012345678901"), _linha("JOSE DOS SANTOS", "123.456.789-09")], str(caminho), "fixo", "202503")
+
+    assert resultado.gravadas == 2 and not resultado.rejeitadas
+    linhas = caminho.read_text(encoding="latin-1").splitlines()
+    assert all(len(linha) == LARGURA_LINHA for linha in linhas)
+    assert linhas[0][:17] == "202503" + "12345678901"
+    assert linhas[0][17:57] == "ANA DA SILVA".ljust(40)
+    assert linhas[0][57:] == "010560" + "00150" + "00045" + "001" + "002"
+    assert linhas[1][6:17] == "12345678909"
+
+def test_largura_fixa_rejeita_so_a_linha_que_nao_cabe(tmp_path):
+    caminho = tmp_path / "folha.txt"
+    linhas = [_linha("ANA DA SILVA", "1234567890123"), _linha("JOSE DOS SANTOS", "12345678909"), _linha("MARIA SOUZA", "1", horas=20000)]
+    resultado = gravar_folha(linhas, str(caminho), "fixo", "202503")
+
+    assert resultado.gravadas == 1
+    assert [nome for nome, _ in resultado.rejeitadas] == ["ANA DA SILVA", "MARIA SOUZA"]
+    assert "pis_cpf" in resultado.rejeitadas[0][1] and "minutos_trabalhados" in resultado.rejeitadas[1][1]
+    gravadas = caminho.read_text(encoding="latin-1").splitlines()
+    assert len(gravadas) == 1 and gravadas[0][17:57].rstrip() == "JOSE DOS SANTOS"
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_linhas_folha_a_partir_dos_arquivos(data_manager, tmp_path):
+    registros = [("ANA DA SILVA", "Entrada", "2025-03-10", "07:00"), ("ANA DA SILVA", "Saída", "2025-03-10", "16:00")]
+    data_manager.anexar_pontos(pd.DataFrame(registros, columns=COLUNAS_PONTO))
+
+    linhas = list(linhas_folha(data_manager.carregar_tudo(), date(2025, 3, 10), date(2025, 3, 10)))
+
+    assert [linha.nome for linha in linhas] == ["ANA DA SILVA", "JOSE DOS SANTOS"]
+    assert linhas[0].horas_trabalhadas == timedelta(hours=9) and linhas[0].faltas == 0
+    assert linhas[1].horas_trabalhadas == timedelta() and linhas[1].faltas == 1
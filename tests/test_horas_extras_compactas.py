@@ -0,0 +1,41 @@
+import pickle
+from datetime import date, timedelta
+
+import pandas as pd
+from ponto.calculos import HorasExtrasCompactas, calcular_horas_extras, resultado_horas_extras_vazio
+from ponto.calendario import CalendarioFeriados
+from ponto.dados import COLUNAS_PONTO
+
+# Semana de 17 a 23/03/2025, com feriado na quarta (19/03)
+SEMANA = [
+    ("2025-03-17", "Entrada", "06:30"), ("2025-03-17", "Pausa", "12:00"), ("2025-03-17", "Retorno", "13:00"), ("2025-03-17", "Saída", "18:15"),
+    ("2025-03-18", "Entrada", "22:00"), ("2025-03-19", "Saída", "02:00"),
+    ("2025-03-19", "Entrada", "07:00"), ("2025-03-19", "Saída", "11:00"),
+    ("2025-03-20", "Entrada", "07:00"), ("2025-03-20", "Saída", "17:00"),
+    ("2025-03-21", "Entrada", "07:00"), ("2025-03-21", "Saída", "17:30"),
+    ("2025-03-22", "Entrada", "06:00"), ("2025-03-22", "Saída", "12:00"),
+    ("2025-03-23", "Entrada", "08:00"), ("2025-03-23", "Saída", "12:00"),
+]
+CALENDARIO = CalendarioFeriados(feriados_personalizados={date(2025, 3, 19)})
+
+def _semana() -> pd.DataFrame:
+    return pd.DataFrame([("ANA DA SILVA", acao, data, hora) for data, acao, hora in SEMANA], columns=COLUNAS_PONTO)
+
+def test_expandir_devolve_o_resultado_original_de_uma_semana():
+    resultado = calcular_horas_extras(_semana(), CALENDARIO)
+    compacto = HorasExtrasCompactas.de_resultado(resultado)
+
+    assert compacto.expandir() == resultado
+    # Sábado (todo 50%), domingo e feriado (100%) e o turno que atravessa a meia-noite para o feriado
+    assert set(resultado["50%"]["datas"]) == {date(2025, 3, 17), date(2025, 3, 18), date(2025, 3, 21), date(2025, 3, 22)}
+    assert set(resultado["100%"]["datas"]) == {date(2025, 3, 19), date(2025, 3, 23)}
+    # O turno de terça conta até o último instante do dia (23:59:59.999999)
+    assert compacto.total("50%") == resultado["50%"]["total"] == timedelta(hours=11, minutes=15, microseconds=-1)
+    assert compacto.total("100%") == resultado["100%"]["total"] == timedelta(hours=10)
+
+def test_resultado_vazio_e_copia_por_pickle():
+    assert HorasExtrasCompactas.de_resultado(resultado_horas_extras_vazio()).expandir() == resultado_horas_extras_vazio()
+
+    resultado = calcular_horas_extras(_semana(), CALENDARIO)
+    compacto = HorasExtrasCompactas.de_resultado(resultado)
+    assert pickle.loads(pickle.dumps(compacto)).expandir() == resultado
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from ponto.importacao import _marcar_repetidos, importar_pontos, validar_pontos
+
+COLAB = pd.DataFrame({"Nome": ["ANA DA SILVA", "JOSE DOS SANTOS"], "Funcao": ["PEDREIRO", "SERVENTE"]})
+SEM_PONTOS = pd.DataFrame(columns=["Nome", "Ação", "Data", "Hora"])
+
+def _planilha(*linhas) -> pd.DataFrame:
+    return pd.DataFrame(linhas, columns=["Nome", "Ação", "Data", "Hora"])
+
+@pytest.mark.parametrize("segundos, repetido", [(0, True), (59, True), (60, False)])
+def test_tolerancia_de_repeticao_contra_existentes_e_no_lote(segundos, repetido):
+    base = pd.Timestamp("2025-03-10 07:00:00")
+    existentes = _planilha(("ANA DA SILVA", "Entrada", "2025-03-10", "07:00"))
+    novo = pd.DataFrame({"Nome": ["ANA DA SILVA"], "DataHora": [base + pd.Timedelta(seconds=segundos)]})
+    assert _marcar_repetidos(novo, existentes).tolist() == [repetido]
+
+    lote = pd.DataFrame({"Nome": ["ANA DA SILVA"] * 2, "DataHora": [base, base + pd.Timedelta(seconds=segundos)]})
+    assert _marcar_repetidos(lote, SEM_PONTOS).tolist() == [False, repetido]
+
+def test_repeticao_e_por_colaborador():
+    existentes = _planilha(("ANA DA SILVA", "Entrada", "2025-03-10", "07:00"))
+    resultado = validar_pontos(_planilha(
+        ("ANA DA SILVA", "Entrada", "2025-03-10", "07:00"), # mesmo minuto de um existente
+        ("ANA DA SILVA", "Pausa", "2025-03-10", "07:01"), # um minuto depois: aceito
+        ("JOSE DOS SANTOS", "Entrada", "2025-03-10", "07:00"), # outro colaborador: aceito
+        ("JOSE DOS SANTOS", "Entrada", "10/03/2025", "07:00"), # repetido dentro da planilha
+    ), COLAB, existentes)
+
+    assert resultado.validos[["Nome", "Hora"]].values.tolist() == [["ANA DA SILVA", "07:01"], ["JOSE DOS SANTOS", "07:00"]]
+    assert resultado.rejeitados["Linha"].tolist() == [2, 5]
+    assert resultado.rejeitados["Motivo"].str.startswith("Registro repetido").all()
+
+def test_linhas_invalidas_sao_relatadas_com_linha_e_motivo():
+    entrada = _planilha(
+        ("", "Entrada", "2025-03-10", "07:00"),
+        ("FULANO", "Entrada", "2025-03-10", "07:00"),
+        ("ANA DA SILVA", "Chegada", "2025-03-10", "07:00"),
+        ("ANA DA SILVA", "Entrada", "2025-02-30", "07:00"),
+        ("ANA DA SILVA", "Entrada", "2025-03-10", "25:00"),
+        ("ana da silva", "saida", "10/03/2025", "17:00"), # Nome fora do cadastro (maiúsculas importam)
+        ("ANA DA SILVA", "saida", "10/03/2025", "17:00:00"),
+    )
+    resultado = validar_pontos(entrada, COLAB, SEM_PONTOS)
+
+    assert len(resultado.validos) + len(resultado.rejeitados) == len(entrada)
+    assert resultado.rejeitados[["Linha", "Motivo"]].values.tolist() == [
+        [2, "Nome vazio"], [3, "Colaborador não cadastrado"], [4, "Ação inválida"],
+        [5, "Data inválida"], [6, "Hora inválida"], [7, "Colaborador não cadastrado"],
+    ]
+    # As linhas rejeitadas saem como vieram na planilha; as válidas, normalizadas
+    assert resultado.rejeitados.loc[0, "Nome"] == "" and resultado.rejeitados.loc[2, "Ação"] == "Chegada"
+    assert resultado.validos.values.tolist() == [["ANA DA SILVA", "Saída", "2025-03-10", "17:00"]]
+
+def test_colunas_ausentes():
+    with pytest.raises(ValueError, match="Hora"):
+        validar_pontos(pd.DataFrame({"Nome": [], "Ação": [], "Data": []}), COLAB, SEM_PONTOS)
+
+def test_importar_grava_so_os_validos_e_simular_nao_grava(data_manager):
+    planilha = _planilha(("ANA DA SILVA", "Entrada", "2025-03-10", "07:00"), ("FULANO", "Entrada", "2025-03-10", "07:00"))
+    simulado = importar_pontos(planilha, data_manager, simular=True)
+    assert (len(simulado.validos), simulado.gravados) == (1, 0) and data_manager.carregar_pontos().empty
+
+    resultado = importar_pontos(planilha, data_manager)
+    assert resultado.gravados == 1 and len(resultado.rejeitados) == 1
+    assert importar_pontos(planilha, data_manager).gravados == 0 # reimportar não duplica
+    assert len(data_manager.carregar_pontos()) == 1
@@ -0,0 +1,79 @@
+import os
+import pickle
+
+import pandas as pd
+from ponto.dados import COLUNAS_JUSTIFICATIVAS, COLUNAS_PONTO, DataManager
+
+REGISTROS = [
+    ("ANA DA SILVA", "Entrada", "2025-03-10", "07:00"), ("ANA DA SILVA", "Saída", "2025-03-10", "17:00"),
+    ("JOSE DOS SANTOS", "Entrada", "2025-03-11", "07:05"),
+]
+JUSTIFICATIVAS = [
+    ("ANA DA SILVA", "2025-03-11", "Atestado"),
+    ("ANA DA SILVA", "2025-03-11", "Folga"), # repetida: vale a primeira
+    ("JOSE DOS SANTOS", "2025-03-10", "Não Apto"),
+    ("JOSE DOS SANTOS", "2025-03-14", "Folga"),
+]
+
+def _com_dados(data_manager: DataManager) -> DataManager:
+    data_manager.anexar_pontos(pd.DataFrame(REGISTROS, columns=COLUNAS_PONTO))
+    data_manager.salvar_justificativas(pd.DataFrame(JUSTIFICATIVAS, columns=COLUNAS_JUSTIFICATIVAS))
+    data_manager.salvar_feriados(pd.DataFrame({"Data": ["2025-03-19"], "Descricao": ["São José"]}))
+    return data_manager
+
+def test_instantaneo_igual_aos_leitores_individuais(data_manager):
+    dm = _com_dados(data_manager)
+    dados = dm.carregar_tudo()
+
+    pd.testing.assert_frame_equal(dados.colaboradores, dm.carregar_colaboradores())
+    pd.testing.assert_frame_equal(dados.pontos, dm.carregar_pontos())
+    pd.testing.assert_frame_equal(dados.feriados, dm.carregar_feriados())
+    pd.testing.assert_frame_equal(dados.feriados_ignorados, dm.carregar_feriados_ignorados())
+    pd.testing.assert_frame_equal(dados.justificativas, dm.carregar_justificativas())
+    assert dados.versao == dm.versao_dados()
+    assert dados.carregar_calendario().feriados_personalizados == dm.carregar_calendario().feriados_personalizados
+
+    copia = pickle.loads(pickle.dumps(dados))
+    pd.testing.assert_frame_equal(copia.pontos, dados.pontos)
+
+class _DataManagerGravandoDuranteLeitura(DataManager):
+    # Outra sessão grava um registro enquanto a primeira leitura do instantâneo está em andamento
+    gravou = False
+
+    def carregar_pontos(self) -> pd.DataFrame:
+        df = super().carregar_pontos()
+        if not self.gravou:
+            self.gravou = True
+            DataManager.no_diretorio(os.path.dirname(self.arq_ponto)).anexar_pontos(pd.DataFrame([("JOSE DOS SANTOS", "Saída", "2025-03-11", "17:00")], columns=COLUNAS_PONTO))
+        return df
+
+def test_instantaneo_relido_quando_um_arquivo_muda_durante_a_leitura(data_manager, tmp_path):
+    _com_dados(data_manager)
+    dm = _DataManagerGravandoDuranteLeitura.no_diretorio(str(tmp_path))
+
+    dados = dm.carregar_tudo()
+
+    assert dm.gravou and len(dados.pontos) == len(REGISTROS) + 1
+    assert dados.versao == dm.versao_dados()
+
+def _status_linha_a_linha(df_justificativas: pd.DataFrame, df_faltas: pd.DataFrame) -> list:
+    # Como era antes do índice: a primeira justificativa do colaborador na data, ou "Falta"
+    status = []
+    for nome, data in zip(df_faltas["Nome"], df_faltas["Data"]):
+        encontradas = df_justificativas[(df_justificativas["Nome"] == nome) & (df_justificativas["Data"] == data)]
+        status.append(encontradas["Status"].iloc[0] if not encontradas.empty else "Falta")
+    return status
+
+def test_resolver_status_faltas_igual_a_busca_linha_a_linha(data_manager):
+    dm = _com_dados(data_manager)
+    dados = dm.carregar_tudo()
+    df_faltas = pd.DataFrame(
+        [(nome, f"2025-03-{dia:02d}") for nome in ("ANA DA SILVA", "JOSE DOS SANTOS") for dia in range(10, 15)],
+        columns=["Nome", "Data"],
+    )
+
+    esperado = _status_linha_a_linha(dm.carregar_justificativas(), df_faltas)
+    assert esperado.count("Falta") == 7 and "Atestado" in esperado
+    assert list(dados.resolver_status_faltas(df_faltas)["Status"]) == esperado
+    assert list(dm.resolver_status_faltas(df_faltas)["Status"]) == esperado
+    assert list(dados.resolver_status_faltas(df_faltas)["Nome"]) == list(df_faltas["Nome"])
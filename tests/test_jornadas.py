@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+from ponto import calculos
+from ponto.calculos import calcular_horas_extras
+from ponto.calendario import CalendarioFeriados
+from ponto.dados import COLUNAS_PONTO
+from ponto.jornadas import Escala, registrar_escala, registrar_jornada_padrao, registros_escala, registros_jornada_padrao
+
+SEGUNDA, SEXTA = date(2025, 3, 10), date(2025, 3, 14)
+
+def _extras(df: pd.DataFrame) -> dict:
+    return calcular_horas_extras(df.copy(), CalendarioFeriados())
+
+def test_jornada_padrao_termina_no_fim_do_expediente_e_nao_gera_horas_extras():
+    for dia, saida in ((SEGUNDA, "17:00"), (SEXTA, "16:00")):
+        df = registros_jornada_padrao(["ANA DA SILVA"], dia, "07:00")
+        assert list(df["Hora"]) == ["07:00", "12:00", "13:00", saida]
+        extras = _extras(df)
+        assert extras["50%"]["total"] == timedelta() and extras["100%"]["total"] == timedelta()
+
+def test_expediente_configurado_vale_para_a_jornada_e_para_as_horas_extras(monkeypatch):
+    monkeypatch.setattr(calculos, "HORA_INICIO_EXPEDIENTE", "08:00")
+    monkeypatch.setattr(calculos, "HORA_FIM_EXPEDIENTE", "18:00")
+
+    df = registros_jornada_padrao(["ANA DA SILVA"], SEGUNDA, calculos.HORA_INICIO_EXPEDIENTE)
+    assert list(df["Hora"]) == ["08:00", "12:00", "13:00", "18:00"]
+    assert _extras(df)["50%"]["total"] == timedelta()
+
+    # Com os limites antigos (07:00 às 17:00), 07:30 às 18:30 teria 1h30 de horas extras
+    df.loc[df["Ação"] == "Entrada", "Hora"] = "07:30"
+    df.loc[df["Ação"] == "Saída", "Hora"] = "18:30"
+    assert _extras(df)["50%"]["total"] == timedelta(hours=1)
+
+def test_registro_da_equipe_pula_quem_ja_tem_entrada(data_manager):
+    data_manager.anexar_pontos(pd.DataFrame([("JOSE DOS SANTOS", "Entrada", "2025-03-10", "07:00")], columns=COLUNAS_PONTO))
+
+    resultado = registrar_jornada_padrao(data_manager, ["ANA DA SILVA", "JOSE DOS SANTOS"], SEGUNDA, "07:00")
+
+    assert resultado.gravados == 4
+    assert set(resultado.rejeitados["Nome"]) == {"JOSE DOS SANTOS"} and len(resultado.rejeitados) == 4
+    df = data_manager.carregar_pontos()
+    assert (df["Nome"] == "ANA DA SILVA").sum() == 4 and (df["Nome"] == "JOSE DOS SANTOS").sum() == 1
+
+VIGIA_NOTURNO = Escala("Vigia noturno", "18:00", "06:00", padrao="10")
+
+def test_escala_12x36_atravessa_a_meia_noite():
+    df = registros_escala(VIGIA_NOTURNO, ["ANA DA SILVA"], date(2025, 3, 10), date(2025, 3, 13))
+
+    assert VIGIA_NOTURNO.cruza_meia_noite
+    assert df[["Ação", "Data", "Hora", "Turno"]].values.tolist() == [
+        ["Entrada", "2025-03-10", "18:00", "2025-03-10"], ["Saída", "2025-03-11", "06:00", "2025-03-10"],
+        ["Entrada", "2025-03-12", "18:00", "2025-03-12"], ["Saída", "2025-03-13", "06:00", "2025-03-12"],
+    ]
+
+def test_intervalo_depois_da_meia_noite_pertence_ao_dia_seguinte():
+    escala = Escala("Noturno", "22:00", "06:00", pausa="02:00", retorno="03:00")
+    df = registros_escala(escala, ["ANA DA SILVA", "JOSE DOS SANTOS"], date(2025, 3, 10), date(2025, 3, 10))
+
+    assert len(df) == 8 and (df["Turno"] == "2025-03-10").all()
+    assert df.loc[df["Nome"] == "JOSE DOS SANTOS", ["Data", "Hora"]].values.tolist() == [
+        ["2025-03-10", "22:00"], ["2025-03-11", "02:00"], ["2025-03-11", "03:00"], ["2025-03-11", "06:00"],
+    ]
+
+def test_inicio_do_ciclo_define_os_dias_de_trabalho():
+    df = registros_escala(VIGIA_NOTURNO, ["ANA DA SILVA"], date(2025, 3, 10), date(2025, 3, 13), inicio_ciclo=date(2025, 3, 9))
+    assert sorted(df["Turno"].unique()) == ["2025-03-11", "2025-03-13"]
+
+def test_escala_invalida():
+    with pytest.raises(ValueError, match="pausa e o retorno"):
+        Escala("Sem retorno", "07:00", "17:00", pausa="12:00")
+    with pytest.raises(ValueError, match="padrão inválido"):
+        Escala("Só folga", "07:00", "17:00", padrao="00")
+
+def test_registrar_escala_grava_turnos_inteiros_e_pula_os_ocupados(data_manager):
+    # Um registro da madrugada de 13/03 ocupa o turno iniciado em 12/03
+    data_manager.anexar_pontos(pd.DataFrame([("ANA DA SILVA", "Saída", "2025-03-13", "05:00")], columns=COLUNAS_PONTO))
+
+    resultado = registrar_escala(data_manager, VIGIA_NOTURNO, ["ANA DA SILVA", "JOSE DOS SANTOS"], date(2025, 3, 10), date(2025, 3, 13))
+
+    assert resultado.gravados == 6
+    assert resultado.rejeitados[["Nome", "Data", "Motivo"]].values.tolist() == [
+        ["ANA DA SILVA", "2025-03-12", "Turno já possui registros"], ["ANA DA SILVA", "2025-03-13", "Turno já possui registros"],
+    ]
+    assert len(data_manager.carregar_pontos()) == 7
+
+    # Aplicar de novo não grava nada
+    assert registrar_escala(data_manager, VIGIA_NOTURNO, ["ANA DA SILVA", "JOSE DOS SANTOS"], date(2025, 3, 10), date(2025, 3, 13)).gravados == 0
+    assert len(data_manager.carregar_pontos()) == 7
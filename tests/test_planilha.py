@@ -0,0 +1,52 @@
+from datetime import date, datetime
+
+import pandas as pd
+import pytest
+from ponto.dados import COLUNAS_PONTO
+from ponto.planilha import _nome_aba, escrever_relatorio_xlsx
+from ponto.relatorio import gerar_relatorio_do_instantaneo
+
+openpyxl = pytest.importorskip("openpyxl")
+
+REGISTROS = [
+    ("ANA DA SILVA", "Entrada", "2025-03-10", "07:00"), ("ANA DA SILVA", "Saída", "2025-03-10", "19:00"),
+    ("ANA DA SILVA", "Entrada", "2025-03-16", "07:00"), ("ANA DA SILVA", "Saída", "2025-03-16", "11:00"),
+]
+
+@pytest.fixture
+def relatorio(data_manager):
+    data_manager.anexar_pontos(pd.DataFrame(REGISTROS, columns=COLUNAS_PONTO))
+    return gerar_relatorio_do_instantaneo(data_manager.carregar_tudo(), date(2025, 3, 10), date(2025, 3, 16))
+
+def test_planilha_tem_uma_aba_por_tabela_e_detalhe_de_horas_extras(relatorio, tmp_path):
+    caminho = tmp_path / "relatorio.xlsx"
+    escrever_relatorio_xlsx(relatorio, str(caminho))
+
+    wb = openpyxl.load_workbook(caminho)
+    assert wb.sheetnames == ["Resumo de Horas", "Horas Extras", "Ausências", "ANA DA SILVA"]
+
+    resumo = list(wb["Resumo de Horas"].values)
+    assert resumo[0][0] == "Período: 10/03/2025 a 16/03/2025"
+    assert resumo[1] == ("Nome", "Total de Horas", "Horas (decimal)")
+    assert resumo[2:] == [("ANA DA SILVA", "16:00", 16), ("JOSE DOS SANTOS", "00:00", 0)]
+
+    extras = list(wb["Horas Extras"].values)
+    assert extras[0] == ("Nome", "HE 50%", "HE 100%", "HE 50% (decimal)", "HE 100% (decimal)")
+    assert extras[1] == ("ANA DA SILVA", "02:00", "04:00", 2, 4)
+
+    ausencias = list(wb["Ausências"].values)
+    assert ausencias[0] == ("Nome", "Data", "Status")
+    assert ("JOSE DOS SANTOS", datetime(2025, 3, 10), "Falta") in ausencias
+    assert len(ausencias) == 1 + 4 + 5
+
+    detalhe = list(wb["ANA DA SILVA"].values)
+    assert detalhe[1] == ("Tipo", "Data", "Período", "Duração", "Horas (decimal)", "Início do Turno")
+    assert detalhe[2] == ("50%", datetime(2025, 3, 10), "Tarde", "02:00", 2, datetime(2025, 3, 10, 7, 0))
+    assert detalhe[3] == ("100%", datetime(2025, 3, 16), "Manhã", "04:00", 4, datetime(2025, 3, 16, 7, 0))
+
+def test_nomes_de_aba_validos_e_unicos():
+    usados = {"resumo de horas"}
+    assert _nome_aba("Resumo de Horas", usados) == "Resumo de Horas (2)"
+    assert _nome_aba("A/B: C?", usados) == "A_B_ C_"
+    longo = _nome_aba("X" * 40, usados)
+    assert longo == "X" * 31 and _nome_aba("X" * 40, usados) == "X" * 27 + " (2)"